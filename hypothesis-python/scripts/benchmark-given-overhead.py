@@ -0,0 +1,118 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Measure the fixed cost of running a test decorated with @given, and of
+each example it runs.
+
+Usage: python scripts/benchmark-given-overhead.py [calls]
+
+Each test in TESTS runs a single trivial example, so nearly all of the time
+reported for it is spent setting up and tearing down the run rather than
+generating data.  This is what dominates suites with thousands of cheap
+tests.  The tests in EXAMPLE_TESTS instead run many trivial examples, so
+the time reported for each is what it costs to run one more of them.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+import timeit
+
+import hypothesis.strategies as st
+from hypothesis import HealthCheck, example, given, settings
+from hypothesis.database import InMemoryExampleDatabase
+
+overhead_settings = settings(
+    max_examples=1,
+    database=InMemoryExampleDatabase(),
+    suppress_health_check=HealthCheck.all(),
+)
+
+
+@overhead_settings
+@given(st.integers())
+def plain(x):
+    pass
+
+
+@overhead_settings
+@given(st.integers())
+def with_fixture(fixture, x):
+    pass
+
+
+@overhead_settings
+@example(0)
+@given(st.integers())
+def with_example(x):
+    pass
+
+
+@settings(overhead_settings, derandomize=True)
+@given(st.integers())
+def derandomized(x):
+    pass
+
+
+@settings(overhead_settings, deadline=None)
+@given(st.integers())
+def no_deadline(x):
+    pass
+
+
+TESTS = [
+    ("plain", plain),
+    ("with a fixture", lambda: with_fixture(fixture=1)),
+    ("with an explicit example", with_example),
+    ("derandomized", derandomized),
+    ("without a deadline", no_deadline),
+]
+
+EXAMPLES = 1000
+
+example_settings = settings(
+    max_examples=EXAMPLES, database=None, suppress_health_check=HealthCheck.all()
+)
+
+
+@example_settings
+@given(st.integers())
+def many_examples(x):
+    pass
+
+
+@settings(example_settings, deadline=None)
+@given(st.integers())
+def many_examples_no_deadline(x):
+    pass
+
+
+EXAMPLE_TESTS = [
+    ("per example", many_examples),
+    ("per example, no deadline", many_examples_no_deadline),
+]
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for name, test in TESTS:
+        test()
+        seconds = min(timeit.repeat(test, number=calls, repeat=3))
+        print("%-25s %8.1f us per test" % (name, seconds / calls * 1e6))
+    for name, test in EXAMPLE_TESTS:
+        seconds = min(timeit.repeat(test, number=1, repeat=3))
+        print("%-25s %8.1f us per example" % (name, seconds / EXAMPLES * 1e6))
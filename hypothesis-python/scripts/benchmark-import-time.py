@@ -0,0 +1,61 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Measure how long it takes to import Hypothesis.
+
+Usage: python scripts/benchmark-import-time.py [budget-in-milliseconds]
+
+Each statement below is timed in a fresh interpreter, several times over,
+and the fastest time is reported, less the fastest time for a baseline
+statement which doesn't import Hypothesis.  If a budget is given, the script fails when any of
+them takes longer, so it can be used to catch regressions in CI.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import subprocess
+import sys
+import timeit
+
+# Pairs of a statement and its baseline.
+STATEMENTS = [
+    ("import hypothesis", "pass"),
+    ("from hypothesis.extra import pytestplugin", "import pytest"),
+    ("from hypothesis import given, strategies", "pass"),
+]
+
+REPEATS = 10
+
+
+def fastest_run(statement):
+    def run():
+        subprocess.check_call([sys.executable, "-c", statement])
+
+    return min(timeit.repeat(run, number=1, repeat=REPEATS))
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else None
+    over_budget = False
+    for statement, baseline in STATEMENTS:
+        seconds = fastest_run(statement) - fastest_run(baseline)
+        print("%-45s %7.1f ms" % (statement, seconds * 1000))
+        if budget is not None and seconds > budget:
+            over_budget = True
+    if over_budget:
+        print("Over the budget of %.1f ms" % (budget * 1000,))
+        sys.exit(1)
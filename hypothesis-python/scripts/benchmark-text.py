@@ -0,0 +1,70 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Measure how fast text() generates long strings, compared to generating
+them one character at a time from a list of characters as it used to.
+
+Usage: python scripts/benchmark-text.py [length]
+
+Each strategy draws strings of exactly ``length`` characters from random
+bytes, as the engine generates them, but without running a test, so that the
+time reported is only the cost of generating them.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import random
+import sys
+import timeit
+
+import hypothesis.strategies as st
+from hypothesis.internal.conjecture.data import ConjectureData
+from hypothesis.internal.conjecture.engine import uniform
+from hypothesis.searchstrategy.strings import StringStrategy
+
+ALPHABETS = [
+    ("ascii letters", st.characters(min_codepoint=65, max_codepoint=90)),
+    ("all characters", st.characters(blacklist_categories=("Cs",))),
+]
+
+
+def draw_from(strategy, length):
+    def draw():
+        data = ConjectureData(
+            max_length=length * 16, draw_bytes=lambda data, n: uniform(random, n)
+        )
+        data.draw(strategy)
+
+    return draw
+
+
+if __name__ == "__main__":
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for name, characters in ALPHABETS:
+        results = []
+        for strategy in [
+            st.text(characters, min_size=length, max_size=length),
+            StringStrategy(st.lists(characters, min_size=length, max_size=length)),
+        ]:
+            draw = draw_from(strategy, length)
+            draw()
+            results.append(min(timeit.repeat(draw, number=1, repeat=5)))
+        bulk, per_character = results
+        print(
+            "%-15s %8.1f ms bulk %8.1f ms per character %6.1fx faster"
+            % (name, bulk * 1e3, per_character * 1e3, per_character / bulk)
+        )
@@ -0,0 +1,63 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Regenerate the precomputed charmap tables that ship with Hypothesis.
+
+Usage: python scripts/build-charmap-tables.py [python-executable ...]
+
+Each interpreter passed on the command line (by default, just the current
+one) is asked for the category intervals of its own Unicode database, which
+are then written to ``src/hypothesis/internal/charmaps/<version>.bin``.  The
+interpreters do not need Hypothesis installed.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import subprocess
+import sys
+
+from hypothesis.internal.charmap import charmap_table_file, encode_charmap_table
+
+COMPUTE_CHARMAP = """
+import json, sys, unicodedata
+chr = getattr(__builtins__, "unichr", chr)
+result = {}
+for i in range(sys.maxunicode + 1):
+    rs = result.setdefault(unicodedata.category(chr(i)), [])
+    if rs and rs[-1][-1] == i - 1:
+        rs[-1][-1] += 1
+    else:
+        rs.append([i, i])
+print(json.dumps([unicodedata.unidata_version, sys.maxunicode, result]))
+"""
+
+
+if __name__ == "__main__":
+    for executable in sys.argv[1:] or [sys.executable]:
+        output = subprocess.check_output([executable, "-c", COMPUTE_CHARMAP])
+        version, maxunicode, charmap = json.loads(output.decode("ascii"))
+        if maxunicode != 0x10FFFF:
+            print("Skipping %s, which is a narrow build" % (executable,))
+            continue
+        path = charmap_table_file(version)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as o:
+            o.write(encode_charmap_table(charmap, maxunicode))
+        print("Wrote %s from %s" % (path, executable))
@@ -86,7 +86,7 @@ setuptools.setup(
     author_email="david@drmaciver.com",
     packages=setuptools.find_packages(SOURCE),
     package_dir={"": SOURCE},
-    package_data={"hypothesis": ["py.typed"]},
+    package_data={"hypothesis": ["py.typed", "internal/charmaps/*.bin"]},
     url="https://github.com/HypothesisWorks/hypothesis/tree/master/hypothesis-python",
     license="MPL v2",
     description="A library for property based testing",
@@ -23,13 +23,9 @@ failing examples it finds.
 """
 
 
-from hypothesis._settings import settings, Verbosity, Phase, HealthCheck, unlimited
-from hypothesis.version import __version_info__, __version__
-from hypothesis.control import assume, note, reject, event
-from hypothesis.core import given, find, example, seed, reproduce_failure, PrintSettings
-from hypothesis.internal.entropy import register_random
-from hypothesis.utils.conventions import infer
+import sys
 
+from hypothesis.version import __version_info__, __version__
 
 __all__ = [
     "settings",
@@ -52,3 +48,63 @@ __all__ = [
     "__version__",
     "__version_info__",
 ]
+
+# The module which defines each of the names we export, apart from the
+# version.  On Python 3.7 and later they are only imported when first used,
+# so that importing e.g. just hypothesis.errors or the pytest plugin doesn't
+# import all of Hypothesis.
+_EXPORTED_FROM = {
+    "settings": "hypothesis._settings",
+    "Verbosity": "hypothesis._settings",
+    "HealthCheck": "hypothesis._settings",
+    "Phase": "hypothesis._settings",
+    "unlimited": "hypothesis._settings",
+    "assume": "hypothesis.control",
+    "reject": "hypothesis.control",
+    "note": "hypothesis.control",
+    "event": "hypothesis.control",
+    "given": "hypothesis.core",
+    "find": "hypothesis.core",
+    "example": "hypothesis.core",
+    "seed": "hypothesis.core",
+    "reproduce_failure": "hypothesis.core",
+    "PrintSettings": "hypothesis.core",
+    "register_random": "hypothesis.internal.entropy",
+    "infer": "hypothesis.utils.conventions",
+}
+
+if sys.version_info[:2] >= (3, 7):
+    import importlib
+
+    def __getattr__(name):
+        if name in _EXPORTED_FROM:
+            value = getattr(importlib.import_module(_EXPORTED_FROM[name]), name)
+        else:
+            # Submodules such as hypothesis.strategies used to be imported
+            # along with this package, so accessing them still imports them.
+            try:
+                value = importlib.import_module(__name__ + "." + name)
+            except ModuleNotFoundError as e:
+                if e.name != __name__ + "." + name:
+                    raise
+                raise AttributeError("module %r has no attribute %r" % (__name__, name))
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_EXPORTED_FROM))
+
+
+else:  # pragma: no cover
+    from hypothesis._settings import settings, Verbosity, Phase, HealthCheck, unlimited
+    from hypothesis.control import assume, note, reject, event
+    from hypothesis.core import (
+        given,
+        find,
+        example,
+        seed,
+        reproduce_failure,
+        PrintSettings,
+    )
+    from hypothesis.internal.entropy import register_random
+    from hypothesis.utils.conventions import infer
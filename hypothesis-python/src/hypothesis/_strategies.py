@@ -93,7 +93,7 @@ from hypothesis.searchstrategy.datetime import (
     TimedeltaStrategy,
 )
 from hypothesis.searchstrategy.deferred import DeferredStrategy
-from hypothesis.searchstrategy.lazy import LazyStrategy
+from hypothesis.searchstrategy.lazy import LazyStrategy, unwrap_strategies
 from hypothesis.searchstrategy.misc import (
     BoolStrategy,
     JustStrategy,
@@ -113,6 +113,7 @@ from hypothesis.searchstrategy.strings import (
     FixedSizeBytes,
     OneCharStringStrategy,
     StringStrategy,
+    TextStrategy,
 )
 from hypothesis.types import RandomWithSeed
 from hypothesis.utils.conventions import infer, not_set
@@ -126,11 +127,6 @@ try:
 except ImportError:
     pass
 
-try:
-    import numpy
-except ImportError:
-    numpy = None
-
 if False:
     import random  # noqa
     from types import ModuleType  # noqa
@@ -213,7 +209,10 @@ def base_defines_strategy(force_reusable):
     def decorator(strategy_definition):
         """A decorator that registers the function as a strategy and makes it
         lazily evaluated."""
-        _strategies.add(strategy_definition.__name__)
+        if strategy_definition.__module__ == __name__:
+            # hypothesis.strategies checks that it exports all of these.
+            # Strategies defined in extras may be imported before it is.
+            _strategies.add(strategy_definition.__name__)
 
         @proxies(strategy_definition)
         def accept(*args, **kwargs):
@@ -486,10 +485,11 @@ def floats(
             "Got width=%r, but the only valid values are the integers 16, "
             "32, and 64." % (width,)
         )
-    if width == 16 and sys.version_info[:2] < (3, 6) and numpy is None:
-        raise InvalidArgument(  # pragma: no cover
-            "width=16 requires either Numpy, or Python >= 3.6"
-        )
+    if width == 16 and sys.version_info[:2] < (3, 6):  # pragma: no cover
+        try:
+            import numpy  # noqa
+        except ImportError:
+            raise InvalidArgument("width=16 requires either Numpy, or Python >= 3.6")
 
     check_valid_bound(min_value, "min_value")
     check_valid_bound(max_value, "max_value")
@@ -674,7 +674,7 @@ def sampled_from(elements):
     replace 10 values with 1.
     """
     values = check_sample(elements, "sampled_from")
-    if not values:
+    if len(values) == 0:
         return nothing()
     if len(values) == 1:
         return just(values[0])
@@ -1029,6 +1029,9 @@ def text(
             )
     if (max_size == 0 or char_strategy.is_empty) and not min_size:
         return just(u"")
+    unwrapped = unwrap_strategies(char_strategy)
+    if isinstance(unwrapped, OneCharStringStrategy):
+        return TextStrategy(unwrapped, min_size=min_size, max_size=max_size)
     return StringStrategy(lists(char_strategy, min_size=min_size, max_size=max_size))
 
 
@@ -1086,11 +1089,7 @@ def binary(min_size=0, max_size=None):
     check_valid_sizes(min_size, max_size)
     if min_size == max_size is not None:
         return FixedSizeBytes(min_size)
-    return BinaryStringStrategy(
-        lists(
-            integers(min_value=0, max_value=255), min_size=min_size, max_size=max_size
-        )
-    )
+    return BinaryStringStrategy(min_size=min_size, max_size=max_size)
 
 
 @cacheable
@@ -1655,7 +1654,7 @@ def permutations(values):
     original order of values.
     """
     values = check_sample(values, "permutations")
-    if not values:
+    if len(values) == 0:
         return builds(list)
 
     return PermutationStrategy(values)
@@ -2014,10 +2013,17 @@ class DataObject(object):
     def draw(self, strategy, label=None):
         result = self.conjecture_data.draw(strategy)
         self.count += 1
-        if label is not None:
-            note("Draw %d (%s): %r" % (self.count, label, result))
-        else:
-            note("Draw %d: %r" % (self.count, result))
+        count = self.count
+
+        # Formatting large values is slow and the note is usually never
+        # shown, so we note a function which report() only calls for the
+        # final example or at verbose verbosity.
+        def describe():
+            if label is not None:
+                return "Draw %d (%s): %r" % (count, label, result)
+            return "Draw %d: %r" % (count, result)
+
+        note(describe)
         return result
 
 
@@ -65,12 +65,14 @@ class BuildContext(object):
         self.notes = []
 
     def __enter__(self):
-        self.assign_variable = _current_build_context.with_value(self)
-        self.assign_variable.__enter__()
+        # We enter a BuildContext for every example, so set the variable
+        # directly rather than creating a with_value context manager.
+        self.previous_context = _current_build_context.value
+        _current_build_context.value = self
         return self
 
     def __exit__(self, exc_type, exc_value, tb):
-        self.assign_variable.__exit__(exc_type, exc_value, tb)
+        _current_build_context.value = self.previous_context
         if self.close() and exc_type is None:
             raise CleanupFailed()
 
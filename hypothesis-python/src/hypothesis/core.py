@@ -40,6 +40,7 @@ from hypothesis._settings import (
     Phase,
     PrintSettings,
     Verbosity,
+    default_variable as default_settings,
     local_settings,
     settings as Settings,
 )
@@ -63,6 +64,7 @@ from hypothesis.internal.compat import (
     bad_django_TestCase,
     benchmark_time,
     binary_type,
+    ceil,
     get_type_hints,
     getfullargspec,
     hbytes,
@@ -71,7 +73,7 @@ from hypothesis.internal.compat import (
 )
 from hypothesis.internal.conjecture.data import ConjectureData, StopTest
 from hypothesis.internal.conjecture.engine import ConjectureRunner, ExitReason, sort_key
-from hypothesis.internal.entropy import deterministic_PRNG
+from hypothesis.internal.entropy import deterministic_PRNG, reseedable_PRNG
 from hypothesis.internal.escalation import (
     escalate_hypothesis_internal_error,
     get_trimmed_traceback,
@@ -86,12 +88,12 @@ from hypothesis.internal.reflection import (
     impersonate,
     is_mock,
     nicerepr,
-    proxies,
 )
+from hypothesis.internal.scheduling import current_shard, session_budget
 from hypothesis.reporting import current_verbosity, report, verbose_report
 from hypothesis.searchstrategy.collections import TupleStrategy
 from hypothesis.searchstrategy.strategies import SearchStrategy
-from hypothesis.statistics import note_engine_for_statistics
+from hypothesis.statistics import note_engine_for_statistics, profile_strategies
 from hypothesis.utils.conventions import infer
 from hypothesis.version import __version__
 
@@ -293,9 +295,12 @@ def is_invalid_test(name, original_argspec, generator_arguments, generator_kwarg
 def execute_explicit_examples(
     test_runner, test, wrapped_test, settings, arguments, kwargs
 ):
+    examples = getattr(wrapped_test, "hypothesis_explicit_examples", ())
+    if not examples:
+        return
     original_argspec = getfullargspec(test)
 
-    for example in reversed(getattr(wrapped_test, "hypothesis_explicit_examples", ())):
+    for example in reversed(examples):
         example_kwargs = dict(original_argspec.kwonlydefaults or {})
         if example.args:
             if len(example.args) > len(original_argspec.args):
@@ -352,7 +357,7 @@ def process_arguments_to_given(
     arguments,
     kwargs,
     generator_arguments,
-    generator_kwargs,
+    generator_strategy,
     argspec,
     test,
     settings,
@@ -379,14 +384,9 @@ def process_arguments_to_given(
 
     # We use TupleStrategy over tuples() here to avoid polluting
     # st.STRATEGY_CACHE with references (see #493), and because this is
-    # trivial anyway if the fixed_dictionaries strategy is cacheable.
+    # trivial anyway as generator_strategy is built once per test.
     search_strategy = TupleStrategy(
-        (
-            st.just(arguments),
-            st.fixed_dictionaries(generator_kwargs).map(
-                lambda args: dict(args, **kwargs)
-            ),
-        )
+        (st.just(arguments), generator_strategy.map(lambda args: dict(args, **kwargs)))
     )
 
     if selfy is not None:
@@ -432,9 +432,6 @@ def skip_exceptions_to_reraise():
     return tuple(sorted(exceptions, key=str))
 
 
-EXCEPTIONS_TO_RERAISE = skip_exceptions_to_reraise()
-
-
 def failure_exceptions_to_catch():
     """Return a tuple of exceptions meaning 'this test has failed', to catch.
 
@@ -451,7 +448,17 @@ def failure_exceptions_to_catch():
     return tuple(exceptions)
 
 
-EXCEPTIONS_TO_FAIL = failure_exceptions_to_catch()
+# These are found when the first test runs rather than when Hypothesis is
+# imported, because importing the test runners which define them is slow.
+EXCEPTIONS_TO_RERAISE = None
+EXCEPTIONS_TO_FAIL = None
+
+
+def find_test_runner_exceptions():
+    global EXCEPTIONS_TO_RERAISE, EXCEPTIONS_TO_FAIL
+    if EXCEPTIONS_TO_RERAISE is None:
+        EXCEPTIONS_TO_RERAISE = skip_exceptions_to_reraise()
+        EXCEPTIONS_TO_FAIL = failure_exceptions_to_catch()
 
 
 def new_given_argspec(original_argspec, generator_kwargs):
@@ -496,6 +503,21 @@ class StateForActualGivenExecution(object):
 
         self.used_examples_from_database = False
 
+        # While run() is running, a function which seeds the global PRNGs
+        # for an example.  See execute().
+        self.__reseed_PRNGs = None
+
+        find_test_runner_exceptions()
+
+    @contextlib.contextmanager
+    def __deterministic_PRNGs(self):
+        with reseedable_PRNG() as reseed:
+            self.__reseed_PRNGs = reseed
+            try:
+                yield
+            finally:
+                self.__reseed_PRNGs = None
+
     def execute(
         self,
         data,
@@ -504,55 +526,69 @@ class StateForActualGivenExecution(object):
         expected_failure=None,
         collect=False,
     ):
-        text_repr = [None]
-        if self.settings.deadline is None:
-            test = self.test
-        else:
+        if self.__reseed_PRNGs is None:
+            # We're not inside run(), e.g. because we're reproducing a
+            # failure from a blob, so there's nothing to restore the state
+            # of the PRNGs after this example.
+            with self.__deterministic_PRNGs():
+                return self.execute(
+                    data, print_example, is_final, expected_failure, collect
+                )
 
-            @proxies(self.test)
-            def test(*args, **kwargs):
-                self.__test_runtime = None
-                initial_draws = len(data.draw_times)
-                start = benchmark_time()
-                result = self.test(*args, **kwargs)
-                finish = benchmark_time()
-                internal_draw_time = sum(data.draw_times[initial_draws:])
-                runtime = (finish - start - internal_draw_time) * 1000
-                self.__test_runtime = runtime
-                current_deadline = self.settings.deadline
-                if not is_final:
-                    current_deadline *= 1.25
-                if runtime >= current_deadline:
-                    raise DeadlineExceeded(runtime, self.settings.deadline)
-                return result
+        text_repr = [None]
+        test = self.test
 
         def run(data):
             if not hasattr(data, "can_reproduce_example_from_repr"):
                 data.can_reproduce_example_from_repr = True
-            with local_settings(self.settings):
+            # This runs for every example, so rather than nesting
+            # local_settings and deterministic_PRNG we set the default
+            # settings directly and just reseed the PRNGs, whose state run()
+            # saves and restores once for the whole test.
+            previous_settings = default_settings.value
+            default_settings.value = self.settings
+            try:
                 with BuildContext(data, is_final=is_final):
-                    with deterministic_PRNG():
-                        args, kwargs = data.draw(self.search_strategy)
-                        if expected_failure is not None:
-                            text_repr[0] = arg_string(test, args, kwargs)
-
-                        if print_example:
-                            example = "%s(%s)" % (
-                                test.__name__,
-                                arg_string(test, args, kwargs),
-                            )
-                            try:
-                                ast.parse(example)
-                            except SyntaxError:
-                                data.can_reproduce_example_from_repr = False
-                            report("Falsifying example: %s" % (example,))
-                        elif current_verbosity() >= Verbosity.verbose:
-                            report(
-                                lambda: "Trying example: %s(%s)"
-                                % (test.__name__, arg_string(test, args, kwargs))
-                            )
+                    self.__reseed_PRNGs()
+                    args, kwargs = data.draw(self.search_strategy)
+                    if expected_failure is not None:
+                        text_repr[0] = arg_string(test, args, kwargs)
+
+                    if print_example:
+                        example = "%s(%s)" % (
+                            test.__name__,
+                            arg_string(test, args, kwargs),
+                        )
+                        try:
+                            ast.parse(example)
+                        except SyntaxError:
+                            data.can_reproduce_example_from_repr = False
+                        report("Falsifying example: %s" % (example,))
+                    elif current_verbosity() >= Verbosity.verbose:
+                        report(
+                            lambda: "Trying example: %s(%s)"
+                            % (test.__name__, arg_string(test, args, kwargs))
+                        )
+                    if self.settings.deadline is None:
                         return test(*args, **kwargs)
 
+                    self.__test_runtime = None
+                    initial_draws = len(data.draw_times)
+                    start = benchmark_time()
+                    result = test(*args, **kwargs)
+                    finish = benchmark_time()
+                    internal_draw_time = sum(data.draw_times[initial_draws:])
+                    runtime = (finish - start - internal_draw_time) * 1000
+                    self.__test_runtime = runtime
+                    current_deadline = self.settings.deadline
+                    if not is_final:
+                        current_deadline *= 1.25
+                    if runtime >= current_deadline:
+                        raise DeadlineExceeded(runtime, self.settings.deadline)
+                    return result
+            finally:
+                default_settings.value = previous_settings
+
         result = self.test_runner(data, run)
         if expected_failure is not None:
             exception, traceback = expected_failure
@@ -611,35 +647,80 @@ class StateForActualGivenExecution(object):
                 # We raise a new one here to resume normal operation.
                 raise StopTest(data.testcounter)
             else:
-                tb = get_trimmed_traceback()
-                data.__expected_traceback = "".join(
-                    traceback.format_exception(type(e), e, tb)
-                )
+                # Failures which happened in a forked copy of this process
+                # (see hypothesis.internal.snapshots) carry the traceback and
+                # location of the original error with them.
+                forked = getattr(e, "hypothesis_internal_forked_failure", None)
+                if forked is not None:
+                    data.__expected_traceback, filename, lineno = forked
+                else:
+                    tb = get_trimmed_traceback()
+                    data.__expected_traceback = "".join(
+                        traceback.format_exception(type(e), e, tb)
+                    )
+                    origin = traceback.extract_tb(tb)[-1]
+                    filename = origin[0]
+                    lineno = origin[1]
                 data.__expected_exception = e
                 verbose_report(data.__expected_traceback)
-
-                origin = traceback.extract_tb(tb)[-1]
-                filename = origin[0]
-                lineno = origin[1]
                 data.mark_interesting((type(e), filename, lineno))
 
     def run(self):
         # Tell pytest to omit the body of this function from tracebacks
+        __tracebackhide__ = True
+        # The state of the global PRNGs is saved once here and restored when
+        # the test finishes, rather than around every example.
+        with self.__deterministic_PRNGs():
+            self.__run()
+
+    def __run(self):
         __tracebackhide__ = True
         if global_force_seed is None:
             database_key = function_digest(self.test)
         else:
             database_key = None
+        shard = current_shard.value
+        if shard is not None:
+            # Run our share of the examples, and make sure that we don't run
+            # the same ones as the other shards even if the test is seeded.
+            index, count = shard
+            self.settings = Settings(
+                self.settings,
+                max_examples=max(1, ceil(self.settings.max_examples / count)),
+            )
+            self.random = Random(self.random.getrandbits(64) * count + index)
+        budget = session_budget.value
+        time_budget = None
+        if budget is not None:
+            max_examples, time_budget = budget.allocate(self.settings, database_key)
+            if max_examples != self.settings.max_examples:
+                self.settings = Settings(self.settings, max_examples=max_examples)
         runner = ConjectureRunner(
             self.evaluate_test_data,
             settings=self.settings,
             random=self.random,
             database_key=database_key,
+            profile_strategies=profile_strategies.value,
+            time_budget=time_budget,
+            share_corpus=shard is not None,
         )
+        start_time = benchmark_time()
         try:
             runner.run()
         finally:
             self.used_examples_from_database = runner.used_examples_from_database
+            if budget is not None:
+                generation = runner.phase_statistics.get("generate", {})
+                budget.record(
+                    self.settings,
+                    database_key,
+                    benchmark_time() - start_time,
+                    (
+                        generation.get("test-cases", 0),
+                        generation.get("duration-seconds", 0.0),
+                    ),
+                    bool(runner.interesting_examples),
+                )
         note_engine_for_statistics(runner)
 
         self.used_examples_from_database = runner.used_examples_from_database
@@ -826,6 +907,11 @@ def given(
 
         argspec = new_given_argspec(original_argspec, generator_kwargs)
 
+        # The strategy for the arguments we generate, built on the first call
+        # (once any inferred strategies have been resolved) so that it is only
+        # validated once, however many times the test runs.
+        generator_strategy = [None]
+
         @impersonate(test)
         @define_function_signature(test.__name__, test.__doc__, argspec)
         def wrapped_test(*arguments, **kwargs):
@@ -863,12 +949,15 @@ def given(
                     )
                 generator_kwargs[name] = st.from_type(hints[name])
 
+            if generator_strategy[0] is None:
+                generator_strategy[0] = st.fixed_dictionaries(generator_kwargs)
+
             processed_args = process_arguments_to_given(
                 wrapped_test,
                 arguments,
                 kwargs,
                 generator_arguments,
-                generator_kwargs,
+                generator_strategy[0],
                 argspec,
                 test,
                 settings,
@@ -1084,7 +1173,11 @@ def find(
             data.mark_interesting()
 
     runner = ConjectureRunner(
-        template_condition, settings=settings, random=random, database_key=database_key
+        template_condition,
+        settings=settings,
+        random=random,
+        database_key=database_key,
+        profile_strategies=profile_strategies.value,
     )
     runner.run()
     note_engine_for_statistics(runner)
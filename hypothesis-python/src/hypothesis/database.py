@@ -168,6 +168,10 @@ class DirectoryBasedExampleDatabase(ExampleDatabase):
     def fetch(self, key):
         kp = self._key_path(key)
         for path in os.listdir(kp):
+            if "." in path:
+                # A temporary file that another process is still writing
+                # to, and will rename once it is complete.
+                continue
             try:
                 with open(os.path.join(kp, path), "rb") as i:
                     yield hbytes(i.read())
@@ -24,7 +24,8 @@ import django.db.models as dm
 import django.forms as df
 import django.test as dt
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.test.testcases import connections_support_transactions
 
 import hypothesis._strategies as st
 from hypothesis import reject
@@ -39,15 +40,49 @@ if False:
 
 
 class HypothesisTestCase(object):
+    #: If True, the database setup and teardown of the test case is run once
+    #: for each test rather than for each example, and each example is run
+    #: inside a savepoint which is rolled back when it finishes.
+    savepoint_per_example = False
+
+    def _uses_savepoints(self):
+        testMethod = getattr(self, self._testMethodName)
+        return (
+            getattr(testMethod, u"is_hypothesis_test", False)
+            and self.savepoint_per_example
+            and connections_support_transactions()
+        )
+
+    def _open_atomics(self):
+        atomics = []
+        for db_name in self._databases_names(include_mirrors=False):
+            atomic = transaction.atomic(using=db_name)
+            atomic.__enter__()
+            atomics.append((db_name, atomic))
+        return atomics
+
+    def _rollback_atomics_opened(self, atomics):
+        for db_name, atomic in reversed(atomics):
+            transaction.set_rollback(True, using=db_name)
+            atomic.__exit__(None, None, None)
+
     def setup_example(self):
-        self._pre_setup()
+        if self._uses_savepoints():
+            self._example_atomics = self._open_atomics()
+        else:
+            self._pre_setup()
 
     def teardown_example(self, example):
-        self._post_teardown()
+        if self._uses_savepoints():
+            self._rollback_atomics_opened(self._example_atomics)
+        else:
+            self._post_teardown()
 
     def __call__(self, result=None):
         testMethod = getattr(self, self._testMethodName)
-        if getattr(testMethod, u"is_hypothesis_test", False):
+        if getattr(testMethod, u"is_hypothesis_test", False) and not (
+            self._uses_savepoints()
+        ):
             return unittest.TestCase.__call__(self, result)
         else:
             return dt.SimpleTestCase.__call__(self, result)
@@ -58,7 +93,17 @@ class TestCase(HypothesisTestCase, dt.TestCase):
 
 
 class TransactionTestCase(HypothesisTestCase, dt.TransactionTestCase):
-    pass
+    def _fixture_setup(self):
+        super(TransactionTestCase, self)._fixture_setup()
+        if self._uses_savepoints():
+            # Unlike TestCase, there is no transaction around each test for
+            # the savepoints to be created in, so we open one ourselves.
+            self._test_atomics = self._open_atomics()
+
+    def _fixture_teardown(self):
+        if self._uses_savepoints():
+            self._rollback_atomics_opened(self._test_atomics)
+        super(TransactionTestCase, self)._fixture_teardown()
 
 
 @st.defines_strategy
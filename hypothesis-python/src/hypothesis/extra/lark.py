@@ -33,12 +33,15 @@ your own at all.
 
 from __future__ import absolute_import, division, print_function
 
+import bisect
+
 import attr
 import lark
 from lark.grammar import NonTerminal, Terminal
 
 import hypothesis._strategies as st
 from hypothesis.errors import InvalidArgument
+from hypothesis.internal.conjecture.data import MAX_DEPTH
 from hypothesis.internal.conjecture.utils import calc_label_from_name
 from hypothesis.internal.validation import check_type
 from hypothesis.searchstrategy import SearchStrategy
@@ -49,19 +52,61 @@ if False:
 __all__ = ["from_lark"]
 
 
+# The number of levels of nesting we allow for drawing a terminal, e.g. from
+# the strategy for a regular expression.  Nonterminals are only expanded in
+# ways which we expect to leave this much room below MAX_DEPTH.
+TERMINAL_DEPTH = 25
+
+# Once a single draw has expanded this many nonterminals, we only choose the
+# expansions which finish soonest, so that recursive grammars don't grow until
+# they run out of buffer.
+MAX_EXPANSIONS = 100
+
+
+def minimum_depths(nonterminals):
+    """Given a dict mapping each nonterminal name to a list of its expansions,
+    returns a dict mapping each nonterminal name to the minimum depth of a
+    derivation tree for it, where terminals have depth zero.
+
+    Nonterminals which can never finish expanding are missing from the
+    result."""
+    depths = {}
+    changed = True
+    while changed:
+        changed = False
+        for name, expansions in nonterminals.items():
+            for expansion in expansions:
+                depth = 0
+                for symbol in expansion:
+                    if isinstance(symbol, NonTerminal):
+                        if symbol.name not in depths:
+                            break
+                        depth = max(depth, depths[symbol.name])
+                else:
+                    depth += 1
+                    if depth < depths.get(name, float("inf")):
+                        depths[name] = depth
+                        changed = True
+    return depths
+
+
 @attr.s()
 class DrawState(object):
     """Tracks state of a single draw from a lark grammar.
 
     Currently just wraps a list of tokens that will be emitted at the
-    end, but as we support more sophisticated parsers this will need
-    to track more state for e.g. indentation level.
+    end and a count of the nonterminals expanded, but as we support more
+    sophisticated parsers this will need to track more state for e.g.
+    indentation level.
     """
 
     # The text output so far as a list of string tokens resulting from
     # each draw to a non-terminal.
     result = attr.ib(default=attr.Factory(list))
 
+    # The number of nonterminals expanded so far.
+    expansions = attr.ib(default=0)
+
 
 class LarkStrategy(SearchStrategy):
     """Low-level strategy implementation wrapping a Lark grammar.
@@ -102,15 +147,60 @@ class LarkStrategy(SearchStrategy):
         for rule in rules:
             nonterminals.setdefault(rule.origin.name, []).append(tuple(rule.expansion))
 
-        for v in nonterminals.values():
-            v.sort(key=len)
+        self.min_depths = minimum_depths(nonterminals)
+
+        # Expansions are sorted so that those which can finish soonest come
+        # first, which means that we can restrict a draw to the expansions
+        # which fit in our remaining budget by sampling from a prefix of the
+        # list, and that the shrinker will tend to move towards them.
+        self.expansions = {}
+        self.expansion_depths = {}
+        for k, v in nonterminals.items():
+            v.sort(key=lambda e: (self.expansion_depth(e), len(e)))
+            self.expansions[k] = v
+            self.expansion_depths[k] = [self.expansion_depth(e) for e in v]
 
         self.nonterminal_strategies = {
             k: st.sampled_from(v) for k, v in nonterminals.items()
         }
+        self.__restricted_strategies = {}
 
         self.__rule_labels = {}
 
+    def expansion_depth(self, expansion):
+        """The minimum number of nested nonterminals needed to finish
+        expanding ``expansion``, which is infinite if it never finishes."""
+        depth = 0
+        for symbol in expansion:
+            if isinstance(symbol, NonTerminal):
+                depth = max(depth, self.min_depths.get(symbol.name, float("inf")))
+        return depth
+
+    def nonterminal_strategy(self, data, name, draw_state):
+        """Returns the strategy for choosing an expansion of the nonterminal
+        ``name``, restricted to those which we expect to be able to finish
+        in the depth that ``data`` has left and the number of expansions
+        that ``draw_state`` has left.
+
+        Neither depends on where in the buffer the draw is, so deleting
+        earlier parts of the buffer doesn't change what later choices mean.
+        """
+        depths = self.expansion_depths[name]
+        if draw_state.expansions >= MAX_EXPANSIONS:
+            budget = depths[0]
+        else:
+            budget = MAX_DEPTH - TERMINAL_DEPTH - data.depth - 1
+        if depths[-1] <= budget:
+            return self.nonterminal_strategies[name]
+        n = max(
+            bisect.bisect_right(depths, budget), bisect.bisect_right(depths, depths[0])
+        )
+        try:
+            return self.__restricted_strategies[name, n]
+        except KeyError:
+            strategy = st.sampled_from(self.expansions[name][:n])
+            return self.__restricted_strategies.setdefault((name, n), strategy)
+
     def do_draw(self, data):
         state = DrawState()
         self.draw_symbol(data, self.start, state)
@@ -137,7 +227,10 @@ class LarkStrategy(SearchStrategy):
         else:
             assert isinstance(symbol, NonTerminal)
             data.start_example(self.rule_label(symbol.name))
-            expansion = data.draw(self.nonterminal_strategies[symbol.name])
+            draw_state.expansions += 1
+            expansion = data.draw(
+                self.nonterminal_strategy(data, symbol.name, draw_state)
+            )
             for e in expansion:
                 self.draw_symbol(data, e, draw_state)
                 self.gen_ignore(data, draw_state)
@@ -26,12 +26,25 @@ import hypothesis.internal.conjecture.utils as cu
 from hypothesis import Verbosity
 from hypothesis._settings import note_deprecation
 from hypothesis.errors import InvalidArgument
-from hypothesis.internal.compat import hrange, integer_types, text_type
+from hypothesis.internal.compat import (
+    bit_length,
+    getfullargspec,
+    hrange,
+    integer_types,
+    text_type,
+)
 from hypothesis.internal.coverage import check_function
-from hypothesis.internal.reflection import proxies
+from hypothesis.internal.reflection import convert_positional_arguments, proxies
 from hypothesis.internal.validation import check_type
 from hypothesis.reporting import current_verbosity
 from hypothesis.searchstrategy import SearchStrategy
+from hypothesis.searchstrategy.lazy import LazyStrategy
+from hypothesis.searchstrategy.misc import BoolStrategy
+from hypothesis.searchstrategy.numbers import (
+    BoundedIntStrategy,
+    FixedBoundedFloatStrategy,
+)
+from hypothesis.searchstrategy.strategies import MappedSearchStrategy, OneOfStrategy
 
 if False:
     from typing import Any, Union, Sequence, Tuple  # noqa
@@ -122,6 +135,298 @@ def order_check(name, floor, small, large):
     )
 
 
+def strategy_call(strategy):
+    """If ``strategy`` is a call to one of our strategy functions, return
+    the name of that function and the arguments it was called with (all as
+    keyword arguments), else return ``(None, None)``."""
+    if not isinstance(strategy, LazyStrategy):
+        return None, None
+    function = strategy.function
+    if function.__module__ not in (__name__, st.__name__):
+        return None, None
+    _, kwargs = convert_positional_arguments(function, strategy.args, strategy.kwargs)
+    argspec = getfullargspec(function)
+    arguments = dict(zip(reversed(argspec.args), reversed(argspec.defaults or ())))
+    arguments.update(kwargs)
+    return function.__name__, arguments
+
+
+def draw_cells(data, bits, count, label):
+    """Draw ``count`` unsigned integers of ``bits`` bits each as a uint64
+    array.  Each one is still a separate block, so the shrinker can work on
+    the cells of an array individually."""
+    return np.array(data.draw_bits_sequence(bits, count, label), dtype=np.uint64)
+
+
+class IntegerCells(object):
+    """Vectorised equivalent of drawing each cell from ``integers(lo, hi)``.
+
+    Values are encoded as in ``cu.integer_range``: the low bit chooses
+    which side of zero (or the bound nearest to it) the value is on, and the
+    rest is the distance from it, folded into range by a modulus rather
+    than rejection sampling so that it takes a fixed number of bits.
+    """
+
+    def __init__(self, lo, hi, dtype):
+        self.dtype = dtype
+        self.center = min(max(0, lo), hi)
+        self.below = self.center - lo
+        self.above = hi - self.center
+        self.has_direction = self.below > 0 and self.above > 0
+        self.bits = max(1, bit_length(max(self.below, self.above)))
+        self.bits += int(self.has_direction)
+
+    @classmethod
+    def for_range(cls, lo, hi, dtype):
+        """Returns IntegerCells for the range, or None if its cells would
+        need more than 64 bits (e.g. the full range of int64, which has one
+        more value below zero than a direction bit and 63 bits can reach)."""
+        result = cls(lo, hi, dtype)
+        if result.bits > 64:
+            return None
+        return result
+
+    def fold(self, offset, side):
+        if side + 1 >= 2 ** self.bits:
+            return offset
+        return offset % np.uint64(side + 1)
+
+    def draw(self, data, count, label):
+        raw = draw_cells(data, self.bits, count, label)
+        if self.has_direction:
+            up = (raw & np.uint64(1)).astype(bool)
+            offset = raw >> np.uint64(1)
+            offset = np.where(
+                up, self.fold(offset, self.above), self.fold(offset, self.below)
+            )
+        else:
+            up = self.below == 0
+            offset = self.fold(raw, self.above if up else self.below)
+        # Arithmetic modulo 2 ** 64 gives the right answer for every value
+        # which fits in the target dtype, signed or not.
+        center = np.uint64(self.center % 2 ** 64)
+        result = np.where(up, center + offset, center - offset)
+        if self.dtype.kind == u"i":
+            result = result.view(np.int64)
+        return result.astype(self.dtype)
+
+
+class BooleanCells(object):
+    def draw(self, data, count, label):
+        return draw_cells(data, 1, count, label).astype(bool)
+
+
+class FloatCells(object):
+    """Vectorised equivalent of drawing each cell from ``floats()``, for
+    floats of ``width`` bits.
+
+    The low bit of each cell is the sign, and the rest is the bit pattern
+    of the magnitude, so that smaller cells are smaller in magnitude.  The
+    scalar floats() strategy is much more likely to generate special values
+    than a uniform choice of bit pattern is, so we sprinkle some in at the
+    ends: the lowest cells are all zero, with the rest counting up from
+    there, and cells with the top four bits set are the largest finite
+    float, infinity or NaN.  Lowering a cell never increases its magnitude,
+    so the shrinker can't get stuck on a special value that only a much
+    smaller cell could replace.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.float_type = np.dtype("f%d" % (width // 8,))
+        self.uint_type = np.dtype("u%d" % (width // 8,))
+        self.zero_cells = np.uint64(1 << (width - 6))
+        self.first_special = np.uint64(15 << (width - 4))
+        self.specials = np.array(
+            [np.finfo(self.float_type).max, np.inf, np.nan, np.nan],
+            dtype=self.float_type,
+        )
+
+    def draw(self, data, count, label):
+        w = np.uint64(self.width)
+        raw = draw_cells(data, self.width, count, label)
+        sign = raw & np.uint64(1)
+        magnitude = (np.maximum(raw, self.zero_cells) - self.zero_cells) >> np.uint64(1)
+        pattern = magnitude | (sign << (w - np.uint64(1)))
+        result = pattern.astype(self.uint_type).view(self.float_type)
+        special = raw >= self.first_special
+        if special.any():
+            which = (raw >> (w - np.uint64(6))) & np.uint64(3)
+            values = self.specials[which.astype(np.intp)]
+            values = np.where(sign.astype(bool), -values, values)
+            result = np.where(special, values, result)
+        return result
+
+
+class FloatRangeCells(object):
+    """Vectorised equivalent of drawing each cell from ``floats(lo, hi)``
+    with finite bounds, as ``lo`` plus a uniform fraction of the range.
+
+    The lowest and highest ``1 / 32`` of cells are exactly ``lo`` and ``hi``
+    respectively, and the cells in between are spread over the whole range.
+    """
+
+    def __init__(self, lo, hi, width):
+        self.lo = lo
+        self.hi = hi
+        self.float_type = np.dtype("f%d" % (width // 8,))
+
+    def draw(self, data, count, label):
+        raw = draw_cells(data, 64, count, label)
+        fraction = (raw >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+        fraction = np.clip((fraction - 1 / 32) * (16 / 15), 0.0, 1.0)
+        # Written this way so that hi - lo can't overflow.
+        result = self.lo * (1 - fraction) + self.hi * fraction
+        result = result.astype(self.float_type)
+        return np.clip(result, self.lo, self.hi)
+
+
+def integer_cells(lo, hi, dtype):
+    if dtype.kind not in (u"i", u"u"):
+        return None
+    if not isinstance(lo, integer_types) or not isinstance(hi, integer_types):
+        return None
+    info = np.iinfo(dtype)
+    if lo <= hi and info.min <= lo and hi <= info.max:
+        return IntegerCells.for_range(lo, hi, dtype)
+    return None
+
+
+def float_range_cells(lo, hi, width, dtype):
+    if dtype.kind != u"f" or lo is None or hi is None:
+        return None
+    lo = float(lo)
+    hi = float(hi)
+    if math.isinf(lo) or math.isinf(hi) or lo > hi:
+        return None
+    narrow = np.dtype("f%d" % (min(width, dtype.itemsize * 8) // 8,))
+    with np.errstate(over="ignore"):
+        if narrow.type(lo) == lo and narrow.type(hi) == hi:
+            return FloatRangeCells(lo, hi, width)
+    return None
+
+
+def vectorised_cells(elements, dtype):
+    """Return an object whose ``draw(data, count, label)`` method draws
+    ``count`` values from ``elements`` at once as an array of ``dtype``, or
+    None if ``elements`` is not a strategy we know how to vectorise.
+
+    We handle the strategies inferred by ``from_dtype`` for boolean, integer
+    and float dtypes, and ``booleans()``, ``integers()`` and ``floats()``
+    with finite bounds that fit in ``dtype``.  Strategies passed to
+    ``arrays()`` have been unwrapped by the time we see them, so we recognise
+    the strategies they unwrap to as well as calls to the strategy functions.
+    """
+    if isinstance(elements, MappedSearchStrategy) and elements.pack is dtype.type:
+        # e.g. from_dtype() after unwrapping.  Converting values to the
+        # scalar type of the dtype before we store them makes no difference.
+        name, kwargs = strategy_call(elements.mapped_strategy)
+        if (
+            name == "floats"
+            and dtype.kind == u"f"
+            and kwargs["width"] == dtype.itemsize * 8
+            and kwargs["min_value"] is None
+            and kwargs["max_value"] is None
+            and kwargs["allow_nan"] is not False
+            and kwargs["allow_infinity"] is not False
+        ):
+            # The unbounded floats() that from_dtype() uses for this dtype.
+            return FloatCells(dtype.itemsize * 8)
+        return vectorised_cells(elements.mapped_strategy, dtype)
+    if isinstance(elements, BoolStrategy):
+        return BooleanCells() if dtype.kind == u"b" else None
+    if isinstance(elements, BoundedIntStrategy):
+        return integer_cells(elements.start, elements.end, dtype)
+    if isinstance(elements, OneOfStrategy):
+        # integers() with bounds on both sides of zero unwraps to a one_of
+        # of the ranges above and below zero.
+        ranges = []
+        for branch in elements.original_strategies:
+            cells = vectorised_cells(branch, dtype)
+            if not isinstance(cells, IntegerCells):
+                return None
+            ranges.append((cells.center - cells.below, cells.center + cells.above))
+        ranges.sort()
+        lo, hi = ranges[0]
+        for a, b in ranges[1:]:
+            if a > hi + 1:
+                return None
+            hi = max(hi, b)
+        return integer_cells(lo, hi, dtype)
+    if isinstance(elements, FixedBoundedFloatStrategy):
+        return float_range_cells(elements.lower_bound, elements.upper_bound, 64, dtype)
+
+    name, kwargs = strategy_call(elements)
+    if name == "from_dtype":
+        if kwargs["dtype"] != dtype:
+            return None
+        if dtype.kind == u"b":
+            return BooleanCells()
+        if dtype.kind in (u"i", u"u"):
+            info = np.iinfo(dtype)
+            return IntegerCells.for_range(int(info.min), int(info.max), dtype)
+        if dtype.kind == u"f" and dtype.itemsize in (2, 4, 8):
+            return FloatCells(dtype.itemsize * 8)
+    elif name == "booleans" and dtype.kind == u"b":
+        return BooleanCells()
+    elif name == "integers":
+        return integer_cells(kwargs["min_value"], kwargs["max_value"], dtype)
+    elif name == "floats" and dtype.kind == u"f":
+        if (
+            kwargs["allow_nan"]
+            or kwargs["allow_infinity"]
+            or kwargs["exclude_min"]
+            or kwargs["exclude_max"]
+        ):
+            return None
+        return float_range_cells(
+            kwargs["min_value"], kwargs["max_value"], kwargs["width"], dtype
+        )
+    return None
+
+
+class UniqueTracker(object):
+    """Tracks the distinct values that have been stored in arrays of
+    ``dtype``, for strategies which generate arrays or indexes of unique
+    values.
+
+    Values are compared as the Python objects that ``ndarray.item`` returns,
+    which are much cheaper to hash than the numpy scalars we would get by
+    indexing the array.  NaN is not equal to anything, including itself, so
+    it is never recorded and may be added any number of times.
+
+    If ``dtype`` is None values are compared as they are.
+    """
+
+    def __init__(self, dtype):
+        self.seen = set()
+        if dtype is not None:
+            self.cell = np.zeros(1, dtype=dtype)
+        else:
+            self.cell = None
+
+    def add_cell(self, array, i):
+        """Record ``array[i]``, unless an equal value has already been
+        recorded.  Returns True if it was recorded."""
+        return self.__add(array.item(i))
+
+    def add(self, value):
+        """Record ``value`` as it would be stored in an array of our dtype,
+        unless an equal value has already been recorded.  Returns True if it
+        was recorded."""
+        if self.cell is not None:
+            self.cell[0] = value
+            value = self.cell.item(0)
+        return self.__add(value)
+
+    def __add(self, key):
+        if key in self.seen:
+            return False
+        if key == key:
+            self.seen.add(key)
+        return True
+
+
 class ArrayStrategy(SearchStrategy):
     def __init__(self, element_strategy, shape, dtype, fill, unique):
         self.shape = tuple(shape)
@@ -162,6 +467,19 @@ class ArrayStrategy(SearchStrategy):
         else:
             self.check_cast = lambda x: True
 
+    @property
+    def vectorised_cells(self):
+        """If it is possible to draw every element of the array at once
+        instead of one at a time (see ``vectorised_cells``), the object to
+        do so with, else None."""
+        try:
+            return self.__vectorised_cells
+        except AttributeError:
+            self.__vectorised_cells = vectorised_cells(
+                self.element_strategy, self.dtype
+            )
+            return self.__vectorised_cells
+
     def set_element(self, data, result, idx, strategy=None):
         strategy = strategy or self.element_strategy
         val = data.draw(strategy)
@@ -179,6 +497,30 @@ class ArrayStrategy(SearchStrategy):
             # We therefore only warn once per draw, unless in verbose mode.
             self._report_overflow = current_verbosity() >= Verbosity.verbose
 
+    def draw_dense(self, data, result, nested=True):
+        """Draw a value for every cell of ``result``, which is the flattened
+        array (or, if ``nested`` is False, a slice of it).
+
+        The cells are drawn inside an example labelled as a dense array, as a
+        hint to the shrinker (see ``cu.DENSE_ARRAY_LABEL``).  If the array
+        has more than one dimension, each slice along its first axis is
+        drawn inside a nested example of its own, so that the shrinker can
+        also find the cells which make up slices along the other axes.
+        """
+        data.start_example(cu.DENSE_ARRAY_LABEL)
+        if nested and len(self.shape) > 1 and self.shape[0] > 1:
+            step = len(result) // self.shape[0]
+            for i in hrange(self.shape[0]):
+                self.draw_dense(data, result[i * step : (i + 1) * step], nested=False)
+        elif self.vectorised_cells is not None:
+            result[:] = self.vectorised_cells.draw(
+                data, len(result), self.element_strategy.label
+            )
+        else:
+            for i in hrange(len(result)):
+                self.set_element(data, result, i)
+        data.stop_example()
+
     def do_draw(self, data):
         if 0 in self.shape:
             return np.zeros(dtype=self.dtype, shape=self.shape)
@@ -198,7 +540,7 @@ class ArrayStrategy(SearchStrategy):
             # generate a fully dense array with a freshly drawn value for each
             # entry.
             if self.unique:
-                seen = set()
+                seen = UniqueTracker(self.dtype)
                 elements = cu.many(
                     data,
                     min_size=self.array_size,
@@ -212,14 +554,12 @@ class ArrayStrategy(SearchStrategy):
                     # type for us. Because we don't increment the counter on
                     # a duplicate we will overwrite it on the next draw.
                     self.set_element(data, result, i)
-                    if result[i] not in seen:
-                        seen.add(result[i])
+                    if seen.add_cell(result, i):
                         i += 1
                     else:
                         elements.reject()
             else:
-                for i in hrange(len(result)):
-                    self.set_element(data, result, i)
+                self.draw_dense(data, result)
         else:
             # We draw numpy arrays as "sparse with an offset". We draw a
             # collection of index assignments within the array and assign
@@ -228,6 +568,7 @@ class ArrayStrategy(SearchStrategy):
             # value from our fill strategy and use that to populate the
             # remaining positions with that strategy.
 
+            data.start_example(cu.SPARSE_ARRAY_LABEL)
             elements = cu.many(
                 data,
                 min_size=0,
@@ -239,7 +580,7 @@ class ArrayStrategy(SearchStrategy):
             )
 
             needs_fill = np.full(self.array_size, True)
-            seen = set()
+            seen = UniqueTracker(self.dtype)
 
             while elements.more():
                 i = cu.integer_range(data, 0, self.array_size - 1)
@@ -247,13 +588,11 @@ class ArrayStrategy(SearchStrategy):
                     elements.reject()
                     continue
                 self.set_element(data, result, i)
-                if self.unique:
-                    if result[i] in seen:
-                        elements.reject()
-                        continue
-                    else:
-                        seen.add(result[i])
+                if self.unique and not seen.add_cell(result, i):
+                    elements.reject()
+                    continue
                 needs_fill[i] = False
+            data.stop_example()
             if needs_fill.any():
                 # We didn't fill all of the indices in the early loop, so we
                 # put a fill value into the rest.
@@ -130,7 +130,7 @@ class ValueIndexStrategy(st.SearchStrategy):
 
     def do_draw(self, data):
         result = []
-        seen = set()
+        seen = npst.UniqueTracker(self.dtype)
 
         iterator = cu.many(
             data,
@@ -142,11 +142,9 @@ class ValueIndexStrategy(st.SearchStrategy):
         while iterator.more():
             elt = data.draw(self.elements)
 
-            if self.unique:
-                if elt in seen:
-                    iterator.reject()
-                    continue
-                seen.add(elt)
+            if self.unique and not seen.add(elt):
+                iterator.reject()
+                continue
             result.append(elt)
 
         dtype = infer_dtype_if_necessary(
@@ -274,29 +272,9 @@ def series(
         index = draw(index_strategy)
 
         if len(index) > 0:
-            if dtype is not None:
-                result_data = draw(
-                    npst.arrays(
-                        dtype=dtype,
-                        elements=elements,
-                        shape=len(index),
-                        fill=fill,
-                        unique=unique,
-                    )
-                )
-            else:
-                result_data = list(
-                    draw(
-                        npst.arrays(
-                            dtype=object,
-                            elements=elements,
-                            shape=len(index),
-                            fill=fill,
-                            unique=unique,
-                        )
-                    )
-                )
-
+            result_data = draw_column_values(
+                draw, len(index), elements, dtype, fill, unique
+            )
             return pandas.Series(result_data, index=index, dtype=dtype)
         else:
             return pandas.Series(
@@ -310,6 +288,27 @@ def series(
     return result()
 
 
+def draw_column_values(draw, size, elements, dtype, fill, unique):
+    """Draw the ``size`` values of a column (or series) as a single numpy
+    array, using the same strategy as :func:`~hypothesis.extra.numpy.arrays`.
+
+    If ``dtype`` is None the values are returned as a list instead, so that
+    pandas can infer the dtype from them.
+    """
+    values = draw(
+        npst.arrays(
+            dtype=dtype if dtype is not None else object,
+            elements=elements,
+            shape=size,
+            fill=fill,
+            unique=unique,
+        )
+    )
+    if dtype is None:
+        return list(values)
+    return values
+
+
 @attr.s(slots=True)
 class column(object):
     """Data object for describing a column in a DataFrame.
@@ -551,15 +550,28 @@ def data_frames(
         @st.composite
         def just_draw_columns(draw):
             index = draw(index_strategy)
-            local_index_strategy = st.just(index)
 
-            data = OrderedDict((c.name, None) for c in rewritten_columns)
+            # We build the DataFrame in one go from an array per column,
+            # rather than creating an object per value or assigning to it
+            # element by element.
+            data = OrderedDict()
+
+            if len(index) == 0:
+                for c in rewritten_columns:
+                    data[c.name] = pandas.Series(
+                        (),
+                        index=index,
+                        dtype=c.dtype
+                        if c.dtype is not None
+                        else draw(dtype_for_elements_strategy(c.elements)),
+                    )
+                return pandas.DataFrame(data, index=index)
 
             # Depending on how the columns are going to be generated we group
             # them differently to get better shrinking. For columns with fill
             # enabled, the elements can be shrunk independently of the size,
-            # so we can just shrink by shrinking the index then shrinking the
-            # length and are generally much more free to move data around.
+            # so we draw each column as a whole with the same strategy as
+            # arrays(), which generates dense numeric columns in bulk.
 
             # For columns with no filling the problem is harder, and drawing
             # them like that would result in rows being very far apart from
@@ -571,38 +583,43 @@ def data_frames(
             columns_without_fill = [c for c in rewritten_columns if c.fill.is_empty]
 
             if columns_without_fill:
-                for c in columns_without_fill:
-                    data[c.name] = pandas.Series(
-                        np.zeros(shape=len(index), dtype=c.dtype), index=index
-                    )
-                seen = {c.name: set() for c in columns_without_fill if c.unique}
+                values = [
+                    np.zeros(shape=len(index), dtype=c.dtype or object)
+                    for c in columns_without_fill
+                ]
+                seen = [
+                    npst.UniqueTracker(c.dtype) if c.unique else None
+                    for c in columns_without_fill
+                ]
 
                 for i in hrange(len(index)):
-                    for c in columns_without_fill:
-                        if c.unique:
+                    for c, column_values, column_seen in zip(
+                        columns_without_fill, values, seen
+                    ):
+                        if column_seen is not None:
                             for _ in range(5):
                                 value = draw(c.elements)
-                                if value not in seen[c.name]:
-                                    seen[c.name].add(value)
+                                if column_seen.add(value):
                                     break
                             else:
                                 reject()
                         else:
                             value = draw(c.elements)
-                        data[c.name][i] = value
+                        column_values[i] = value
+
+                for c, column_values in zip(columns_without_fill, values):
+                    if c.dtype is None:
+                        column_values = list(column_values)
+                    data[c.name] = column_values
 
             for c in rewritten_columns:
                 if not c.fill.is_empty:
-                    data[c.name] = draw(
-                        series(
-                            index=local_index_strategy,
-                            dtype=c.dtype,
-                            elements=c.elements,
-                            fill=c.fill,
-                            unique=c.unique,
-                        )
+                    data[c.name] = draw_column_values(
+                        draw, len(index), c.elements, c.dtype, c.fill, c.unique
                     )
 
+            # Restore the order in which the columns were defined.
+            data = OrderedDict((c.name, data[c.name]) for c in rewritten_columns)
             return pandas.DataFrame(data, index=index)
 
         return just_draw_columns()
@@ -612,25 +629,22 @@ def data_frames(
         def assign_rows(draw):
             index = draw(index_strategy)
 
-            result = pandas.DataFrame(
-                OrderedDict(
-                    (
-                        c.name,
-                        pandas.Series(
-                            np.zeros(dtype=c.dtype, shape=len(index)), dtype=c.dtype
-                        ),
-                    )
-                    for c in rewritten_columns
-                ),
-                index=index,
-            )
+            # As for columns without rows, we build the DataFrame from one
+            # array per column, filling them in row by row, rather than
+            # assigning each row to the DataFrame.
+            column_data = [
+                np.zeros(dtype=c.dtype, shape=len(index)) for c in rewritten_columns
+            ]
 
             fills = {}
 
             any_unique = any(c.unique for c in rewritten_columns)
 
             if any_unique:
-                all_seen = [set() if c.unique else None for c in rewritten_columns]
+                all_seen = [
+                    npst.UniqueTracker(c.dtype) if c.unique else None
+                    for c in rewritten_columns
+                ]
                 while all_seen[-1] is None:
                     all_seen.pop()
 
@@ -661,10 +675,9 @@ def data_frames(
                         for seen, value in zip(all_seen, row):
                             if seen is None:
                                 continue
-                            if value in seen:
+                            if not seen.add(value):
                                 has_duplicate = True
                                 break
-                            seen.add(value)
                         if has_duplicate:
                             continue
                     row = list(try_convert(tuple, row, "draw(rows)"))
@@ -679,10 +692,17 @@ def data_frames(
                         )
                     while len(row) < len(rewritten_columns):
                         row.append(draw(rewritten_columns[len(row)].fill))
-                    result.iloc[row_index] = row
+                    for values, value in zip(column_data, row):
+                        values[row_index] = value
                     break
                 else:
                     reject()
-            return result
+            return pandas.DataFrame(
+                OrderedDict(
+                    (c.name, values)
+                    for c, values in zip(rewritten_columns, column_data)
+                ),
+                index=index,
+            )
 
         return assign_rows()
@@ -17,21 +17,33 @@
 
 from __future__ import absolute_import, division, print_function
 
+import json
+import sys
+from collections import OrderedDict
 from distutils.version import LooseVersion
 
 import pytest
 
-from hypothesis import Verbosity, core, settings
-from hypothesis._settings import note_deprecation
-from hypothesis.internal.compat import OrderedDict, text_type
 from hypothesis.internal.detection import is_hypothesis_test
-from hypothesis.reporting import default as default_reporter, with_reporter
-from hypothesis.statistics import collector
+
+# This plugin is loaded by every run of pytest, including those which don't
+# run any Hypothesis tests, so it only imports the rest of Hypothesis once
+# something needs it.
 
 LOAD_PROFILE_OPTION = "--hypothesis-profile"
 VERBOSITY_OPTION = "--hypothesis-verbosity"
 PRINT_STATISTICS_OPTION = "--hypothesis-show-statistics"
+STATISTICS_JSON_OPTION = "--hypothesis-stats-json"
 SEED_OPTION = "--hypothesis-seed"
+PROFILE_STRATEGIES_OPTION = "--hypothesis-profile-strategies"
+TRACE_OPTION = "--hypothesis-trace"
+SESSION_BUDGET_OPTION = "--hypothesis-session-budget"
+
+SHARDS_MARKER = "hypothesis_shards"
+SHARD_FIXTURE = "_hypothesis_shard"
+
+# The names of the members of hypothesis.Verbosity, for VERBOSITY_OPTION.
+VERBOSITY_NAMES = ["quiet", "normal", "verbose", "debug"]
 
 
 class StoringReporter(object):
@@ -40,6 +52,9 @@ class StoringReporter(object):
         self.results = []
 
     def __call__(self, msg):
+        from hypothesis.internal.compat import text_type
+        from hypothesis.reporting import default as default_reporter
+
         if self.config.getoption("capture", "fd") == "no":
             default_reporter(msg)
         if not isinstance(msg, text_type):
@@ -57,7 +72,7 @@ def pytest_addoption(parser):
     group.addoption(
         VERBOSITY_OPTION,
         action="store",
-        choices=[opt.name for opt in Verbosity],
+        choices=VERBOSITY_NAMES,
         help="Override profile with verbosity setting specified",
     )
     group.addoption(
@@ -66,13 +81,42 @@ def pytest_addoption(parser):
         help="Configure when statistics are printed",
         default=False,
     )
+    group.addoption(
+        STATISTICS_JSON_OPTION,
+        action="store",
+        metavar="PATH",
+        help="Write statistics for each Hypothesis test to PATH as JSON",
+    )
     group.addoption(
         SEED_OPTION, action="store", help="Set a seed to use for all Hypothesis tests"
     )
+    group.addoption(
+        PROFILE_STRATEGIES_OPTION,
+        action="store_true",
+        help="Report the strategies which take the most time to draw from",
+        default=False,
+    )
+    group.addoption(
+        TRACE_OPTION,
+        action="store",
+        metavar="PATH",
+        help="Write a trace of what Hypothesis does to PATH, as JSON lines",
+    )
+    group.addoption(
+        SESSION_BUDGET_OPTION,
+        action="store",
+        metavar="DURATION",
+        help="Share DURATION (e.g. 90s, 10m or 1h) between all Hypothesis tests",
+    )
 
 
 def pytest_report_header(config):
     profile = config.getoption(LOAD_PROFILE_OPTION)
+    if not profile and "hypothesis._settings" not in sys.modules:
+        # Nothing can have changed the default profile.
+        return "hypothesis profile 'default'"
+    from hypothesis import settings
+
     if not profile:
         profile = settings._current_profile
     settings_str = settings.get_profile(profile).show_changed()
@@ -82,12 +126,17 @@ def pytest_report_header(config):
 
 
 def pytest_configure(config):
-    core.running_under_pytest = True
+    if "hypothesis.core" in sys.modules:
+        note_running_under_pytest()
     profile = config.getoption(LOAD_PROFILE_OPTION)
     if profile:
+        from hypothesis import settings
+
         settings.load_profile(profile)
     verbosity_name = config.getoption(VERBOSITY_OPTION)
     if verbosity_name:
+        from hypothesis import Verbosity, settings
+
         verbosity_value = Verbosity[verbosity_name]
         profile_name = "%s-with-%s-verbosity" % (
             settings._current_profile,
@@ -103,8 +152,114 @@ def pytest_configure(config):
             seed = int(seed)
         except ValueError:
             pass
+        from hypothesis import core
+
+        note_running_under_pytest()
         core.global_force_seed = seed
+    trace_path = config.getoption(TRACE_OPTION)
+    if trace_path:
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput is not None:
+            # Each pytest-xdist worker writes its own file.
+            trace_path = "%s.%s" % (trace_path, workerinput["workerid"])
+        from hypothesis.internal.conjecture.trace import EventTrace
+
+        config.hypothesis_event_trace = EventTrace(trace_path)
+    if (
+        config.getoption(STATISTICS_JSON_OPTION)
+        and LooseVersion(pytest.__version__) < "3.5"
+    ):  # pragma: no cover
+        # We pass the statistics from each test to the terminal summary in
+        # user_properties, which older versions don't have.
+        raise pytest.UsageError("%s requires pytest >= 3.5" % (STATISTICS_JSON_OPTION,))
+    budget = config.getoption(SESSION_BUDGET_OPTION)
+    if budget is not None:
+        from hypothesis.errors import InvalidArgument
+        from hypothesis.internal.scheduling import parse_duration
+
+        try:
+            config.hypothesis_session_budget_seconds = parse_duration(budget)
+        except InvalidArgument as e:
+            raise pytest.UsageError(str(e))
     config.addinivalue_line("markers", "hypothesis: Tests which use hypothesis.")
+    config.addinivalue_line(
+        "markers",
+        "%s(n): Split the examples of this Hypothesis test between n tests, "
+        "which pytest-xdist can run at the same time." % (SHARDS_MARKER,),
+    )
+
+
+def note_running_under_pytest():
+    from hypothesis import core
+
+    core.running_under_pytest = True
+
+
+def pytest_collection_finish(session):
+    seconds = getattr(session.config, "hypothesis_session_budget_seconds", None)
+    if seconds is not None:
+        from hypothesis.internal.scheduling import SessionBudget
+
+        tests = [
+            item
+            for item in session.items
+            if hasattr(item, "obj") and is_hypothesis_test(item.obj)
+        ]
+        test_count = len(tests)
+        workerinput = getattr(session.config, "workerinput", None)
+        if workerinput is not None:
+            # Every pytest-xdist worker collects the whole session, but only
+            # runs its share of it, so it gets that share of the budget.
+            # Which tests it runs isn't known until they are sent to it, so
+            # we assume they are split evenly.
+            workers = workerinput["workercount"]
+            seconds /= workers
+            test_count = -(-test_count // workers)
+        session.config.hypothesis_session_budget = SessionBudget(seconds, test_count)
+
+
+def shard_count(metafunc):
+    definition = getattr(metafunc, "definition", None)
+    if definition is not None:
+        marker = definition.get_closest_marker(SHARDS_MARKER)
+    else:  # pragma: no cover
+        # pytest < 3.6
+        marker = getattr(metafunc.function, SHARDS_MARKER, None)
+    if marker is None:
+        return 1
+    (count,) = marker.args
+    if not isinstance(count, int) or count < 1:
+        raise pytest.UsageError(
+            "%s expects a positive number of shards, but got %r"
+            % (SHARDS_MARKER, count)
+        )
+    return count
+
+
+def pytest_generate_tests(metafunc):
+    if not is_hypothesis_test(metafunc.function):
+        return
+    count = shard_count(metafunc)
+    if count > 1:
+        # The fixture isn't an argument of the test, so asking for it here is
+        # the only way to parametrize over it.
+        metafunc.fixturenames.append(SHARD_FIXTURE)
+        metafunc.parametrize(
+            SHARD_FIXTURE,
+            [(i, count) for i in range(count)],
+            ids=["shard%d" % (i,) for i in range(count)],
+        )
+
+
+@pytest.fixture
+def _hypothesis_shard(request):
+    return request.param
+
+
+def pytest_unconfigure(config):
+    trace = getattr(config, "hypothesis_event_trace", None)
+    if trace is not None:
+        trace.close()
 
 
 gathered_statistics = OrderedDict()  # type: dict
@@ -112,19 +267,40 @@ gathered_statistics = OrderedDict()  # type: dict
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_call(item):
+    if "hypothesis.core" in sys.modules:
+        # Hypothesis may have been imported since pytest_configure.
+        note_running_under_pytest()
     if not (hasattr(item, "obj") and is_hypothesis_test(item.obj)):
         yield
     else:
+        from hypothesis.internal.conjecture.trace import current_trace
+        from hypothesis.internal.scheduling import current_shard, session_budget
+        from hypothesis.reporting import with_reporter
+        from hypothesis.statistics import collector, profile_strategies
+
         store = StoringReporter(item.config)
 
         def note_statistics(stats):
             lines = [item.nodeid + ":", ""] + stats.get_description() + [""]
             gathered_statistics[item.nodeid] = lines
             item.hypothesis_statistics = lines
-
+            if item.config.getoption(STATISTICS_JSON_OPTION):
+                item.hypothesis_statistics_json = stats.as_json()
+
+        profiling = item.config.getoption(PROFILE_STRATEGIES_OPTION)
+        trace = getattr(item.config, "hypothesis_event_trace", None)
+        if trace is not None:
+            trace.test = item.nodeid
+        budget = getattr(item.config, "hypothesis_session_budget", None)
+        callspec = getattr(item, "callspec", None)
+        shard = None if callspec is None else callspec.params.get(SHARD_FIXTURE)
         with collector.with_value(note_statistics):
-            with with_reporter(store):
-                yield
+            with profile_strategies.with_value(profiling):
+                with current_trace.with_value(trace):
+                    with session_budget.with_value(budget):
+                        with current_shard.with_value(shard):
+                            with with_reporter(store):
+                                yield
         if store.results:
             item.hypothesis_report_information = list(store.results)
 
@@ -140,15 +316,30 @@ def pytest_runtest_makereport(item, call):
         # Running on pytest < 3.5 where user_properties doesn't exist, fall
         # back on the global gathered_statistics (which breaks under xdist)
         if hasattr(report, "user_properties"):  # pragma: no branch
-            val = ("hypothesis-stats", item.hypothesis_statistics)
+            vals = [("hypothesis-stats", item.hypothesis_statistics)]
+            if hasattr(item, "hypothesis_statistics_json"):
+                vals.append(("hypothesis-stats-json", item.hypothesis_statistics_json))
             # Workaround for https://github.com/pytest-dev/pytest/issues/4034
             if isinstance(report.user_properties, tuple):
-                report.user_properties += (val,)
+                report.user_properties += tuple(vals)
             else:
-                report.user_properties.append(val)
+                report.user_properties.extend(vals)
+
+
+def write_statistics_json(terminalreporter, path):
+    statistics = {}
+    for test_report in terminalreporter.stats.get("", []):
+        for name, value in test_report.user_properties:
+            if name == "hypothesis-stats-json" and test_report.when == "teardown":
+                statistics[test_report.nodeid] = value
+    with open(path, "w") as f:
+        json.dump(statistics, f, indent=2, sort_keys=True)
 
 
 def pytest_terminal_summary(terminalreporter):
+    json_path = terminalreporter.config.getoption(STATISTICS_JSON_OPTION)
+    if json_path:
+        write_statistics_json(terminalreporter, json_path)
     if not terminalreporter.config.getoption(PRINT_STATISTICS_OPTION):
         return
     terminalreporter.section("Hypothesis Statistics")
@@ -183,6 +374,8 @@ def pytest_collection_modifyitems(items):
         if getattr(item.obj, "is_hypothesis_strategy_function", False):
 
             def note_strategy_is_not_test(*args, **kwargs):
+                from hypothesis._settings import note_deprecation
+
                 note_deprecation(
                     "%s is a function that returns a Hypothesis strategy, "
                     "but pytest has collected it as a test function.  This "
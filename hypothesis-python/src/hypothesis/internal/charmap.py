@@ -20,13 +20,14 @@ from __future__ import absolute_import, division, print_function
 import gzip
 import json
 import os
+import struct
 import sys
 import tempfile
 import unicodedata
 
 from hypothesis.configuration import storage_directory, tmpdir
 from hypothesis.errors import InvalidArgument
-from hypothesis.internal.compat import hunichr
+from hypothesis.internal.compat import abc, hunichr
 
 if False:
     from typing import Dict, Tuple
@@ -41,6 +42,117 @@ def charmap_file():
     )
 
 
+def charmap_table_file(version=None):
+    """Return the path of the precomputed charmap table that ships with
+    Hypothesis for the given version of the Unicode database (by default,
+    the version used by this interpreter).
+
+    The file may not exist, e.g. for interpreters whose Unicode version we
+    did not have a table for at release time.
+    """
+    return os.path.join(
+        os.path.dirname(__file__),
+        "charmaps",
+        "%s.bin" % (version or unicodedata.unidata_version,),
+    )
+
+
+# The table format is deliberately simple, so that a single category can be
+# decoded with one call to struct.unpack_from and nothing else:
+#
+#   header:  magic, maxunicode (uint32), number of categories (uint16)
+#   index:   for each category, its name (2 bytes), the offset of its
+#            intervals from the start of the file (uint32), and the number of
+#            intervals (uint32)
+#   body:    for each category, a flat sequence of uint32 pairs (u, v)
+#
+# All integers are little-endian.
+TABLE_MAGIC = b"HypCharmap1\n"
+_TABLE_HEADER = struct.Struct("<%dsIH" % (len(TABLE_MAGIC),))
+_TABLE_INDEX_ENTRY = struct.Struct("<2sII")
+
+
+def encode_charmap_table(charmap, maxunicode=None):
+    """Serialise a dict in the format returned by ``charmap()`` to the
+    compact binary table format read by ``CharmapTable``."""
+    if maxunicode is None:
+        maxunicode = sys.maxunicode
+    cats = sorted(charmap)
+    offset = _TABLE_HEADER.size + _TABLE_INDEX_ENTRY.size * len(cats)
+    header = [_TABLE_HEADER.pack(TABLE_MAGIC, maxunicode, len(cats))]
+    body = []
+    for c in cats:
+        intervals = charmap[c]
+        header.append(
+            _TABLE_INDEX_ENTRY.pack(c.encode("ascii"), offset, len(intervals))
+        )
+        flat = [x for pair in intervals for x in pair]
+        body.append(struct.pack("<%dI" % (len(flat),), *flat))
+        offset += len(body[-1])
+    return b"".join(header + body)
+
+
+class CharmapTable(abc.Mapping):
+    """A read-only mapping from Unicode categories to tuples of intervals,
+    backed by a precomputed binary table.
+
+    Only the index is parsed up front - the intervals for each category are
+    decoded the first time that category is looked up, so e.g.
+    ``characters(whitelist_categories=['Lu'])`` never pays to decode the
+    rest of the table.
+    """
+
+    def __init__(self, data):
+        magic, maxunicode, n = _TABLE_HEADER.unpack_from(data, 0)
+        if magic != TABLE_MAGIC:
+            raise ValueError("Not a charmap table")
+        self.maxunicode = maxunicode
+        self.__data = data
+        self.__index = {}
+        for i in range(n):
+            name, offset, count = _TABLE_INDEX_ENTRY.unpack_from(
+                data, _TABLE_HEADER.size + i * _TABLE_INDEX_ENTRY.size
+            )
+            if offset + 8 * count > len(data):
+                raise ValueError("Truncated charmap table")
+            self.__index[name.decode("ascii")] = (offset, count)
+        self.__decoded = {}
+
+    def interval_count(self, category):
+        """Return len(self[category]), without decoding the intervals."""
+        return self.__index[category][1]
+
+    def __getitem__(self, category):
+        try:
+            return self.__decoded[category]
+        except KeyError:
+            pass
+        offset, count = self.__index[category]
+        flat = struct.unpack_from("<%dI" % (2 * count,), self.__data, offset)
+        result = tuple(zip(flat[::2], flat[1::2]))
+        self.__decoded[category] = result
+        return result
+
+    def __iter__(self):
+        return iter(sorted(self.__index))
+
+    def __len__(self):
+        return len(self.__index)
+
+
+def load_charmap_table(path):
+    """Load the table at ``path``, raising an exception if it is missing,
+    malformed or was computed for a different ``sys.maxunicode``."""
+    with open(path, "rb") as f:
+        table = CharmapTable(f.read())
+    if table.maxunicode != sys.maxunicode:
+        raise ValueError(
+            "Table has maxunicode=%d, but sys.maxunicode=%d"
+            % (table.maxunicode, sys.maxunicode)
+        )
+    return table
+
+
 _charmap = None
 
 
@@ -53,9 +165,16 @@ def charmap():
     """
     global _charmap
     # Best-effort caching in the face of missing files and/or unwritable
-    # filesystems is fairly simple: check if loaded, else try loading,
-    # else calculate and try writing the cache.
+    # filesystems is fairly simple: check if loaded, else try loading the
+    # table we ship, else try loading the cache, else calculate and try
+    # writing the cache.
     if _charmap is None:
+        try:
+            _charmap = load_charmap_table(charmap_table_file())
+            return _charmap
+        except Exception:
+            pass
+
         f = charmap_file()
         try:
             with gzip.GzipFile(f, "rb") as i:
@@ -112,7 +231,17 @@ def categories():
     global _categories
     if _categories is None:
         cm = charmap()
-        _categories = sorted(cm.keys(), key=lambda c: len(cm[c]))
+        if isinstance(cm, CharmapTable):
+            # Avoid decoding every category just to count the intervals
+            count = cm.interval_count
+        else:
+
+            def count(c):
+                return len(cm[c])
+
+        # Break ties by name, so that the order does not depend on whether
+        # the charmap was loaded from a table, the cache, or computed.
+        _categories = sorted(cm.keys(), key=lambda c: (count(c), c))
         _categories.remove("Cc")  # Other, Control
         _categories.remove("Cs")  # Other, Surrogate
         _categories.append("Cc")
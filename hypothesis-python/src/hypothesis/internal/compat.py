@@ -580,21 +580,19 @@ else:
     from base64 import b64decode
 
 
-try:
-    from django.test import TransactionTestCase
-
-    def bad_django_TestCase(runner):
-        if runner is None:
-            return False
-        if not isinstance(runner, TransactionTestCase):
-            return False
-
-        from hypothesis.extra.django._impl import HypothesisTestCase
-
-        return not isinstance(runner, HypothesisTestCase)
+def bad_django_TestCase(runner):
+    # Importing Django is slow, and if it hasn't been imported then runner
+    # can't be a Django test case, so we only look if it has been.
+    if runner is None or "django.test" not in sys.modules:
+        return False
+    try:
+        from django.test import TransactionTestCase
+    except Exception:  # pragma: no cover
+        # Can't use ImportError, because of e.g. Django config errors
+        return False
+    if not isinstance(runner, TransactionTestCase):
+        return False
 
+    from hypothesis.extra.django._impl import HypothesisTestCase
 
-except Exception:
-    # Can't use ImportError, because of e.g. Django config errors
-    def bad_django_TestCase(runner):
-        return False
+    return not isinstance(runner, HypothesisTestCase)
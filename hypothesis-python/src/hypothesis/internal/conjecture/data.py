@@ -157,13 +157,17 @@ class ConjectureData(object):
     @classmethod
     def for_buffer(self, buffer):
         buffer = hbytes(buffer)
-        return ConjectureData(
+        result = ConjectureData(
             max_length=len(buffer),
             draw_bytes=lambda data, n: hbytes(buffer[data.index : data.index + n]),
         )
+        result.fixed_buffer = buffer
+        return result
 
     def __init__(self, max_length, draw_bytes):
         self.max_length = max_length
+        # The buffer we will read from, if it is known in advance.
+        self.fixed_buffer = None
         self.is_find = False
         self._draw_bytes = draw_bytes
         self.overdraw = 0
@@ -184,6 +188,8 @@ class ConjectureData(object):
         self.interesting_origin = None
         self.draw_times = []
         self.max_depth = 0
+        # A DrawProfiler to tell about each draw, if we are profiling.
+        self.profiler = None
 
         self.examples = []
         self.example_stack = []
@@ -240,6 +246,8 @@ class ConjectureData(object):
         at_top_level = self.depth == 0
         if label is None:
             label = strategy.label
+        if self.profiler is not None and not self.frozen:
+            self.profiler.note_strategy(label, strategy)
         self.start_example(label=label)
         try:
             if not at_top_level:
@@ -270,6 +278,8 @@ class ConjectureData(object):
             self.examples[p].children.append(ex)
         self.example_stack.append(i)
         self.max_depth = max(self.max_depth, self.depth)
+        if self.profiler is not None:
+            self.profiler.start_example(i, label)
         return ex
 
     def stop_example(self, discard=False):
@@ -280,6 +290,9 @@ class ConjectureData(object):
         ex = self.examples[k]
         ex.end = self.index
 
+        if self.profiler is not None:
+            self.profiler.stop_example(k)
+
         if self.example_stack and not ex.trivial:
             self.examples[self.example_stack[-1]].trivial = False
 
@@ -349,6 +362,86 @@ class ConjectureData(object):
         assert bit_length(result) <= n
         return result
 
+    def draw_bits_sequence(self, n, count, label):
+        """Draw ``count`` integers of ``n`` bits each, returned as a list.
+
+        This is equivalent to calling ``draw_bits(n)`` ``count`` times, each
+        inside its own example with the given label, and produces the same
+        buffer and blocks as doing so would. The difference is that all of
+        the bytes are requested from the underlying source in a single call,
+        and the bookkeeping is done in one tight loop, which makes it much
+        cheaper for strategies that draw many small values at once (e.g. the
+        characters of a long string).
+
+        The only structural difference is that each labelled example is a
+        leaf, rather than having a single child example for its block with
+        exactly the same bounds, as that would give the shrinker nothing
+        extra to work with.
+        """
+        self.__assert_not_frozen("draw_bits_sequence")
+        assert n > 0
+        if count == 0:
+            return []
+        n_bytes = (n + 7) // 8
+        total = n_bytes * count
+        self.__check_capacity(total)
+        buf = bytearray(self._draw_bytes(self, total))
+        assert len(buf) == total
+
+        initial = self.index
+        if n % 8:
+            mask = (1 << (n % 8)) - 1
+            for i in hrange(0, total, n_bytes):
+                buf[i] &= mask
+                self.masked_indices[initial + i] = mask
+        if n_bytes == 1:
+            result = list(buf)
+        else:
+            result = [
+                int_from_bytes(buf[i : i + n_bytes]) for i in hrange(0, total, n_bytes)
+            ]
+
+        depth = self.depth + 1
+        parent = self.examples[self.example_stack[-1]].children
+        examples = self.examples
+        blocks = self.blocks
+        block_starts = self.block_starts.setdefault(n_bytes, [])
+        first_example = len(examples)
+        first_block = len(blocks)
+        for i, value in enumerate(result):
+            start = initial + i * n_bytes
+            end = start + n_bytes
+            all_zero = value == 0
+            ex = Example(
+                index=first_example + i,
+                depth=depth,
+                label=label,
+                start=start,
+                end=end,
+                trivial=all_zero,
+                discarded=False,
+                children=[],
+            )
+            parent.append(ex)
+            examples.append(ex)
+            blocks.append(
+                Block(
+                    start=start,
+                    end=end,
+                    index=first_block + i,
+                    forced=False,
+                    all_zero=all_zero,
+                )
+            )
+            block_starts.append(start)
+
+        if any(result):
+            self.examples[self.example_stack[-1]].trivial = False
+        self.max_depth = max(self.max_depth, depth)
+        self.buffer.extend(buf)
+        self.index = len(self.buffer)
+        return result
+
     def write(self, string):
         string = hbytes(string)
         self.__assert_not_frozen("write")
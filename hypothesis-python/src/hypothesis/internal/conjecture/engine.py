@@ -17,6 +17,9 @@
 
 from __future__ import absolute_import, division, print_function
 
+import base64
+import math
+from contextlib import contextmanager
 from enum import Enum
 from random import Random, getrandbits
 from weakref import WeakKeyDictionary
@@ -28,6 +31,8 @@ from hypothesis._settings import local_settings
 from hypothesis.internal.cache import LRUReusedCache
 from hypothesis.internal.compat import (
     Counter,
+    OrderedDict,
+    benchmark_time,
     ceil,
     hbytes,
     hrange,
@@ -43,8 +48,11 @@ from hypothesis.internal.conjecture.data import (
     StopTest,
 )
 from hypothesis.internal.conjecture.datatree import DataTree
+from hypothesis.internal.conjecture.profiler import DrawProfiler
 from hypothesis.internal.conjecture.shrinker import Shrinker, sort_key
+from hypothesis.internal.conjecture.trace import current_trace
 from hypothesis.internal.healthcheck import fail_health_check
+from hypothesis.internal.quantiles import QuantileSketch, RunningTotal
 from hypothesis.reporting import debug_report
 
 # Tell pytest to omit the body of this module from tracebacks
@@ -56,6 +64,20 @@ MAX_SHRINKS = 500
 CACHE_SIZE = 10000
 MUTATION_POOL_SIZE = 100
 
+# When sharing a corpus with other processes, how many test cases we run
+# between checks for new failing examples from them.
+SHARED_CORPUS_INTERVAL = 50
+
+# A time budget never stops us generating examples until we have this many
+# valid ones.
+MIN_EXAMPLES_IN_TIME_BUDGET = 10
+
+# Once generating a single test case for the health checks takes this long,
+# we start profiling them so that we can say which strategy is slow if they
+# fail the too_slow health check.  Until then we don't, as the profiler would
+# add to the time taken.
+PROFILE_SLOW_GENERATION_AFTER = 0.1
+
 
 @attr.s
 class HealthCheckState(object):
@@ -63,6 +85,7 @@ class HealthCheckState(object):
     invalid_examples = attr.ib(default=0)
     overrun_examples = attr.ib(default=0)
     draw_times = attr.ib(default=attr.Factory(list))
+    profiler = attr.ib(default=None)
 
 
 class ExitReason(Enum):
@@ -71,6 +94,7 @@ class ExitReason(Enum):
     max_shrinks = 3
     finished = 4
     flaky = 5
+    time_budget = 6
 
 
 class RunIsComplete(Exception):
@@ -78,7 +102,16 @@ class RunIsComplete(Exception):
 
 
 class ConjectureRunner(object):
-    def __init__(self, test_function, settings=None, random=None, database_key=None):
+    def __init__(
+        self,
+        test_function,
+        settings=None,
+        random=None,
+        database_key=None,
+        profile_strategies=False,
+        time_budget=None,
+        share_corpus=False,
+    ):
         self._test_function = test_function
         self.settings = settings or Settings()
         self.shrinks = 0
@@ -89,8 +122,40 @@ class ConjectureRunner(object):
         self.database_key = database_key
         self.status_runtimes = {}
 
-        self.all_drawtimes = []
-        self.all_runtimes = []
+        # Statistics only needs the totals of these, so unlike the
+        # distributions below we don't keep a sketch of them.
+        self.all_drawtimes = RunningTotal()
+        self.all_runtimes = RunningTotal()
+        self.test_case_drawtimes = QuantileSketch()
+
+        # Maps the name of each phase we have run to its duration and the
+        # number of test cases run during it.
+        self.phase_statistics = OrderedDict()
+
+        # How many of the examples we replayed from the database were still
+        # interesting, and how many were not and so were deleted.
+        self.database_hits = 0
+        self.database_misses = 0
+
+        # Attributes draw time to the strategies drawn from, if requested.
+        self.profiler = DrawProfiler() if profile_strategies else None
+
+        # If set, we stop generating new examples after this many seconds -
+        # though not before we have a few valid ones.
+        self.time_budget = time_budget
+        self.generation_deadline = None
+
+        # If set, other processes are looking for bugs in the same test at
+        # the same time, so we check the database for any they have found as
+        # we go.
+        self.share_corpus = share_corpus
+        self.shared_examples = set()
+
+        # Where to write a trace of what we do, if anywhere, and a description
+        # of where the test cases we are about to run came from for it.
+        trace = current_trace.value
+        self.trace = None if trace is None else trace.new_run()
+        self.test_origin = None
 
         self.events_to_strings = WeakKeyDictionary()
 
@@ -135,6 +200,12 @@ class ConjectureRunner(object):
     def test_function(self, data):
         self.call_count += 1
 
+        if self.profiler is not None:
+            data.profiler = self.profiler
+        elif self.health_check_state is not None:
+            # Only set once generation has been slow for the health checks.
+            data.profiler = self.health_check_state.profiler
+
         try:
             self.__stoppable_test_function(data)
         except BaseException:
@@ -143,6 +214,8 @@ class ConjectureRunner(object):
         finally:
             data.freeze()
             self.note_details(data)
+            if self.trace is not None:
+                self.trace_test_case(data)
 
         self.target_selector.add(data)
 
@@ -201,6 +274,12 @@ class ConjectureRunner(object):
         if not self.interesting_examples:
             if self.valid_examples >= self.settings.max_examples:
                 self.exit_with(ExitReason.max_examples)
+            if (
+                self.generation_deadline is not None
+                and self.valid_examples >= MIN_EXAMPLES_IN_TIME_BUDGET
+                and benchmark_time() >= self.generation_deadline
+            ):
+                self.exit_with(ExitReason.time_budget)
             if self.call_count >= max(
                 self.settings.max_examples * 10,
                 # We have a high-ish default max iterations, so that tests
@@ -210,6 +289,8 @@ class ConjectureRunner(object):
                 self.exit_with(ExitReason.max_iterations)
 
         if self.__tree_is_exhausted():
+            if self.trace is not None:
+                self.trace_event("tree-exhausted", {})
             self.exit_with(ExitReason.finished)
 
         self.record_for_health_check(data)
@@ -240,6 +321,10 @@ class ConjectureRunner(object):
             return
 
         state.draw_times.extend(data.draw_times)
+        if state.profiler is None and (
+            sum(data.draw_times) > PROFILE_SLOW_GENERATION_AFTER
+        ):
+            state.profiler = DrawProfiler()
 
         if data.status == Status.VALID:
             state.valid_examples += 1
@@ -306,19 +391,32 @@ class ConjectureRunner(object):
                     draw_time,
                     state.invalid_examples,
                     state.overrun_examples,
-                ),
+                )
+                + self.__describe_slowest_strategy(state),
                 HealthCheck.too_slow,
             )
 
+    def __describe_slowest_strategy(self, state):
+        profiler = self.profiler or state.profiler
+        slowest = [] if profiler is None else profiler.heaviest(1)
+        if not slowest:
+            return ""
+        return (
+            " The slowest strategy was %s, which took %.2f seconds not "
+            "counting the strategies it draws from."
+        ) % (slowest[0].name, slowest[0].exclusive)
+
     def save_buffer(self, buffer):
         if self.settings.database is not None:
             key = self.database_key
             if key is None:
                 return
+            self.trace_database("save", "primary", buffer)
             self.settings.database.save(key, hbytes(buffer))
 
     def downgrade_buffer(self, buffer):
         if self.settings.database is not None and self.database_key is not None:
+            self.trace_database("move", "primary", buffer)
             self.settings.database.move(self.database_key, self.secondary_key, buffer)
 
     @property
@@ -335,9 +433,15 @@ class ConjectureRunner(object):
         else:
             self.__data_cache[data.buffer] = data
         runtime = max(data.finish_time - data.start_time, 0.0)
-        self.all_runtimes.append(runtime)
-        self.all_drawtimes.extend(data.draw_times)
-        self.status_runtimes.setdefault(data.status, []).append(runtime)
+        drawtime = math.fsum(data.draw_times)
+        self.all_runtimes.add(runtime)
+        self.all_drawtimes.add(drawtime)
+        self.test_case_drawtimes.add(drawtime)
+        try:
+            self.status_runtimes[data.status].add(runtime)
+        except KeyError:
+            self.status_runtimes[data.status] = QuantileSketch()
+            self.status_runtimes[data.status].add(runtime)
         for event in set(map(self.event_to_string, data.events)):
             self.event_call_counts[event] += 1
 
@@ -345,6 +449,32 @@ class ConjectureRunner(object):
         with local_settings(self.settings):
             debug_report(message)
 
+    def trace_event(self, event, fields):
+        if self.trace is not None:
+            self.trace.write(event, fields)
+
+    def trace_test_case(self, data):
+        fields = {
+            "call": self.call_count,
+            "origin": self.test_origin,
+            "buffer-length": len(data.buffer),
+            "status": data.status.name.lower(),
+            "runtime": data.finish_time - data.start_time,
+        }
+        if data.status == Status.INTERESTING:
+            fields["interesting-origin"] = data.interesting_origin
+        self.trace.write("test-case", fields)
+
+    def trace_database(self, operation, key, buffer=None, count=None):
+        if self.trace is None:
+            return
+        fields = {"operation": operation, "key": key}
+        if buffer is not None:
+            fields["buffer-length"] = len(buffer)
+        if count is not None:
+            fields["count"] = count
+        self.trace.write("database", fields)
+
     @property
     def report_debug_info(self):
         return self.settings.verbosity >= Verbosity.debug
@@ -386,10 +516,32 @@ class ConjectureRunner(object):
 
     def run(self):
         with local_settings(self.settings):
+            if self.trace is not None:
+                self.trace_event(
+                    "run-start",
+                    {
+                        "database-key": None
+                        if self.database_key is None
+                        else base64.b64encode(self.database_key).decode("ascii"),
+                        "max-examples": self.settings.max_examples,
+                    },
+                )
             try:
                 self._run()
             except RunIsComplete:
                 pass
+            finally:
+                if self.trace is not None:
+                    exit_reason = getattr(self, "exit_reason", None)
+                    self.trace_event(
+                        "run-end",
+                        {
+                            "exit-reason": getattr(exit_reason, "name", None),
+                            "call-count": self.call_count,
+                            "valid-examples": self.valid_examples,
+                            "shrinks": self.shrinks,
+                        },
+                    )
             for v in self.interesting_examples.values():
                 self.debug_data(v)
             self.debug(
@@ -471,6 +623,8 @@ class ConjectureRunner(object):
         ]
 
         bits = [self.random.choice(options) for _ in hrange(3)]
+        if self.trace is not None:
+            self.trace_event("mutator", {"operations": [f.__name__ for f in bits]})
 
         prefix = [None]
 
@@ -553,11 +707,17 @@ class ConjectureRunner(object):
             corpus = sorted(
                 self.settings.database.fetch(self.database_key), key=sort_key
             )
+            self.trace_database("fetch", "primary", count=len(corpus))
             desired_size = max(2, ceil(0.1 * self.settings.max_examples))
 
             for extra_key in [self.secondary_key, self.covering_key]:
                 if len(corpus) < desired_size:
                     extra_corpus = list(self.settings.database.fetch(extra_key))
+                    self.trace_database(
+                        "fetch",
+                        "secondary" if extra_key == self.secondary_key else "coverage",
+                        count=len(extra_corpus),
+                    )
 
                     shortfall = desired_size - len(corpus)
 
@@ -570,15 +730,37 @@ class ConjectureRunner(object):
 
             self.used_examples_from_database = len(corpus) > 0
 
+            self.test_origin = "database"
+            self.shared_examples.update(corpus)
             for existing in corpus:
                 last_data = ConjectureData.for_buffer(existing)
                 try:
                     self.test_function(last_data)
                 finally:
-                    if last_data.status != Status.INTERESTING:
+                    if last_data.status == Status.INTERESTING:
+                        self.database_hits += 1
+                    else:
+                        self.database_misses += 1
+                        self.trace_database("delete", "primary", existing)
                         self.settings.database.delete(self.database_key, existing)
                         self.settings.database.delete(self.secondary_key, existing)
 
+    def reuse_shared_examples(self):
+        """Try any failing examples which other processes sharing our
+        corpus have saved to the database since we last looked."""
+        if self.database is None:
+            return
+        corpus = [
+            buffer
+            for buffer in self.database.fetch(self.database_key)
+            if buffer not in self.shared_examples
+        ]
+        self.trace_database("fetch", "primary", count=len(corpus))
+        self.shared_examples.update(corpus)
+        self.test_origin = "shared"
+        for buffer in sorted(corpus, key=sort_key):
+            self.cached_test_function(buffer)
+
     def exit_with(self, reason):
         self.exit_reason = reason
         raise RunIsComplete()
@@ -587,6 +769,7 @@ class ConjectureRunner(object):
         if Phase.generate not in self.settings.phases:
             return
 
+        self.test_origin = "zero"
         zero_data = self.cached_test_function(hbytes(self.settings.buffer_size))
         if zero_data.status > Status.OVERRUN:
             self.__data_cache.pin(zero_data.buffer)
@@ -624,6 +807,10 @@ class ConjectureRunner(object):
 
         self.health_check_state = HealthCheckState()
 
+        if self.time_budget is not None:
+            self.generation_deadline = benchmark_time() + self.time_budget
+
+        self.test_origin = "generate"
         count = 0
         while not self.interesting_examples and (
             count < 10 or self.health_check_state is not None
@@ -654,7 +841,14 @@ class ConjectureRunner(object):
 
         zero_bound_queue = []
 
+        next_shared_corpus_check = self.call_count + SHARED_CORPUS_INTERVAL
+
         while not self.interesting_examples:
+            if self.share_corpus and self.call_count >= next_shared_corpus_check:
+                next_shared_corpus_check = self.call_count + SHARED_CORPUS_INTERVAL
+                self.reuse_shared_examples()
+                if self.interesting_examples:
+                    break
             if zero_bound_queue:
                 # Whenever we generated an example and it hits a bound
                 # which forces zero blocks into it, this creates a weird
@@ -687,6 +881,7 @@ class ConjectureRunner(object):
                         result += hbytes(n - len(result))
                     return self.__rewrite(data, result)
 
+                self.test_origin = "zero-bound-shuffle"
                 data = ConjectureData(
                     draw_bytes=draw_bytes, max_length=self.settings.buffer_size
                 )
@@ -696,6 +891,7 @@ class ConjectureRunner(object):
                 origin = self.target_selector.select()
                 mutations += 1
                 targets_found = len(self.covering_examples)
+                self.test_origin = "mutation"
                 data = ConjectureData(
                     draw_bytes=mutator(origin), max_length=self.settings.buffer_size
                 )
@@ -716,10 +912,31 @@ class ConjectureRunner(object):
                 zero_bound_queue.append(data)
             mutations += 1
 
+    @contextmanager
+    def _log_phase_statistics(self, phase):
+        if self.trace is not None:
+            self.trace_event("phase-start", {"phase": phase})
+        start_time = benchmark_time()
+        call_count = self.call_count
+        try:
+            yield
+        finally:
+            self.phase_statistics[phase] = {
+                "duration-seconds": benchmark_time() - start_time,
+                "test-cases": self.call_count - call_count,
+            }
+            if self.trace is not None:
+                fields = dict(self.phase_statistics[phase])
+                fields["phase"] = phase
+                self.trace_event("phase-end", fields)
+
     def _run(self):
-        self.reuse_existing_examples()
-        self.generate_new_examples()
-        self.shrink_interesting_examples()
+        with self._log_phase_statistics("reuse"):
+            self.reuse_existing_examples()
+        with self._log_phase_statistics("generate"):
+            self.generate_new_examples()
+        with self._log_phase_statistics("shrink"):
+            self.shrink_interesting_examples()
         self.exit_with(ExitReason.finished)
 
     def shrink_interesting_examples(self):
@@ -732,6 +949,7 @@ class ConjectureRunner(object):
         if Phase.shrink not in self.settings.phases or not self.interesting_examples:
             return
 
+        self.test_origin = "replay"
         for prev_data in sorted(
             self.interesting_examples.values(), key=lambda d: sort_key(d.buffer)
         ):
@@ -753,6 +971,15 @@ class ConjectureRunner(object):
                 key=lambda kv: (sort_key(kv[1].buffer), sort_key(repr(kv[0]))),
             )
             self.debug("Shrinking %r" % (target,))
+            if self.trace is not None:
+                self.trace_event(
+                    "shrink-start",
+                    {
+                        "interesting-origin": target,
+                        "buffer-length": len(example.buffer),
+                    },
+                )
+            self.test_origin = "shrink"
 
             def predicate(d):
                 if d.status < Status.INTERESTING:
@@ -775,6 +1002,8 @@ class ConjectureRunner(object):
             corpus = sorted(
                 self.settings.database.fetch(self.secondary_key), key=sort_key
             )
+            self.trace_database("fetch", "secondary", count=len(corpus))
+            self.test_origin = "secondary"
             for c in corpus:
                 primary = {v.buffer for v in self.interesting_examples.values()}
 
@@ -787,6 +1016,7 @@ class ConjectureRunner(object):
                     # We unconditionally remove c from the secondary key as it
                     # is either now primary or worse than our primary example
                     # of this reason for interestingness.
+                    self.trace_database("delete", "secondary", c)
                     self.settings.database.delete(self.secondary_key, c)
 
     def shrink(self, example, predicate):
@@ -0,0 +1,145 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import attr
+
+from hypothesis.internal.compat import benchmark_time
+
+# How many distinct strategies we time separately for each label.  Any more
+# are only counted towards the totals for the label.
+MAX_STRATEGIES_PER_LABEL = 10
+
+# Names longer than this are truncated when reported.
+MAX_NAME_LENGTH = 80
+
+
+@attr.s(slots=True)
+class LabelProfile(object):
+    """The time spent drawing from the strategies with a single label."""
+
+    calls = attr.ib(default=0)
+    inclusive = attr.ib(default=0.0)
+    exclusive = attr.ib(default=0.0)
+    # Pairs of a strategy and its exclusive time, for the first few distinct
+    # strategies drawn from with this label.
+    strategies = attr.ib(default=attr.Factory(list))
+
+    @property
+    def name(self):
+        """The repr of the strategy with this label that took the most
+        time."""
+        strategy, _ = max(self.strategies, key=lambda p: p[1])
+        name = repr(strategy)
+        if len(name) > MAX_NAME_LENGTH:
+            name = name[: MAX_NAME_LENGTH - 3] + "..."
+        if len(self.strategies) > 1:
+            name += " (and %d%s others)" % (
+                len(self.strategies) - 1,
+                "+" if len(self.strategies) == MAX_STRATEGIES_PER_LABEL else "",
+            )
+        return name
+
+
+class DrawProfiler(object):
+    """Attributes the time spent in ``ConjectureData.draw`` to the labels of
+    the strategies being drawn from, driven by the ``start_example`` and
+    ``stop_example`` calls that every draw already makes.
+
+    For each label we count the calls and both the inclusive time (all of
+    the time spent inside a draw) and the exclusive time (the inclusive time
+    minus that spent drawing from other strategies inside it).  Examples
+    which aren't draws from a strategy, like those around each block of
+    bytes, are charged to the strategy they are drawn within.
+
+    Draws may be nested inside other draws with the same label, e.g. for
+    recursive strategies or lazily defined strategies.  Only the outermost of
+    these counts as a call and towards the inclusive time, so that the same
+    time is never counted twice for one label.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+        # Pairs of example index and [label, strategy, start time, time in
+        # children] for each draw in progress.
+        self.stack = []
+        # Maps each label with a draw in progress to the outermost strategy
+        # drawn from with it and the number of such draws.
+        self.active = {}
+        self.next_strategy = None
+
+    def note_strategy(self, label, strategy):
+        """Record that ``strategy`` is about to be drawn from with
+        ``label``."""
+        if label not in self.profiles:
+            self.profiles[label] = LabelProfile()
+        self.next_strategy = strategy
+
+    def start_example(self, index, label):
+        strategy = self.next_strategy
+        if strategy is None:
+            return
+        self.next_strategy = None
+        active = self.active.get(label)
+        if active is None:
+            active = [strategy, 0]
+            self.active[label] = active
+        active[1] += 1
+        self.stack.append((index, [label, active[0], benchmark_time(), 0.0]))
+
+    def stop_example(self, index):
+        if not self.stack or self.stack[-1][0] != index:
+            return
+        _, (label, strategy, start, children) = self.stack.pop()
+        elapsed = benchmark_time() - start
+        exclusive = elapsed - children
+        profile = self.profiles[label]
+        profile.exclusive += exclusive
+        for pair in profile.strategies:
+            if pair[0] is strategy:
+                pair[1] += exclusive
+                break
+        else:
+            if len(profile.strategies) < MAX_STRATEGIES_PER_LABEL:
+                profile.strategies.append([strategy, exclusive])
+        active = self.active[label]
+        active[1] -= 1
+        if not active[1]:
+            del self.active[label]
+            profile.calls += 1
+            profile.inclusive += elapsed
+        if self.stack:
+            self.stack[-1][1][3] += elapsed
+
+    def heaviest(self, n=None):
+        """Return up to ``n`` LabelProfile objects for the labels we have
+        seen drawn, with the most exclusive time first."""
+        result = sorted(
+            (p for p in self.profiles.values() if p.calls), key=lambda p: -p.exclusive
+        )
+        if n is not None:
+            result = result[:n]
+        return result
+
+    def describe(self, n=None):
+        """Return a line describing each of the ``n`` heaviest labels."""
+        return [
+            "%.3fs exclusive, %.3fs inclusive, %d calls: %s"
+            % (p.exclusive, p.inclusive, p.calls, p.name)
+            for p in self.heaviest(n)
+        ]
@@ -22,7 +22,7 @@ from collections import defaultdict
 import attr
 
 from hypothesis.internal.compat import hbytes, hrange, int_from_bytes, int_to_bytes
-from hypothesis.internal.conjecture.data import Overrun, Status
+from hypothesis.internal.conjecture.data import DRAW_BYTES_LABEL, Overrun, Status
 from hypothesis.internal.conjecture.floats import (
     DRAW_FLOAT_LABEL,
     float_to_lex,
@@ -30,6 +30,12 @@ from hypothesis.internal.conjecture.floats import (
 )
 from hypothesis.internal.conjecture.shrinking import Float, Integer, Lexical, Ordering
 from hypothesis.internal.conjecture.shrinking.common import find_integer
+from hypothesis.internal.conjecture.utils import (
+    COLLECTION_SIZE_LABEL,
+    DENSE_ARRAY_LABEL,
+    INTEGER_RANGE_DRAW_LABEL,
+    SPARSE_ARRAY_LABEL,
+)
 
 if False:
     from typing import Dict  # noqa
@@ -384,6 +390,13 @@ class Shrinker(object):
     def debug(self, msg):
         self.__engine.debug(msg)
 
+    def trace_event(self, event, fields):
+        self.__engine.trace_event(event, fields)
+
+    @property
+    def tracing(self):
+        return self.__engine.trace is not None
+
     @property
     def random(self):
         return self.__engine.random
@@ -399,6 +412,10 @@ class Shrinker(object):
         sp = self.shrink_pass(sp)
 
         self.debug("Shrink Pass %s" % (sp.name,))
+        if self.tracing:
+            self.trace_event("shrink-pass-start", {"pass": sp.name})
+        initial_calls = sp.calls
+        initial_shrinks = sp.shrinks
         try:
             sp.runs += 1
 
@@ -408,6 +425,15 @@ class Shrinker(object):
                 sp.run_step(s)
         finally:
             self.debug("Shrink Pass %s completed." % (sp.name,))
+            if self.tracing:
+                self.trace_event(
+                    "shrink-pass-end",
+                    {
+                        "pass": sp.name,
+                        "calls": sp.calls - initial_calls,
+                        "shrinks": sp.shrinks - initial_shrinks,
+                    },
+                )
 
     def shrink(self):
         """Run the full set of shrinks and update shrink_target.
@@ -499,15 +525,23 @@ class Shrinker(object):
         it twice will have exactly the same effect as calling it once.
         """
 
+        # Array passes shrink many of the elements of an array at once. We
+        # run them to a fixed point first because for large arrays the coarse
+        # passes would otherwise spend most of their calls trying to delete
+        # or zero elements one at a time.
+        array = ["shrink_array_elements", "zero_array_columns"]
+        self.fixate_shrink_passes(array)
+
         # "coarse" passes are ones which either make large scale modifications
         # to the test case (alphabet_minimize) or delete data from it (the
         # rest). After these have reached a fixed point the test case should
         # be reasonably small and well normalized.
-        coarse = [
+        coarse = array + [
             "alphabet_minimize",
             "pass_to_descendant",
             "zero_examples",
             "adaptive_example_deletion",
+            "element_deletion_with_length_lowering",
         ]
         self.fixate_shrink_passes(coarse)
 
@@ -755,6 +789,8 @@ class Shrinker(object):
             new = new_target.buffer
             assert sort_key(new) < sort_key(current)
             self.shrinks += 1
+            if self.tracing:
+                self.trace_event("shrink-accepted", {"buffer-length": len(new)})
             if (
                 len(new_target.blocks) != len(self.shrink_target.blocks)
                 or new_target.all_block_bounds() != self.all_block_bounds()
@@ -974,6 +1010,201 @@ class Shrinker(object):
         if to_right > 0:
             find_integer(lambda n: delete_region(j - n, j + to_right))
 
+    @derived_value
+    def length_prefixed_collections(self):
+        """A list of pairs ``(block, elements)``, one for each example whose
+        first child was drawn by ``collection_size``. ``block`` is the block
+        holding the size of the collection and ``elements`` is a list of
+        ``(start, end)`` bounds for each of its elements.
+
+        Usually the elements are the remaining children of the example, but
+        a collection whose only other child is a single call to
+        ``draw_bytes`` (as in ``binary()``) is a byte string, so each byte of
+        that call is an element.
+
+        Collections where the size was drawn without writing a block (which
+        happens when it was already at its minimum) are omitted, as there is
+        nothing to lower."""
+        blocks_by_end = {b.end: b for b in self.blocks}
+        result = []
+        for ex in self.examples:
+            if len(ex.children) < 2 or ex.children[0].label != COLLECTION_SIZE_LABEL:
+                continue
+            size = ex.children[0]
+            if not size.children:
+                continue
+            last = size.children[-1]
+            if last.label != INTEGER_RANGE_DRAW_LABEL or last.length == 0:
+                continue
+            contents = ex.children[1:]
+            if len(contents) == 1 and contents[0].label == DRAW_BYTES_LABEL:
+                bytes_ex = contents[0]
+                elements = [(i, i + 1) for i in hrange(bytes_ex.start, bytes_ex.end)]
+            else:
+                elements = [(c.start, c.end) for c in contents]
+            result.append((blocks_by_end[last.end], elements))
+        return result
+
+    @defines_shrink_pass(
+        lambda self: [
+            (j, i)
+            for j, (_, elements) in enumerate(self.length_prefixed_collections)
+            for i in hrange(len(elements))
+        ]
+    )
+    def element_deletion_with_length_lowering(self, j, i):
+        """Attempt to delete elements from collections which store their
+        size up front (see ``collection_size``).
+
+        Deleting the bytes of one of their elements on its own, as
+        adaptive_example_deletion does, would only cause the following data
+        to be read as the last element, so we also subtract the number of
+        deleted elements from the block holding the size. Starting from the
+        i'th element, we adaptively try to delete as many of the following
+        elements as possible, so that long runs of bytes in a byte string
+        can be removed in a few steps.
+        """
+        block, elements = self.length_prefixed_collections[j]
+        buf = self.buffer
+        u, v = block.bounds
+        size = int_from_bytes(buf[u:v])
+        elements = elements[i:]
+
+        def delete(k):
+            if k > min(size, len(elements)):
+                return False
+            attempt = bytearray(buf)
+            del attempt[elements[0][0] : elements[k - 1][1]]
+            attempt[u:v] = int_to_bytes(size - k, v - u)
+            return self.consider_new_buffer(attempt)
+
+        find_integer(delete)
+
+    @derived_value
+    def arrays(self):
+        """A list of pairs ``(sparse, elements)``, one for each example that a
+        strategy has marked as holding the elements of an array (see
+        ``DENSE_ARRAY_LABEL``), where ``elements`` is a list of ``(start,
+        end)`` bounds for each of them.
+
+        The slices of a multi-dimensional dense array are left out, as the
+        runs of their cells that are worth zeroing are either in a single
+        slice, and so covered by the slices of the whole array, or are parts
+        of columns, which zero_array_columns handles."""
+        result = []
+        slices = set()
+        for ex in self.examples:
+            if ex.index in slices:
+                continue
+            if ex.label == DENSE_ARRAY_LABEL:
+                children = ex.children
+                if all(c.label == DENSE_ARRAY_LABEL for c in children):
+                    slices.update(c.index for c in children)
+            elif ex.label == SPARSE_ARRAY_LABEL:
+                # The last child is where we decided to stop adding elements.
+                children = ex.children[:-1]
+            else:
+                continue
+            if children:
+                result.append(
+                    (
+                        ex.label == SPARSE_ARRAY_LABEL,
+                        [(c.start, c.end) for c in children],
+                    )
+                )
+        return result
+
+    @defines_shrink_pass(
+        lambda self: [
+            (j, i)
+            for j, (_, elements) in enumerate(self.arrays)
+            for i in hrange(len(elements))
+        ]
+    )
+    def shrink_array_elements(self, j, i):
+        """Attempt to replace runs of elements of an array with the simplest
+        possible value: zero for dense arrays, or the fill value for sparse
+        arrays, by deleting the elements which were assigned in its place.
+
+        Starting from the i'th element we adaptively try to replace as many
+        of the following elements as possible, so that e.g. an entire array
+        whose contents don't matter is replaced in a handful of calls, rather
+        than one call per element as zero_examples would need.
+        """
+        sparse, elements = self.arrays[j]
+        buf = self.buffer
+        elements = elements[i:]
+        u, v = elements[0]
+        if not sparse and not any(buf[u:v]):
+            # This element has already been zeroed, and a run starting here
+            # would only repeat the calls made by whichever run did that.
+            return
+
+        def replace(k):
+            if k > len(elements):
+                return False
+            u = elements[0][0]
+            v = elements[k - 1][1]
+            if sparse:
+                attempt = buf[:u] + buf[v:]
+            else:
+                attempt = buf[:u] + hbytes(v - u) + buf[v:]
+            return self.consider_new_buffer(attempt)
+
+        find_integer(replace)
+
+    @derived_value
+    def array_columns(self):
+        """For each dense array with more than one dimension, a list whose
+        j'th element is the list of bounds of the j'th cell in each of its
+        slices along the first axis, i.e. of ``x[:, j]`` if ``x`` were
+        flattened into two dimensions."""
+        result = []
+        for ex in self.examples:
+            if ex.label != DENSE_ARRAY_LABEL or not ex.children:
+                continue
+            if any(c.label != DENSE_ARRAY_LABEL for c in ex.children):
+                continue
+            rows = [c.children for c in ex.children]
+            width = len(rows[0])
+            if width == 0 or any(len(row) != width for row in rows):
+                continue
+            result.append(
+                [[(row[j].start, row[j].end) for row in rows] for j in hrange(width)]
+            )
+        return result
+
+    @defines_shrink_pass(
+        lambda self: [
+            (i, j)
+            for i, columns in enumerate(self.array_columns)
+            for j in hrange(len(columns))
+        ]
+    )
+    def zero_array_columns(self, i, j):
+        """Attempt to zero whole columns of multi-dimensional arrays (see
+        ``array_columns``), such as a slice along their second axis.
+
+        Starting from the j'th column we adaptively try to zero as many of
+        the following columns as possible. Together with
+        shrink_array_elements, which zeroes runs of the slices along the
+        first axis, this gets rid of most of an array when what matters is
+        in a few of its rows and columns.
+        """
+        buf = self.buffer
+        columns = self.array_columns[i][j:]
+
+        def zero(k):
+            if k > len(columns):
+                return False
+            attempt = bytearray(buf)
+            for column in columns[:k]:
+                for u, v in column:
+                    attempt[u:v] = hbytes(v - u)
+            return self.consider_new_buffer(attempt)
+
+        find_integer(zero)
+
     @defines_shrink_pass(lambda self: [(e,) for e in self.examples if not e.trivial])
     def zero_examples(self, ex):
         """Attempt to replace each example with a minimal version of itself."""
@@ -1345,6 +1576,18 @@ class ShrinkPass(object):
             self.calls += self.shrinker.calls - initial_calls
             self.shrinks += self.shrinker.shrinks - initial_shrinks
             self.deletions += size - len(self.shrinker.shrink_target.buffer)
+            # Most steps can tell without calling the test function that they
+            # won't work, and aren't worth tracing.
+            if self.shrinker.tracing and self.shrinker.calls > initial_calls:
+                self.shrinker.trace_event(
+                    "shrink-step",
+                    {
+                        "pass": self.name,
+                        "arguments": list(args),
+                        "calls": self.shrinker.calls - initial_calls,
+                        "shrinks": self.shrinker.shrinks - initial_shrinks,
+                    },
+                )
 
     @property
     def name(self):
@@ -0,0 +1,76 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+from hypothesis.internal.compat import benchmark_time
+from hypothesis.utils.dynamicvariables import DynamicVariable
+
+# The EventTrace that engines created now should write to, if any.
+current_trace = DynamicVariable(None)
+
+
+class EventTrace(object):
+    """Writes a structured record of what the engine does to a file, with
+    one JSON object per line, so that runs can be analysed after the fact
+    without rerunning them at debug verbosity.
+
+    Every object has an ``event`` key saying what happened, a ``run`` key
+    numbering the engine run it came from, and a ``time`` key with the
+    seconds since that run started.  If ``test`` has been set, e.g. by the
+    pytest plugin, that is included too.  The other keys depend on the event.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.test = None
+        self.runs = 0
+
+    def new_run(self):
+        """Return a TraceRun for a new engine run to write its events to."""
+        if self.file is None:
+            # Opened lazily, so that e.g. the pytest-xdist controller process
+            # (which never runs a test) doesn't create an empty file.
+            self.file = open(self.path, "w")
+        self.runs += 1
+        return TraceRun(self, self.runs)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class TraceRun(object):
+    def __init__(self, trace, number):
+        self.trace = trace
+        self.number = number
+        self.start_time = benchmark_time()
+
+    def write(self, event, fields):
+        record = {
+            "event": event,
+            "run": self.number,
+            "time": benchmark_time() - self.start_time,
+        }
+        if self.trace.test is not None:
+            record["test"] = self.trace.test
+        record.update(fields)
+        self.trace.file.write(json.dumps(record, sort_keys=True, default=repr))
+        self.trace.file.write("\n")
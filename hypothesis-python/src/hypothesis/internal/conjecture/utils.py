@@ -20,10 +20,12 @@ from __future__ import absolute_import, division, print_function
 import enum
 import hashlib
 import heapq
+import sys
 from collections import OrderedDict
 from fractions import Fraction
 
 from hypothesis.errors import InvalidArgument
+from hypothesis.internal.cache import LRUReusedCache
 from hypothesis.internal.compat import (
     abc,
     bit_length,
@@ -60,6 +62,17 @@ INTEGER_RANGE_DRAW_LABEL = calc_label_from_name("another draw in integer_range()
 BIASED_COIN_LABEL = calc_label_from_name("biased_coin()")
 SAMPLE_IN_SAMPLER_LABLE = calc_label_from_name("a sample() in Sampler")
 ONE_FROM_MANY_LABEL = calc_label_from_name("one more from many()")
+COLLECTION_SIZE_LABEL = calc_label_from_name("collection_size()")
+
+# Strategies for arrays (e.g. extra.numpy.arrays) draw their elements inside an
+# example with one of these labels, as a hint that the shrinker can try to
+# shrink many of them at once.  Each child of a dense array example is a cell
+# (or, if it has more than one dimension, a nested dense array example for each
+# slice along the first axis), any run of which can be zeroed.  Each child of a
+# sparse array example except the last is a ONE_FROM_MANY_LABEL example which
+# assigns a value to one cell, and can be deleted to leave that cell filled.
+DENSE_ARRAY_LABEL = calc_label_from_name("dense array elements")
+SPARSE_ARRAY_LABEL = calc_label_from_name("sparse array elements")
 
 
 def integer_range(data, lower, upper, center=None):
@@ -97,7 +110,7 @@ def integer_range(data, lower, upper, center=None):
         # For large ranges, we combine the uniform random distribution from draw_bits
         # with the weighting scheme used by WideRangeIntStrategy with moderate chance.
         # Cutoff at 2 ** 24 so unicode choice is uniform but 32bit distribution is not.
-        idx = Sampler([4.0, 8.0, 1.0, 1.0, 0.5]).sample(data)
+        idx = sampler([4.0, 8.0, 1.0, 1.0, 0.5]).sample(data)
         sizes = [8, 16, 32, 64, 128]
         bits = min(bits, sizes[idx])
 
@@ -115,14 +128,15 @@ def integer_range(data, lower, upper, center=None):
     return int(result)
 
 
-try:
-    from numpy import ndarray
-except ImportError:  # pragma: no cover
-    ndarray = ()
+def is_ndarray(values):
+    # If numpy hasn't been imported, values can't be an array, and we don't
+    # want to import it ourselves because that is slow.
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(values, numpy.ndarray)
 
 
 def check_sample(values, strategy_name):
-    if isinstance(values, ndarray):
+    if is_ndarray(values):
         if values.ndim != 1:
             raise InvalidArgument(
                 (
@@ -148,6 +162,17 @@ def check_sample(values, strategy_name):
                 values=repr(values), strategy=strategy_name
             )
         )
+    if is_ndarray(values):
+        # A read-only copy of the array is much cheaper to make than a tuple
+        # of its elements, and indexing either gives the same values.
+        values = values.copy()
+        values.flags.writeable = False
+        return values
+    if isinstance(values, abc.Sequence) and not isinstance(values, abc.MutableSequence):
+        # Immutable sequences (including ranges) can't change underneath us,
+        # so we sample from them by index instead of copying them, which
+        # means that e.g. sampled_from(range(10 ** 9)) is cheap.
+        return values
     return tuple(values)
 
 
@@ -352,6 +377,27 @@ class Sampler(object):
             return base
 
 
+SAMPLER_CACHE = LRUReusedCache(256)
+
+
+def sampler(weights):
+    """Return a ``Sampler`` for ``weights``, reusing a previously built one
+    for equal weights if possible, as building the alias table takes time
+    linear in the number of weights and hot paths such as ``integer_range``
+    and ``floats()`` keep asking for the same few tables."""
+    # Equal weights of different numeric types produce different tables
+    # (e.g. exact Fractions rather than floats), so the type is part of the
+    # key.
+    key = tuple((type(w), w) for w in weights)
+    try:
+        return SAMPLER_CACHE[key]
+    except KeyError:
+        pass
+    result = Sampler(weights)
+    SAMPLER_CACHE[key] = result
+    return result
+
+
 class many(object):
     """Utility class for collections. Bundles up the logic we use for "should I
     keep drawing more values?" and handles starting and stopping examples in
@@ -418,3 +464,41 @@ class many(object):
                 self.data.mark_invalid()
             else:
                 self.force_stop = True
+
+
+def collection_size(data, min_size, max_size, average_size):
+    """Draw the size of a collection up front, for strategies that then draw
+    all of their elements in one go rather than deciding whether to continue
+    element by element as ``many`` does.
+
+    The result is ``min_size + k``, where ``k`` is the integer value of the
+    last block drawn inside a ``COLLECTION_SIZE_LABEL`` example. Because it
+    is stored verbatim, the shrinker can remove ``j`` elements from the
+    collection by deleting them and subtracting ``j`` from that block - see
+    ``Shrinker.element_deletion_with_length_lowering``.
+
+    ``k`` is drawn uniformly from ``[0, 2 ** bits)``, where ``bits`` is the
+    number of successes in a run of biased coins. A bias of ``p`` gives an
+    expected value of ``p / (2 * (1 - 2 * p))`` for ``k``, and we pick ``p``
+    so that this is ``average_size - min_size``.
+    """
+    assert 0 <= min_size <= average_size <= max_size
+    if min_size == max_size:
+        return min_size
+    span = max_size - min_size
+    extra = average_size - min_size
+    p_continue = 2 * extra / (1 + 4 * extra)
+    max_bits = 64 if span == float("inf") else bit_length(span)
+
+    data.start_example(COLLECTION_SIZE_LABEL)
+    bits = 0
+    while bits < max_bits and biased_coin(data, p_continue):
+        bits += 1
+    while True:
+        data.start_example(INTEGER_RANGE_DRAW_LABEL)
+        k = data.draw_bits(bits)
+        data.stop_example(discard=k > span)
+        if k <= span:
+            break
+    data.stop_example()
+    return min_size + k
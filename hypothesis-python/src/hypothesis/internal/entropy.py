@@ -19,26 +19,39 @@ from __future__ import absolute_import, division, print_function
 
 import contextlib
 import random
+import sys
 
 from hypothesis.errors import InvalidArgument
 from hypothesis.internal.compat import integer_types
 
 RANDOMS_TO_MANAGE = [random]  # type: list
 
-try:
-    import numpy.random as npr
-except ImportError:
-    pass
-else:
 
-    class NumpyRandomWrapper(object):
-        """A shim to remove those darn underscores."""
+class NumpyRandomWrapper(object):
+    """A shim to remove those darn underscores."""
 
-        seed = npr.seed
-        getstate = npr.get_state
-        setstate = npr.set_state
+    def __init__(self, npr):
+        self.seed = npr.seed
+        self.getstate = npr.get_state
+        self.setstate = npr.set_state
 
-    RANDOMS_TO_MANAGE.append(NumpyRandomWrapper)
+
+numpy_random_wrapper = None
+
+
+def manage_numpy_random():
+    """Start managing the global PRNG of ``numpy.random``, if it has been
+    imported.
+
+    Importing numpy is slow, so we don't do it ourselves, and nothing can
+    have used its PRNG before it was imported.
+    """
+    global numpy_random_wrapper
+    if numpy_random_wrapper is None:
+        npr = sys.modules.get("numpy.random")
+        if npr is not None:
+            numpy_random_wrapper = NumpyRandomWrapper(npr)
+            RANDOMS_TO_MANAGE.insert(1, numpy_random_wrapper)
 
 
 def register_random(r):
@@ -72,6 +85,7 @@ def get_seeder_and_restorer(seed=0):
     using the global random state.  See e.g. #1709.
     """
     assert isinstance(seed, integer_types) and 0 <= seed < 2 ** 32
+    manage_numpy_random()
     states = []  # type: list
 
     def seed_all():
@@ -89,6 +103,31 @@ def get_seeder_and_restorer(seed=0):
     return seed_all, restore_all
 
 
+@contextlib.contextmanager
+def reseedable_PRNG(seed=0):
+    """Context manager which saves the state of all registered PRNGs, and
+    restores it on exit, yielding a function which seeds all of them.
+
+    Calling that function at the start of each of many examples is as
+    deterministic as running each of them under ``deterministic_PRNG``, but
+    only saves and restores the state of the PRNGs once.
+    """
+    manage_numpy_random()
+    # Copied, in case a Random is registered while we're running.
+    randoms = list(RANDOMS_TO_MANAGE)
+    states = [r.getstate() for r in randoms]
+
+    def reseed_all():
+        for r in randoms:
+            r.seed(seed)
+
+    try:
+        yield reseed_all
+    finally:
+        for r, state in zip(randoms, states):
+            r.setstate(state)
+
+
 @contextlib.contextmanager
 def deterministic_PRNG():
     """Context manager that handles random.seed without polluting global state.
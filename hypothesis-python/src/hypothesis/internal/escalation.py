@@ -77,6 +77,10 @@ def escalate_hypothesis_internal_error():
     error_type, e, tb = sys.exc_info()
     if getattr(e, "hypothesis_internal_always_escalate", False):
         raise
+    if getattr(e, "hypothesis_internal_forked_failure", None) is not None:
+        # The error was raised in a forked copy of this process, and we have
+        # already checked that it didn't come from inside Hypothesis.
+        return
     filepath = traceback.extract_tb(tb)[-1][0]
     if is_hypothesis_file(filepath) and not isinstance(
         e, (HypothesisException,) + HYPOTHESIS_CONTROL_EXCEPTIONS
@@ -0,0 +1,375 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Tools for understanding predicates passed to ``SearchStrategy.filter``.
+
+Filtering by rejection sampling is wasteful when the predicate just bounds
+the value, e.g. ``integers().filter(lambda x: x > 0)`` or
+``text().filter(len)``, because we could instead have generated values
+within those bounds in the first place.  This module recognises a few
+common forms of predicate and works out which arguments to the underlying
+strategy function would make it generate (a superset of) only the values
+which satisfy them.
+
+The result is only ever used to choose a better strategy to filter, so the
+predicate is always still checked and it is fine for our understanding of
+it to be incomplete - e.g. ``lambda x: x > 0 and x % 2 == 0`` is rewritten
+to filter ``integers(min_value=1)``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import ast
+import math
+import sys
+
+import attr
+
+from hypothesis.internal.compat import ceil, floor, getfullargspec, integer_types
+from hypothesis.internal.floats import float_of
+from hypothesis.internal.reflection import args_for_lambda_ast, extract_lambda_source
+
+try:
+    import builtins
+except ImportError:  # pragma: no cover
+    import __builtin__ as builtins  # type: ignore
+
+
+@attr.s(slots=True)
+class Constraints(object):
+    """The facts about ``x`` which we can deduce from ``predicate(x)``."""
+
+    min_value = attr.ib(default=None)
+    exclude_min = attr.ib(default=False)
+    max_value = attr.ib(default=None)
+    exclude_max = attr.ib(default=False)
+
+    min_size = attr.ib(default=0)
+    max_size = attr.ib(default=None)
+
+    finite = attr.ib(default=False)
+    truthy = attr.ib(default=False)
+
+    def add_lower_bound(self, value, exclude):
+        if self.min_value is None or value > self.min_value:
+            self.min_value = value
+            self.exclude_min = exclude
+        elif value == self.min_value:
+            self.exclude_min = self.exclude_min or exclude
+
+    def add_upper_bound(self, value, exclude):
+        if self.max_value is None or value < self.max_value:
+            self.max_value = value
+            self.exclude_max = exclude
+        elif value == self.max_value:
+            self.exclude_max = self.exclude_max or exclude
+
+    def add_size_bounds(self, min_size, max_size):
+        self.min_size = max(self.min_size, min_size)
+        if max_size is not None:
+            if self.max_size is None:
+                self.max_size = max_size
+            else:
+                self.max_size = min(self.max_size, max_size)
+
+    @property
+    def is_trivial(self):
+        return self == Constraints()
+
+
+def _resolve(node, function):
+    """Return the object which the dotted name ``node`` refers to inside the
+    body of ``function``, or None if it is not a global (or builtin)."""
+    if isinstance(node, ast.Attribute):
+        base = _resolve(node.value, function)
+        return getattr(base, node.attr, None)
+    if isinstance(node, ast.Name):
+        if node.id in function.__code__.co_freevars:
+            return None
+        try:
+            return function.__globals__[node.id]
+        except KeyError:
+            return getattr(builtins, node.id, None)
+    return None
+
+
+def _constant(node):
+    """Return the value of a numeric literal, or None."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _constant(node.operand)
+        if value is None or isinstance(node.op, ast.UAdd):
+            return value
+        return -value
+    if type(node).__name__ not in ("Num", "Constant"):
+        return None
+    value = getattr(node, "n", None)
+    if value is None:
+        value = getattr(node, "value", None)
+    if isinstance(value, bool) or not isinstance(value, integer_types + (float,)):
+        return None
+    if value != value or math.isinf(value):
+        return None
+    return value
+
+
+# Maps each comparison operator to a pair of (lower, upper) bound kinds that
+# ``x op c`` places on ``x``, where each kind is None (no bound), False (an
+# inclusive bound) or True (an exclusive bound).
+COMPARISONS = {
+    ast.Lt: (None, True),
+    ast.LtE: (None, False),
+    ast.Gt: (True, None),
+    ast.GtE: (False, None),
+    ast.Eq: (False, False),
+}
+
+# ``c op x`` is ``x flipped_op c``, and ``==`` is symmetric.
+FLIPPED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE}
+
+
+def _isfinite_functions():
+    result = []
+    isfinite = getattr(math, "isfinite", None)
+    if isfinite is not None:  # pragma: no branch
+        result.append(isfinite)
+    # If numpy hasn't been imported, the predicate can't be numpy.isfinite.
+    numpy = sys.modules.get("numpy")
+    if numpy is not None:
+        result.append(numpy.isfinite)
+    return result
+
+
+class _Analyser(object):
+    def __init__(self, function, argument):
+        self.function = function
+        self.argument = argument
+        self.constraints = Constraints()
+
+    def is_argument(self, node):
+        return isinstance(node, ast.Name) and node.id == self.argument
+
+    def is_call_on_argument(self, node, target):
+        return (
+            isinstance(node, ast.Call)
+            and len(node.args) == 1
+            and not node.keywords
+            and self.is_argument(node.args[0])
+            and any(_resolve(node.func, self.function) is t for t in target)
+        )
+
+    def visit(self, node):
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            for value in node.values:
+                self.visit(value)
+        elif self.is_argument(node) or self.is_call_on_argument(node, [bool]):
+            self.constraints.truthy = True
+        elif self.is_call_on_argument(node, [len]):
+            self.constraints.add_size_bounds(1, None)
+        elif self.is_call_on_argument(node, _isfinite_functions()):
+            self.constraints.finite = True
+        elif isinstance(node, ast.Compare):
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                self.visit_comparison(left, type(op), right)
+                left = right
+
+    def visit_comparison(self, left, op, right):
+        if op not in COMPARISONS:
+            return
+        if _constant(left) is not None:
+            left, op, right = right, FLIPPED.get(op, op), left
+        value = _constant(right)
+        if value is None:
+            return
+        lower, upper = COMPARISONS[op]
+        if self.is_argument(left):
+            if lower is not None:
+                self.constraints.add_lower_bound(value, lower)
+            if upper is not None:
+                self.constraints.add_upper_bound(value, upper)
+        elif self.is_call_on_argument(left, [len]):
+            min_size, max_size = 0, None
+            if lower is not None:
+                min_size = floor(value) + 1 if lower else ceil(value)
+            if upper is not None:
+                max_size = ceil(value) - 1 if upper else floor(value)
+            self.constraints.add_size_bounds(min_size, max_size)
+
+
+def predicate_constraints(predicate):
+    """Return the Constraints which ``predicate(x)`` being true places on
+    ``x``.  If we don't understand the predicate the result is trivial."""
+    if predicate is bool:
+        return Constraints(truthy=True)
+    if predicate is len:
+        return Constraints(min_size=1)
+    if any(predicate is f for f in _isfinite_functions()):
+        return Constraints(finite=True)
+    if getattr(predicate, "__name__", None) != "<lambda>":
+        return Constraints()
+    try:
+        tree = ast.parse(extract_lambda_source(predicate))
+        lambda_ast = tree.body[0].value
+    except (SyntaxError, IndexError, AttributeError):
+        return Constraints()
+    if not isinstance(lambda_ast, ast.Lambda):  # pragma: no cover
+        return Constraints()
+    args = args_for_lambda_ast(lambda_ast)
+    if len(args) != 1 or lambda_ast.args.vararg or lambda_ast.args.kwarg:
+        return Constraints()
+    analyser = _Analyser(predicate, args[0])
+    analyser.visit(lambda_ast.body)
+    return analyser.constraints
+
+
+def _tighten_integers(kwargs, constraints):
+    min_value = kwargs.get("min_value")
+    max_value = kwargs.get("max_value")
+    if constraints.min_value is not None:
+        if constraints.exclude_min:
+            lower = floor(constraints.min_value) + 1
+        else:
+            lower = ceil(constraints.min_value)
+        if min_value is None or lower > min_value:
+            min_value = lower
+    if constraints.max_value is not None:
+        if constraints.exclude_max:
+            upper = ceil(constraints.max_value) - 1
+        else:
+            upper = floor(constraints.max_value)
+        if max_value is None or upper < max_value:
+            max_value = upper
+    if constraints.truthy:
+        # Zero is the only falsey integer, so we can exclude it if it is
+        # at either end of the range.
+        if min_value == 0:
+            min_value = 1
+        elif max_value == 0:
+            max_value = -1
+    kwargs["min_value"] = min_value
+    kwargs["max_value"] = max_value
+
+
+def _tighten_float_bound(kwargs, name, exclude_name, bound, exclude, is_lower):
+    width = kwargs.get("width", 64)
+    # Only bounds which are exactly representable are used, because any
+    # other bound would be rounded (with a deprecation warning).
+    try:
+        if float_of(bound, width) != bound:
+            return
+    except OverflowError:
+        return
+    if bound == 0 and not exclude:
+        # floats() distinguishes between 0.0 and -0.0 as bounds, but
+        # comparisons don't, so pick the zero that allows both.
+        bound = -0.0 if is_lower else 0.0
+    old_bound = kwargs.get(name)
+    if old_bound is not None:
+        if (bound < old_bound) if is_lower else (bound > old_bound):
+            return
+        if bound == old_bound and (kwargs.get(exclude_name) or not exclude):
+            # The new bound only tightens the old one if it excludes a value
+            # which the old one allowed.
+            return
+    kwargs[name] = bound
+    kwargs[exclude_name] = exclude
+    # NaN fails every comparison, so bounding the value excludes it.
+    kwargs["allow_nan"] = False
+
+
+def _tighten_floats(kwargs, constraints):
+    if constraints.finite:
+        kwargs["allow_nan"] = False
+        kwargs["allow_infinity"] = False
+    if constraints.min_value is not None:
+        _tighten_float_bound(
+            kwargs,
+            "min_value",
+            "exclude_min",
+            constraints.min_value,
+            constraints.exclude_min,
+            is_lower=True,
+        )
+    if constraints.max_value is not None:
+        _tighten_float_bound(
+            kwargs,
+            "max_value",
+            "exclude_max",
+            constraints.max_value,
+            constraints.exclude_max,
+            is_lower=False,
+        )
+    if (
+        kwargs.get("min_value") is not None
+        and kwargs.get("max_value") is not None
+        and kwargs.get("allow_infinity")
+    ):
+        # Bounding the values on both sides excludes infinities.
+        kwargs["allow_infinity"] = None
+
+
+def _tighten_sizes(kwargs, constraints):
+    min_size = kwargs.get("min_size") or 0
+    max_size = kwargs.get("max_size")
+    min_size = max(min_size, constraints.min_size)
+    if constraints.truthy:
+        # Empty collections are the only falsey ones.
+        min_size = max(min_size, 1)
+    if constraints.max_size is not None:
+        if max_size is None or constraints.max_size < max_size:
+            max_size = constraints.max_size
+    kwargs["min_size"] = min_size
+    kwargs["max_size"] = max_size
+
+
+TIGHTENERS = {
+    "integers": _tighten_integers,
+    "floats": _tighten_floats,
+    "binary": _tighten_sizes,
+    "dictionaries": _tighten_sizes,
+    "frozensets": _tighten_sizes,
+    "lists": _tighten_sizes,
+    "sets": _tighten_sizes,
+    "text": _tighten_sizes,
+}
+
+
+def tightened_arguments(function, kwargs, predicate):
+    """Given a strategy function from ``hypothesis.strategies`` and the keyword
+    arguments it was called with, return new keyword arguments for which it
+    would only generate values that the original arguments could generate,
+    but skipping as many as possible of those which fail ``predicate``.
+
+    Returns None if we don't know how to do that, or if it would not change
+    the arguments."""
+    if getattr(function, "__module__", None) != "hypothesis._strategies":
+        return None
+    try:
+        tighten = TIGHTENERS[function.__name__]
+    except KeyError:
+        return None
+    constraints = predicate_constraints(predicate)
+    if constraints.is_trivial:
+        return None
+    argspec = getfullargspec(function)
+    arguments = dict(zip(reversed(argspec.args), reversed(argspec.defaults or ())))
+    arguments.update(kwargs)
+    result = dict(arguments)
+    tighten(result, constraints)
+    if result == arguments:
+        return None
+    return result
@@ -26,10 +26,15 @@ from hypothesis.internal.compat import (
     struct_unpack,
 )
 
-try:
-    import numpy
-except ImportError:
+if CAN_PACK_HALF_FLOAT:
+    # We only need numpy for half-precision floats on old Pythons, and it is
+    # slow to import.
     numpy = None
+else:  # pragma: no cover
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
 
 
 # Format codes for (int, float) sized types, used for byte-wise casts.
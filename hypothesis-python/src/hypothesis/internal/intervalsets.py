@@ -17,6 +17,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+from bisect import bisect_right
+
 
 class IntervalSet(object):
     def __init__(self, intervals):
@@ -40,19 +42,7 @@ class IntervalSet(object):
         if i < 0 or i >= self.size:
             raise IndexError("Invalid index %d for [0, %d)" % (i, self.size))
         # Want j = maximal such that offsets[j] <= i
-
-        j = len(self.intervals) - 1
-        if self.offsets[j] > i:
-            hi = j
-            lo = 0
-            # Invariant: offsets[lo] <= i < offsets[hi]
-            while lo + 1 < hi:
-                mid = (lo + hi) // 2
-                if self.offsets[mid] <= i:
-                    lo = mid
-                else:
-                    hi = mid
-            j = lo
+        j = bisect_right(self.offsets, i) - 1
         t = i - self.offsets[j]
         u, v = self.intervals[j]
         r = u + t
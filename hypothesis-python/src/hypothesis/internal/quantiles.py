@@ -0,0 +1,205 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import math
+
+from hypothesis.internal.compat import ceil
+
+# Runs with up to this many values keep all of them, and so have exact
+# quantiles.  Beyond this we switch to a histogram.
+EXACT_LIMIT = 10000
+
+# The relative error of any quantile once we have switched to a histogram.
+RELATIVE_ACCURACY = 0.01
+
+# The most buckets a histogram may have, after which the lowest buckets are
+# merged together.  Timings span a few orders of magnitude at most, so with
+# the accuracy above this is never reached in practice.
+MAX_BUCKETS = 2048
+
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+
+class RunningTotal(object):
+    """The sum of a stream of numbers, which is as precise as calling
+    ``math.fsum`` on all of them but doesn't keep them.
+
+    Like ``math.fsum``, we keep the sum as a list of non-overlapping partial
+    sums (Shewchuk, 1997), so there are never more than a few of them.
+    """
+
+    def __init__(self):
+        self.partials = []
+
+    def add(self, value):
+        i = 0
+        for partial in self.partials:
+            if abs(value) < abs(partial):
+                value, partial = partial, value
+            high = value + partial
+            low = partial - (high - value)
+            if low:
+                self.partials[i] = low
+                i += 1
+            value = high
+        self.partials[i:] = [value]
+
+    def extend(self, values):
+        for v in values:
+            self.add(v)
+
+    @property
+    def total(self):
+        return math.fsum(self.partials)
+
+
+class QuantileSketch(object):
+    """Tracks the distribution of a stream of numbers in bounded memory, so
+    that we can report quantiles of e.g. the runtime of every test case in a
+    very long run without keeping all of them.
+
+    Until more than ``EXACT_LIMIT`` values have been added we store them
+    all.  After that we keep a histogram of their logarithms, as in
+    DDSketch (Masson et al., 2019): each positive value ``x`` is counted in
+    bucket ``ceil(log(x, GAMMA))``, so any quantile is within
+    ``RELATIVE_ACCURACY`` of a value of the right rank.  Zero and negative
+    values (which only come from clock changes) share a bucket of their own.
+    The count, total, minimum and maximum are always exact.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.values = []
+        self.__sorted = True
+        self.buckets = None
+        self.nonpositive = 0
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return "QuantileSketch(count=%d, min=%r, max=%r)" % (
+            self.count,
+            self.min,
+            self.max,
+        )
+
+    @property
+    def is_exact(self):
+        return self.buckets is None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.buckets is None:
+            self.values.append(value)
+            self.__sorted = False
+            if len(self.values) > EXACT_LIMIT:
+                self.__switch_to_buckets()
+        else:
+            self.__add_to_bucket(value)
+
+    def extend(self, values):
+        for v in values:
+            self.add(v)
+
+    @classmethod
+    def merge(cls, sketches):
+        """Return a new sketch of all the values added to any of
+        ``sketches``."""
+        result = cls()
+        for sketch in sketches:
+            if sketch.count == 0:
+                continue
+            if sketch.buckets is None:
+                result.extend(sketch.values)
+                continue
+            if result.buckets is None:
+                result.__switch_to_buckets()
+            result.count += sketch.count
+            result.total += sketch.total
+            result.min = (
+                sketch.min if result.min is None else min(result.min, sketch.min)
+            )
+            result.max = (
+                sketch.max if result.max is None else max(result.max, sketch.max)
+            )
+            result.nonpositive += sketch.nonpositive
+            for i, n in sketch.buckets.items():
+                result.buckets[i] = result.buckets.get(i, 0) + n
+            result.__collapse()
+        return result
+
+    def quantile(self, q):
+        """Return the ``q``'th quantile of the values added so far, for
+        ``0 <= q <= 1``, using the nearest-rank method.  ``q == 0`` and
+        ``q == 1`` always give the exact minimum and maximum."""
+        assert 0 <= q <= 1
+        if self.count == 0:
+            return None
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        rank = max(0, int(ceil(q * self.count)) - 1)
+        if self.buckets is None:
+            if not self.__sorted:
+                self.values.sort()
+                self.__sorted = True
+            return self.values[rank]
+        if rank < self.nonpositive:
+            return min(0.0, self.max)
+        seen = self.nonpositive
+        for i in sorted(self.buckets):  # pragma: no branch
+            seen += self.buckets[i]
+            if seen > rank:
+                break
+        # The point of the bucket with the same relative error to either end.
+        result = 2 * GAMMA ** i / (GAMMA + 1)
+        return min(max(result, self.min), self.max)
+
+    def __add_to_bucket(self, value):
+        if value <= 0:
+            self.nonpositive += 1
+            return
+        i = int(ceil(math.log(value) / LOG_GAMMA))
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        if len(self.buckets) > MAX_BUCKETS:
+            self.__collapse()
+
+    def __switch_to_buckets(self):
+        self.buckets = {}
+        values = self.values
+        self.values = []
+        self.__sorted = True
+        for v in values:
+            self.__add_to_bucket(v)
+
+    def __collapse(self):
+        while len(self.buckets) > MAX_BUCKETS:
+            lowest, second = sorted(self.buckets)[:2]
+            self.buckets[second] += self.buckets.pop(lowest)
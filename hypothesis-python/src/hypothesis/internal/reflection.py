@@ -28,6 +28,7 @@ import re
 import tokenize
 import types
 import uuid
+import weakref
 from functools import wraps
 from types import ModuleType
 
@@ -69,6 +70,14 @@ def is_mock(obj):
     return True
 
 
+# Maps functions to an md5 hasher which has been fed their source.  Every run
+# of a test needs its digest, and inspect.getsource is much slower than the
+# rest of function_digest put together.  This isn't keyed by code object,
+# because functions which share one (e.g. the wrappers made by a decorator)
+# can have different source once getsource follows their __wrapped__.
+_source_hashers = weakref.WeakKeyDictionary()
+
+
 def function_digest(function):
     """Returns a string that is stable across multiple invocations across
     multiple processes and is prone to changing significantly in response to
@@ -76,12 +85,20 @@ def function_digest(function):
 
     No guarantee of uniqueness though it usually will be.
     """
-    hasher = hashlib.md5()
     try:
-        hasher.update(to_unicode(inspect.getsource(function)).encode("utf-8"))
-    # Different errors on different versions of python. What fun.
-    except (OSError, IOError, TypeError):
-        pass
+        hasher = _source_hashers[function].copy()
+    except (KeyError, TypeError):
+        hasher = hashlib.md5()
+        try:
+            hasher.update(to_unicode(inspect.getsource(function)).encode("utf-8"))
+        # Different errors on different versions of python. What fun.
+        except (OSError, IOError, TypeError):
+            pass
+        try:
+            _source_hashers[function] = hasher.copy()
+        except TypeError:
+            # Not every callable can be weakly referenced.
+            pass
     try:
         hasher.update(str_to_bytes(function.__name__))
     except AttributeError:
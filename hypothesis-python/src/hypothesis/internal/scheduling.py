@@ -0,0 +1,172 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import re
+
+from hypothesis.errors import InvalidArgument
+from hypothesis.internal.conjecture.engine import MIN_EXAMPLES_IN_TIME_BUDGET
+from hypothesis.utils.dynamicvariables import DynamicVariable
+
+# The SessionBudget that tests run now should take their share of, if any.
+session_budget = DynamicVariable(None)
+
+# If the test being run now is one of several shards which split its examples
+# between them, a pair of the index of this shard and the number of shards.
+current_shard = DynamicVariable(None)
+
+# How much more of the budget a test that has found a bug every time it was
+# run gets than one which never has.
+BUG_YIELD_WEIGHT = 1.0
+
+# How much weight the latest run gets in the running average of the cost
+# of each example.
+COST_SMOOTHING = 0.5
+
+DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 60 * 60}
+
+
+def parse_duration(text):
+    """Parse a duration like ``"90"``, ``"90s"``, ``"10m"`` or ``"1.5h"``
+    into a number of seconds."""
+    match = re.match(r"^\s*([0-9]*\.?[0-9]+)\s*([smh]?)\s*$", text)
+    if match is None:
+        raise InvalidArgument(
+            "Could not parse %r as a duration, e.g. 90s, 10m or 1h" % (text,)
+        )
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+class RunHistory(object):
+    """What we remember about previous runs of a test, kept in the example
+    database so that it persists between sessions."""
+
+    def __init__(self, seconds_per_example=None, runs=0, failures=0):
+        self.seconds_per_example = seconds_per_example
+        self.runs = runs
+        self.failures = failures
+
+    @property
+    def bug_yield(self):
+        """The fraction of runs of this test which found a bug."""
+        if not self.runs:
+            return 0.0
+        return self.failures / self.runs
+
+    def to_bytes(self):
+        return json.dumps(
+            {
+                "seconds-per-example": self.seconds_per_example,
+                "runs": self.runs,
+                "failures": self.failures,
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, value):
+        try:
+            record = json.loads(value.decode("utf-8"))
+            return cls(
+                seconds_per_example=record["seconds-per-example"],
+                runs=record["runs"],
+                failures=record["failures"],
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+
+class SessionBudget(object):
+    """Splits a total number of seconds of data generation between the tests
+    in a session.
+
+    Each test is offered its share of what is left of the budget, divided
+    between it and the tests which haven't run yet, with tests that have
+    often found bugs before getting more.  That share is turned into a
+    ``max_examples`` (never more than the test's own settings allow) using
+    how long each example took the last few times it ran, and is also
+    enforced as a time limit on generating examples, so that a test we know
+    nothing about can't take far more than its share.  Tests which finish
+    early leave more for the rest.
+    """
+
+    def __init__(self, total_seconds, test_count):
+        self.total_seconds = total_seconds
+        self.test_count = test_count
+        self.tests_started = 0
+        self.seconds_spent = 0.0
+
+    @property
+    def seconds_left(self):
+        return max(0.0, self.total_seconds - self.seconds_spent)
+
+    def history_key(self, database_key):
+        return database_key + b".session-budget"
+
+    def load_history(self, database, database_key):
+        if database is None or database_key is None:
+            return RunHistory()
+        for value in database.fetch(self.history_key(database_key)):
+            history = RunHistory.from_bytes(value)
+            if history is not None:
+                return history
+        return RunHistory()
+
+    def allocate(self, settings, database_key):
+        """Start a test, returning the ``max_examples`` it should run and
+        the number of seconds it may spend generating them."""
+        tests_left = max(1, self.test_count - self.tests_started)
+        self.tests_started += 1
+        history = self.load_history(settings.database, database_key)
+        weight = 1.0 + BUG_YIELD_WEIGHT * history.bug_yield
+        seconds = self.seconds_left * weight / (weight + tests_left - 1)
+        max_examples = settings.max_examples
+        if history.seconds_per_example:
+            max_examples = min(
+                max_examples,
+                max(
+                    MIN_EXAMPLES_IN_TIME_BUDGET,
+                    int(seconds / history.seconds_per_example),
+                ),
+            )
+        return max_examples, seconds
+
+    def record(self, settings, database_key, seconds, generation, found_bug):
+        """Note that a test has finished, having taken ``seconds`` in total,
+        and ``generation = (examples, seconds)`` to generate new examples."""
+        self.seconds_spent += seconds
+        database = settings.database
+        if database is None or database_key is None:
+            return
+        history = self.load_history(database, database_key)
+        examples, generation_seconds = generation
+        if examples:
+            cost = generation_seconds / examples
+            if history.seconds_per_example is None:
+                history.seconds_per_example = cost
+            else:
+                history.seconds_per_example += COST_SMOOTHING * (
+                    cost - history.seconds_per_example
+                )
+        history.runs += 1
+        history.failures += bool(found_bug)
+        key = self.history_key(database_key)
+        for value in list(database.fetch(key)):
+            database.delete(key, value)
+        database.save(key, history.to_bytes())
@@ -0,0 +1,418 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Resuming tests from forked snapshots of earlier runs.
+
+When shrinking a stateful test most of the test cases we run share a long
+prefix with one we have already run, and so re-execute exactly the same
+steps before getting to the part that differs.  If those steps are expensive
+this is a lot of wasted work.
+
+On platforms with ``fork`` we can avoid this.  At each checkpoint (e.g. the
+boundary between two steps) the test forks a snapshot process, which waits
+on a socket with the test frozen at that point.  When we later run a buffer
+starting with the same bytes, we ask the snapshot with the longest such
+prefix to fork a worker, which continues from the checkpoint reading the
+rest of the new buffer.  Once the test finishes, the worker sends the state
+of its ConjectureData back to us and we carry on as if we had run the test
+ourselves.
+
+Because the test was run with a prefix of the same buffer, everything it
+did before the checkpoint is exactly what it would have done had we run the
+new buffer from scratch - provided the test is deterministic, which we
+require anyway.  If anything goes wrong in the worker we just run the test
+in this process instead.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import gc
+import os
+import pickle
+import select
+import shutil
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import traceback
+from collections import OrderedDict
+
+import attr
+
+from hypothesis.errors import HypothesisException, StopTest, UnsatisfiedAssumption
+from hypothesis.internal.compat import benchmark_time, hbytes
+from hypothesis.internal.escalation import (
+    HYPOTHESIS_CONTROL_EXCEPTIONS,
+    get_trimmed_traceback,
+    is_hypothesis_file,
+)
+
+# The maximum number of snapshot processes we keep alive for a single test.
+# Each of them shares most of its memory with the process it was forked
+# from, so they are fairly cheap, but it's rude to leave thousands around.
+MAX_SNAPSHOTS = 64
+
+# Forking isn't free, so we only make a new snapshot once the test has done
+# at least this many times as much work since the last one as it took us to
+# make one.  Otherwise tests with cheap steps would spend most of their time
+# forking snapshots that save less time than they cost.
+MIN_WORK_RATIO = 4
+
+# The parts of a ConjectureData that running a test can change.
+DATA_FIELDS = (
+    "overdraw",
+    "block_starts",
+    "blocks",
+    "buffer",
+    "index",
+    "output",
+    "status",
+    "events",
+    "forced_indices",
+    "masked_indices",
+    "interesting_origin",
+    "draw_times",
+    "max_depth",
+    "examples",
+    "example_stack",
+    "has_discards",
+)
+
+
+def snapshots_supported():
+    return hasattr(os, "fork") and hasattr(socket, "AF_UNIX")
+
+
+def send_message(connection, message):
+    payload = pickle.dumps(message, protocol=2)
+    connection.sendall(struct.pack("!Q", len(payload)) + payload)
+
+
+def _receive_exactly(connection, n):
+    parts = []
+    while n > 0:
+        part = connection.recv(min(n, 1 << 16))
+        if not part:
+            raise EOFError()
+        parts.append(part)
+        n -= len(part)
+    return b"".join(parts)
+
+
+def receive_message(connection):
+    (n,) = struct.unpack("!Q", _receive_exactly(connection, 8))
+    return pickle.loads(_receive_exactly(connection, n))
+
+
+def _flush_output():
+    # Anything still buffered would be written once by each process which
+    # inherits the buffer.
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:  # pragma: no cover
+            pass
+
+
+@attr.s(slots=True)
+class Snapshot(object):
+    path = attr.ib()
+    pid = attr.ib()
+    # Whether the snapshot is a child of the owner, which has to reap it.
+    is_child = attr.ib()
+    # How long the test had been running for when we took the snapshot,
+    # which is how much time resuming from it saves.
+    work = attr.ib()
+
+
+class Snapshots(object):
+    """The snapshots of a single test function, which is always run with
+    :meth:`execute` and calls :meth:`checkpoint` wherever it would be safe
+    to resume from.
+
+    The same object is used in every process involved, but only the owner
+    (the process which created it) keeps track of which snapshots exist and
+    decides which to create.  Workers ask the owner over their connection.
+    """
+
+    def __init__(self, max_snapshots=MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        # Only the owner has the write end of this pipe, so snapshots see the
+        # read end close as soon as the owner exits or we close it.
+        self.lifeline, self.lifeline_writer = os.pipe()
+        self.directory = tempfile.mkdtemp(prefix="hypothesis-snapshots-")
+        self.snapshots = OrderedDict()
+        self.counter = 0
+        self.closed = False
+        # How long it takes to make a snapshot, and the least extra time we
+        # have seen resuming from one take compared to running the rest of
+        # the test in this process.  The timings are noisy, and if one slow
+        # resume made us stop resuming we would never find out that it was a
+        # fluke, so we use the minimum.
+        self.fork_cost = 0.0
+        self.resume_cost = 0.0
+        self.resumed = False
+        # In the process currently running the test, when it started or
+        # resumed, how much work was done before that, and when we last made
+        # a snapshot.
+        self.started = 0.0
+        self.work_before_start = 0.0
+        self.last_snapshot = 0.0
+        # In a worker, the connection to the owner. None in the owner.
+        self.connection = None
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def execute(self, data, test):
+        """Run ``test()``, which draws from ``data``, resuming from a
+        snapshot if ``data`` has a fixed buffer which starts with the prefix
+        of one."""
+        buffer = data.fixed_buffer
+        if buffer is not None and not self.closed:
+            best = None
+            for prefix in self.snapshots:
+                if buffer.startswith(prefix) and (
+                    best is None or len(prefix) > len(best)
+                ):
+                    best = prefix
+            if best is not None and self.snapshots[best].work >= self.resume_cost:
+                self.snapshots[best] = self.snapshots.pop(best)
+                result = self.__resume(best, buffer)
+                if result is not None:
+                    return self.__adopt(data, result)
+        self.started = self.last_snapshot = benchmark_time()
+        self.work_before_start = 0.0
+        try:
+            test()
+        except BaseException as e:
+            if self.connection is None:
+                raise
+            self.__finish(data, e)  # pragma: no cover
+        if self.connection is not None:
+            self.__finish(data, None)  # pragma: no cover
+
+    def checkpoint(self, data):
+        """Fork a snapshot of the current process which can later resume the
+        test from this point, unless we already have one for this prefix or
+        it wouldn't be worth it.
+
+        In the snapshot this only returns in a worker that is resuming from
+        it, at which point ``data`` reads the rest of the worker's buffer."""
+        if self.closed:
+            return
+        start = benchmark_time()
+        if start - self.last_snapshot < MIN_WORK_RATIO * self.fork_cost:
+            return
+        work = self.work_before_start + start - self.started
+        if work < self.resume_cost:
+            return
+        prefix = hbytes(data.buffer[: data.index])
+        if not self.__wants(prefix):
+            return
+        self.counter += 1
+        path = os.path.join(self.directory, "%d-%d.sock" % (os.getpid(), self.counter))
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+        _flush_output()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            if self.connection is None:
+                os.close(self.lifeline_writer)
+            self.work_before_start = work
+            self.__serve(listener, data)
+            return
+        listener.close()
+        self.__register(prefix, Snapshot(path, pid, self.connection is None, work))
+        self.last_snapshot = benchmark_time()
+        self.fork_cost = self.last_snapshot - start
+
+    def close(self):
+        """Kill every snapshot and clean up after them."""
+        if self.closed:
+            return
+        self.closed = True
+        os.close(self.lifeline_writer)
+        os.close(self.lifeline)
+        while self.snapshots:
+            self.__evict()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __wants(self, prefix):
+        if self.connection is not None:  # pragma: no cover
+            send_message(self.connection, ("wants", prefix))
+            return receive_message(self.connection)
+        return prefix not in self.snapshots
+
+    def __register(self, prefix, snapshot):
+        if self.connection is not None:  # pragma: no cover
+            send_message(self.connection, ("register", prefix, snapshot))
+        else:
+            self.__add(prefix, snapshot)
+
+    def __add(self, prefix, snapshot):
+        self.snapshots[prefix] = snapshot
+        while len(self.snapshots) > self.max_snapshots:
+            self.__evict()
+
+    def __evict(self):
+        _, snapshot = self.snapshots.popitem(last=False)
+        try:
+            os.kill(snapshot.pid, signal.SIGKILL)
+            if snapshot.is_child:
+                os.waitpid(snapshot.pid, 0)
+        except OSError:  # pragma: no cover
+            pass
+        try:
+            os.unlink(snapshot.path)
+        except OSError:  # pragma: no cover
+            pass
+
+    def __resume(self, prefix, buffer):
+        """Ask the snapshot for ``prefix`` to run the test with ``buffer``,
+        returning the worker's final message, or None if that failed."""
+        start = benchmark_time()
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self.snapshots[prefix].path)
+            send_message(connection, buffer)
+            while True:
+                message = receive_message(connection)
+                if message[0] == "wants":
+                    send_message(connection, message[1] not in self.snapshots)
+                elif message[0] == "register":
+                    self.__add(*message[1:])
+                else:
+                    break
+        except Exception:
+            # The snapshot or the worker died, or sent us something we
+            # couldn't unpickle, so we can't rely on it.
+            self.snapshots.pop(prefix, None)
+            return None
+        finally:
+            connection.close()
+        tag, duration = message[:2]
+        cost = benchmark_time() - start - duration
+        if not self.resumed or cost < self.resume_cost:
+            self.resume_cost = cost
+        self.resumed = True
+        if tag == "fallback":
+            return None
+        return message
+
+    def __adopt(self, data, result):
+        tag, _, fields, e, origin = result
+        for k in DATA_FIELDS:
+            setattr(data, k, fields[k])
+        if tag == "stop":
+            data.freeze()
+            raise StopTest(data.testcounter)
+        if tag == "raise":
+            if origin is not None:
+                e.hypothesis_internal_forked_failure = origin
+            raise e
+        assert tag == "return"
+
+    def __serve(self, listener, data):  # pragma: no cover
+        """The main loop of a snapshot process, which forks a worker for each
+        connection it receives."""
+        resuming = False
+        try:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            # Workers only touch a small part of the heap, so don't let the
+            # garbage collector copy all of it into each of them.
+            freeze = getattr(gc, "freeze", None)
+            if freeze is not None:
+                freeze()
+            while True:
+                readable, _, _ = select.select([listener, self.lifeline], [], [])
+                self.__reap_workers()
+                if self.lifeline in readable:
+                    return
+                connection, _ = listener.accept()
+                buffer = receive_message(connection)
+                _flush_output()
+                if os.fork() == 0:
+                    listener.close()
+                    self.connection = connection
+                    data.max_length = len(buffer)
+                    data._draw_bytes = lambda data, n: hbytes(
+                        buffer[data.index : data.index + n]
+                    )
+                    self.started = self.last_snapshot = benchmark_time()
+                    resuming = True
+                    return
+                connection.close()
+                self.__reap_workers()
+        finally:
+            if not resuming:
+                os._exit(0)
+
+    def __reap_workers(self):  # pragma: no cover
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except OSError:
+            pass
+
+    def __finish(self, data, e):  # pragma: no cover
+        """Send the result of running the test in a worker to the owner, then
+        exit."""
+        try:
+            fields = {k: getattr(data, k) for k in DATA_FIELDS}
+            if e is None:
+                message = ("return", fields, None, None)
+            elif isinstance(e, StopTest):
+                message = ("stop", fields, None, None)
+            else:
+                message = self.__describe_exception(fields, e)
+            # Everything up to sending the message counts as running the test,
+            # so that the owner only sees the overhead of resuming.
+            duration = benchmark_time() - self.started
+            try:
+                send_message(self.connection, (message[0], duration) + message[1:])
+            except Exception:
+                send_message(self.connection, ("fallback", duration))
+        finally:
+            _flush_output()
+            os._exit(0)
+
+    def __describe_exception(self, fields, e):  # pragma: no cover
+        if isinstance(e, UnsatisfiedAssumption):
+            return ("raise", fields, e, None)
+        # Errors from inside Hypothesis are escalated rather than reported
+        # as test failures, which is easiest to get right by running the test
+        # again in the owner.
+        if getattr(e, "hypothesis_internal_always_escalate", False):
+            return ("fallback",)
+        tb = get_trimmed_traceback()
+        frames = traceback.extract_tb(tb)
+        if not frames or (
+            is_hypothesis_file(frames[-1][0])
+            and not isinstance(
+                e, (HypothesisException,) + HYPOTHESIS_CONTROL_EXCEPTIONS
+            )
+        ):
+            return ("fallback",)
+        text = "".join(traceback.format_exception(type(e), e, tb))
+        origin = (text, frames[-1][0], frames[-1][1])
+        return ("raise", fields, e, origin)
@@ -17,7 +17,9 @@
 
 from __future__ import absolute_import, division, print_function
 
+from hypothesis.errors import InvalidArgument
 from hypothesis.internal.compat import getfullargspec
+from hypothesis.internal.filtering import tightened_arguments
 from hypothesis.internal.reflection import (
     arg_string,
     convert_keyword_arguments,
@@ -84,6 +86,19 @@ class LazyStrategy(SearchStrategy):
         self.__args = args
         self.__kwargs = kwargs
 
+    @property
+    def function(self):
+        """The strategy function which this strategy is a call to."""
+        return self.__function
+
+    @property
+    def args(self):
+        return self.__args
+
+    @property
+    def kwargs(self):
+        return self.__kwargs
+
     @property
     def supports_find(self):
         return self.wrapped_strategy.supports_find
@@ -118,6 +133,22 @@ class LazyStrategy(SearchStrategy):
                 )
         return self.__wrapped_strategy
 
+    def do_filter(self, condition):
+        _, kwargs = convert_positional_arguments(
+            self.__function, self.__args, self.__kwargs
+        )
+        kwargs = tightened_arguments(self.__function, kwargs, condition)
+        if kwargs is None:
+            return None
+        try:
+            result = self.__function(**kwargs)
+            result.validate()
+        except InvalidArgument:
+            # e.g. the condition can't be satisfied within our bounds, in
+            # which case we leave it to filtering to report that.
+            return None
+        return result
+
     def do_validate(self):
         w = self.wrapped_strategy
         assert isinstance(w, SearchStrategy), "%r returned non-strategy %r" % (self, w)
@@ -75,12 +75,18 @@ class SampledFromStrategy(SearchStrategy):
     def __init__(self, elements):
         SearchStrategy.__init__(self)
         self.elements = d.check_sample(elements, "sampled_from")
-        assert self.elements
+        assert len(self.elements) > 0
 
     def calc_has_reusable_values(self, recur):
         return True
 
     def calc_is_cacheable(self, recur):
+        if d.is_ndarray(self.elements):
+            # check_sample gave us a read-only copy, which can't be hashed
+            # but is as simple as a tuple of its elements would be.
+            return self.elements.dtype.kind != "O" or is_simple_data(
+                tuple(self.elements)
+            )
         return is_simple_data(self.elements)
 
     def do_draw(self, data):
@@ -29,7 +29,7 @@ from hypothesis.searchstrategy.strategies import SearchStrategy
 
 class WideRangeIntStrategy(SearchStrategy):
 
-    distribution = d.Sampler([4.0, 8.0, 1.0, 1.0, 0.5])
+    distribution = d.sampler([4.0, 8.0, 1.0, 1.0, 0.5])
 
     sizes = [8, 16, 32, 64, 128]
 
@@ -105,7 +105,7 @@ class FloatStrategy(SearchStrategy):
 
         self.nasty_floats = [f for f in NASTY_FLOATS if self.permitted(f)]
         weights = [0.2 * len(self.nasty_floats)] + [0.8] * len(self.nasty_floats)
-        self.sampler = d.Sampler(weights)
+        self.sampler = d.sampler(weights)
 
     def __repr__(self):
         return "{}(allow_infinity={}, allow_nan={})".format(
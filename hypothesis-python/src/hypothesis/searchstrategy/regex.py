@@ -23,10 +23,17 @@ import sre_constants as sre
 import sre_parse
 import sys
 
+import hypothesis.internal.conjecture.utils as cu
 import hypothesis.strategies as st
 from hypothesis import reject
+from hypothesis.errors import InvalidArgument
+from hypothesis.internal.cache import LRUReusedCache
 from hypothesis.internal.charmap import as_general_categories, categories
 from hypothesis.internal.compat import PY3, hrange, hunichr, int_to_byte, text_type
+from hypothesis.searchstrategy.lazy import unwrap_strategies
+from hypothesis.searchstrategy.misc import JustStrategy, SampledFromStrategy
+from hypothesis.searchstrategy.strategies import SearchStrategy
+from hypothesis.searchstrategy.strings import OneCharStringStrategy, TextStrategy
 
 HAS_SUBPATTERN_FLAGS = sys.version_info[:2] >= (3, 6)
 
@@ -224,13 +231,264 @@ def maybe_pad(draw, regex, strategy, left_pad_strategy, right_pad_strategy):
     return result
 
 
+class UnsupportedRegex(Exception):
+    """Raised while compiling a regex which uses features that only the
+    general strategy built by ``_strategy`` supports, e.g. backreferences."""
+
+
+REGEX_BRANCH_LABEL = cu.calc_label_from_name("regex branch")
+REGEX_REPEAT_LABEL = cu.calc_label_from_name("regex repeat")
+
+
+class Literal(object):
+    """Matches a fixed string."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def draw(self, data, result):
+        result.append(self.value)
+
+
+class OneChar(object):
+    """Matches any single character which ``strategy`` can generate, where
+    ``strategy`` is a OneCharStringStrategy or SampledFromStrategy."""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    def draw(self, data, result):
+        result.append(data.draw(self.strategy))
+
+
+class Concatenation(object):
+    def __init__(self, parts):
+        self.parts = parts
+
+    def draw(self, data, result):
+        for part in self.parts:
+            part.draw(data, result)
+
+
+class Branch(object):
+    """Matches any one of ``branches``, shrinking towards the first."""
+
+    def __init__(self, branches):
+        self.branches = branches
+
+    def draw(self, data, result):
+        data.start_example(REGEX_BRANCH_LABEL)
+        i = cu.integer_range(data, 0, len(self.branches) - 1)
+        self.branches[i].draw(data, result)
+        data.stop_example()
+
+
+class Repeat(object):
+    """Matches between ``min_size`` and ``max_size`` repetitions of
+    ``element``, drawn as for ``lists()``."""
+
+    def __init__(self, element, min_size, max_size):
+        self.element = element
+        self.min_size = min_size
+        self.max_size = max_size
+        self.average_size = min(
+            max(min_size * 2, min_size + 5), 0.5 * (min_size + max_size)
+        )
+
+    def draw(self, data, result):
+        elements = cu.many(
+            data,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            average_size=self.average_size,
+        )
+        while elements.more():
+            self.element.draw(data, result)
+
+
+class RepeatChar(object):
+    """Matches between ``min_size`` and ``max_size`` characters from a
+    OneCharStringStrategy, which are drawn all at once by a TextStrategy."""
+
+    def __init__(self, strategy, min_size, max_size):
+        self.text = TextStrategy(strategy, min_size=min_size, max_size=max_size)
+
+    def draw(self, data, result):
+        result.append(data.draw(self.text))
+
+
+class CompiledRegexStrategy(SearchStrategy):
+    """Generates strings matching a regex which we have compiled with
+    ``compile_regex``, by walking the compiled nodes and drawing directly
+    from ``data`` rather than through a tree of nested strategies."""
+
+    def __init__(self, pattern, node, empty):
+        SearchStrategy.__init__(self)
+        self.pattern = pattern
+        self.node = node
+        self.empty = empty
+
+    def __repr__(self):
+        return "CompiledRegexStrategy(%r)" % (self.pattern,)
+
+    def do_draw(self, data):
+        result = []
+        self.node.draw(data, result)
+        return self.empty.join(result)
+
+
+COMPILED_REGEX_CACHE = LRUReusedCache(256)
+
+
+def compile_regex(regex, parsed):
+    """Returns the compiled node for ``regex``, or None if it uses features
+    (such as backreferences or lookarounds) which we can only generate with
+    the general strategy.  Results are cached by pattern and flags."""
+    key = (type(regex.pattern), regex.pattern, regex.flags)
+    try:
+        return COMPILED_REGEX_CACHE[key]
+    except KeyError:
+        pass
+    try:
+        result = _compile(parsed, regex.flags, isinstance(regex.pattern, text_type))
+    except (UnsupportedRegex, InvalidArgument):
+        # InvalidArgument means a character class is empty, in which case the
+        # general strategy will raise a clearer error when it is used.
+        result = None
+    COMPILED_REGEX_CACHE[key] = result
+    return result
+
+
+def _one_char(strategy):
+    strategy = unwrap_strategies(strategy)
+    if isinstance(strategy, JustStrategy):
+        # e.g. sampled_from() a single byte
+        return Literal(strategy.value)
+    if not isinstance(strategy, (OneCharStringStrategy, SampledFromStrategy)):
+        raise UnsupportedRegex()
+    return OneChar(strategy)
+
+
+def _compile(codes, flags, is_unicode):
+    """Compiles an SRE parse tree into nodes that generate matching strings,
+    mirroring ``_strategy``."""
+    if is_unicode:
+        empty = u""
+        to_char = hunichr
+    else:
+        empty = b""
+        to_char = int_to_byte
+
+    if not isinstance(codes, tuple):
+        # List of codes.  Runs of literals are merged, as in _strategy.
+        parts = []
+        for code in codes:
+            part = _compile(code, flags, is_unicode)
+            if isinstance(part, Literal) and parts and isinstance(parts[-1], Literal):
+                parts[-1] = Literal(parts[-1].value + part.value)
+            else:
+                parts.append(part)
+        if not parts:
+            return Literal(empty)
+        if len(parts) == 1:
+            return parts[0]
+        return Concatenation(parts)
+
+    code, value = codes
+    if code == sre.LITERAL:
+        c = to_char(value)
+        if (
+            flags & re.IGNORECASE
+            and c != c.swapcase()
+            and re.match(re.escape(c), c.swapcase(), re.IGNORECASE) is not None
+        ):
+            return _one_char(st.sampled_from([c, c.swapcase()]))
+        return Literal(c)
+
+    elif code == sre.NOT_LITERAL:
+        c = to_char(value)
+        blacklist = set(c)
+        if (
+            flags & re.IGNORECASE
+            and re.match(re.escape(c), c.swapcase(), re.IGNORECASE) is not None
+        ):
+            blacklist |= set(c.swapcase())
+        if is_unicode:
+            return _one_char(st.characters(blacklist_characters=blacklist))
+        return _one_char(st.sampled_from(sorted(BYTES_ALL - blacklist)))
+
+    elif code == sre.IN:
+        negate = value[0][0] == sre.NEGATE
+        if is_unicode:
+            builder = CharactersBuilder(negate, flags)
+        else:
+            builder = BytesBuilder(negate, flags)
+        for charset_code, charset_value in value:
+            if charset_code == sre.NEGATE:
+                pass
+            elif charset_code == sre.LITERAL:
+                builder.add_char(charset_value)
+            elif charset_code == sre.RANGE:
+                low, high = charset_value
+                for char_code in hrange(low, high + 1):
+                    builder.add_char(char_code)
+            elif charset_code == sre.CATEGORY:
+                builder.add_category(charset_value)
+            else:  # pragma: no cover
+                raise UnsupportedRegex()
+        return _one_char(builder.strategy)
+
+    elif code == sre.ANY:
+        if is_unicode:
+            if flags & re.DOTALL:
+                return _one_char(st.characters())
+            return _one_char(st.characters(blacklist_characters=u"\n"))
+        if flags & re.DOTALL:
+            return _one_char(st.sampled_from(sorted(BYTES_ALL)))
+        return _one_char(st.sampled_from(sorted(BYTES_ALL - {b"\n"})))
+
+    elif code == sre.AT:
+        return Literal(empty)
+
+    elif code == sre.SUBPATTERN:
+        if HAS_SUBPATTERN_FLAGS:  # pragma: no cover
+            flags = (flags | value[1]) & ~value[2]
+        # Group names and numbers only matter for backreferences, which
+        # we don't support here.
+        return _compile(value[-1], flags, is_unicode)
+
+    elif code == sre.BRANCH:
+        return Branch([_compile(branch, flags, is_unicode) for branch in value[1]])
+
+    elif code in [sre.MIN_REPEAT, sre.MAX_REPEAT]:
+        at_least, at_most, subregex = value
+        if at_most == sre.MAXREPEAT:
+            at_most = float("inf")
+        element = _compile(subregex, flags, is_unicode)
+        if at_least == 0 and at_most == 1:
+            return Branch([Literal(empty), element])
+        if isinstance(element, OneChar) and isinstance(
+            element.strategy, OneCharStringStrategy
+        ):
+            return RepeatChar(element.strategy, at_least, at_most)
+        return Repeat(element, at_least, at_most)
+
+    else:
+        # Backreferences, lookarounds, and conditionals.
+        raise UnsupportedRegex()
+
+
 def base_regex_strategy(regex, parsed=None):
     if parsed is None:
         parsed = sre_parse.parse(regex.pattern, flags=regex.flags)
-    return clear_cache_after_draw(
-        _strategy(
-            parsed, Context(flags=regex.flags), isinstance(regex.pattern, text_type)
+    is_unicode = isinstance(regex.pattern, text_type)
+    compiled = compile_regex(regex, parsed)
+    if compiled is not None:
+        return CompiledRegexStrategy(
+            regex.pattern, compiled, u"" if is_unicode else b""
         )
+    return clear_cache_after_draw(
+        _strategy(parsed, Context(flags=regex.flags), is_unicode)
     )
 
 
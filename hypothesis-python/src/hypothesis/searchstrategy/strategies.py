@@ -413,6 +413,16 @@ class SearchStrategy(Generic[Ex]):
         # type: (ConjectureData) -> Ex
         raise NotImplementedError("%s.do_draw" % (type(self).__name__,))
 
+    def do_filter(self, condition):
+        """Return a strategy which can generate every value from this strategy
+        that satisfies condition, but fewer of the values which don't, or
+        None if we don't know of one.
+
+        The result is only used in place of this strategy by
+        FilteredStrategy, which still checks the condition on every value.
+        """
+        return None
+
     def __init__(self):
         pass
 
@@ -440,7 +450,7 @@ class OneOfStrategy(SearchStrategy):
         if self.__sampler is None:
             assert self.bias is not None
             assert 0 < self.bias < 1
-            self.__sampler = cu.Sampler(
+            self.__sampler = cu.sampler(
                 [self.bias ** i for i in range(len(self.element_strategies))]
             )
         return self.__sampler
@@ -590,6 +600,24 @@ class FilteredStrategy(SearchStrategy):
         super(FilteredStrategy, self).__init__()
         self.condition = condition
         self.filtered_strategy = strategy
+        self.__tightened_strategy = None
+
+    @property
+    def tightened_strategy(self):
+        """The strategy we actually draw values to filter from: a version of
+        filtered_strategy rewritten to avoid generating values which fail the
+        condition where possible (see SearchStrategy.do_filter), or
+        filtered_strategy itself."""
+        if self.__tightened_strategy is None:
+            tightened = self.filtered_strategy.do_filter(self.condition)
+            self.__tightened_strategy = tightened or self.filtered_strategy
+        return self.__tightened_strategy
+
+    def do_filter(self, condition):
+        tightened = self.filtered_strategy.do_filter(condition)
+        if tightened is None:
+            return None
+        return FilteredStrategy(tightened, self.condition)
 
     def calc_is_empty(self, recur):
         return recur(self.filtered_strategy)
@@ -610,9 +638,10 @@ class FilteredStrategy(SearchStrategy):
 
     def do_draw(self, data):
         # type: (ConjectureData) -> Ex
+        strategy = self.tightened_strategy
         for i in hrange(3):
             start_index = data.index
-            value = data.draw(self.filtered_strategy)
+            value = data.draw(strategy)
             if self.condition(value):
                 return value
             else:
@@ -26,6 +26,7 @@ execution to date.
 
 from __future__ import absolute_import, division, print_function
 
+import bisect
 import inspect
 from copy import copy
 from unittest import TestCase
@@ -43,8 +44,9 @@ from hypothesis._settings import (
 from hypothesis.control import current_build_context
 from hypothesis.core import given
 from hypothesis.errors import InvalidArgument, InvalidDefinition
-from hypothesis.internal.compat import int_to_bytes, string_types
+from hypothesis.internal.compat import hrange, int_to_bytes, string_types
 from hypothesis.internal.reflection import function_digest, nicerepr, proxies
+from hypothesis.internal.snapshots import Snapshots, snapshots_supported
 from hypothesis.internal.validation import check_type
 from hypothesis.reporting import current_verbosity, report
 from hypothesis.searchstrategy.strategies import OneOfStrategy, SearchStrategy
@@ -69,13 +71,30 @@ class TestCaseProperty(object):  # pragma: no cover
         raise AttributeError(u"Cannot delete TestCase")
 
 
-def run_state_machine_as_test(state_machine_factory, settings=None):
+def run_state_machine_as_test(
+    state_machine_factory, settings=None, fork_snapshots=False, swarm=False
+):
     """Run a state machine definition as a test, either silently doing nothing
     or printing a minimal breaking program and raising an exception.
 
     state_machine_factory is anything which returns an instance of
     GenericStateMachine when called with no arguments - it can be a class or a
     function. settings will be used to control the execution of the test.
+
+    If fork_snapshots is True and the platform supports ``os.fork``, the
+    machine is snapshotted in a forked process between steps, and test cases
+    which start with the same steps as an earlier one (as most do while
+    shrinking) resume from the latest matching snapshot instead of running
+    every step again. This only helps if creating the machine or running its
+    steps is expensive, and requires that all of the machine's state lives
+    in the current process - not in threads or other processes.
+
+    If swarm is True and the machine is a RuleBasedStateMachine, each test
+    case starts by choosing a random subset of the rules, and its steps only
+    use those rules where possible. This makes it much more likely to find
+    bugs which only appear after many steps that avoid some rule (e.g. never
+    clearing a collection), which would otherwise be almost impossible to
+    reach in machines with many rules.
     """
     if settings is None:
         try:
@@ -85,32 +104,52 @@ def run_state_machine_as_test(state_machine_factory, settings=None):
             settings = Settings(deadline=None, suppress_health_check=HealthCheck.all())
     check_type(Settings, settings, "settings")
 
+    if fork_snapshots and snapshots_supported():
+        snapshots = Snapshots()
+    else:
+        snapshots = None
+
     @settings
     @given(st.data())
     def run_state_machine(factory, data):
+        print_steps = (
+            current_build_context().is_final or current_verbosity() >= Verbosity.debug
+        )
+        if snapshots is None or print_steps:
+            run_steps(factory, data.conjecture_data, print_steps, None)
+        else:
+            snapshots.execute(
+                data.conjecture_data,
+                lambda: run_steps(factory, data.conjecture_data, False, snapshots),
+            )
+
+    def run_steps(factory, conjecture_data, print_steps, snapshots):
         machine = factory()
         check_type(GenericStateMachine, machine, "state_machine_factory()")
-        data.conjecture_data.hypothesis_runner = machine
+        conjecture_data.hypothesis_runner = machine
+        if swarm and isinstance(machine, RuleBasedStateMachine):
+            machine._draw_swarm(conjecture_data)
 
         n_steps = settings.stateful_step_count
         should_continue = cu.many(
-            data.conjecture_data, min_size=1, max_size=n_steps, average_size=n_steps
+            conjecture_data, min_size=1, max_size=n_steps, average_size=n_steps
         )
 
-        print_steps = (
-            current_build_context().is_final or current_verbosity() >= Verbosity.debug
-        )
         try:
             if print_steps:
                 machine.print_start()
             machine.check_invariants()
 
+            if snapshots is not None:
+                snapshots.checkpoint(conjecture_data)
             while should_continue.more():
-                value = data.conjecture_data.draw(machine.steps())
+                value = conjecture_data.draw(machine.steps())
                 if print_steps:
                     machine.print_step(value)
                 machine.execute_step(value)
                 machine.check_invariants()
+                if snapshots is not None:
+                    snapshots.checkpoint(conjecture_data)
         finally:
             if print_steps:
                 machine.print_end()
@@ -128,7 +167,11 @@ def run_state_machine_as_test(state_machine_factory, settings=None):
         state_machine_factory, "_hypothesis_internal_use_reproduce_failure", None
     )
 
-    run_state_machine(state_machine_factory)
+    try:
+        run_state_machine(state_machine_factory)
+    finally:
+        if snapshots is not None:
+            snapshots.close()
 
 
 class GenericStateMachineMeta(type):
@@ -283,7 +326,10 @@ class BundleReferenceStrategy(SearchStrategy):
         # end there can be a lot of hard to remove padding.
         position = cu.integer_range(data, 0, len(bundle) - 1, center=len(bundle))
         if self.consume:
-            return bundle.pop(position)
+            result = bundle.pop(position)
+            if not bundle:
+                machine._bundle_changed(self.name)
+            return result
         else:
             return bundle[position]
 
@@ -571,6 +617,7 @@ def invariant():
 
 
 LOOP_LABEL = cu.calc_label_from_name("RuleStrategy loop iteration")
+SWARM_LABEL = cu.calc_label_from_name("RuleStrategy swarm")
 
 
 class RuleStrategy(SearchStrategy):
@@ -594,6 +641,71 @@ class RuleStrategy(SearchStrategy):
             )
         )
 
+        # Checking every rule for validity is expensive for large machines,
+        # so we keep track of which rules have something in all of the
+        # bundles they draw from. The machine tells us whenever a bundle
+        # becomes empty or non-empty, which lets us keep two sorted lists of
+        # enabled rules: those with preconditions, which we still have to
+        # check on each step, and those without, which are always valid.
+        self.bundle_names = []
+        self.rules_by_bundle = {}
+        for i, rule in enumerate(self.rules):
+            names = sorted(set(b.name for b in rule.bundles))
+            self.bundle_names.append(names)
+            for name in names:
+                self.rules_by_bundle.setdefault(name, []).append(i)
+        self.enabled = set()
+        self.enabled_rules = []
+        self.enabled_conditional_rules = []
+        # The rules which swarm testing has turned off for this run.
+        self.disabled = frozenset()
+        for i in hrange(len(self.rules)):
+            self.update_enabled(i)
+
+    def update_enabled(self, i):
+        enabled = i not in self.disabled and all(
+            self.machine.bundle(name) for name in self.bundle_names[i]
+        )
+        if enabled == (i in self.enabled):
+            return
+        if self.rules[i].precondition:
+            target = self.enabled_conditional_rules
+        else:
+            target = self.enabled_rules
+        if enabled:
+            self.enabled.add(i)
+            bisect.insort(target, i)
+        else:
+            self.enabled.remove(i)
+            del target[bisect.bisect_left(target, i)]
+
+    def draw_swarm(self, data):
+        """Choose a subset of the rules to use for this run, turning the rest
+        off unless none of the chosen rules can run.
+
+        This is swarm testing (Groce et al., "Swarm Testing", ISSTA 2012):
+        machines with many rules rarely get deep into any one part of their
+        state when every step chooses uniformly from all of them. Rather than
+        turning each rule off with probability 1/2 as in the paper, we first
+        draw how likely rules are to be turned off, so that runs with almost
+        all or almost none of the rules are reasonably common. Each rule then
+        gets its own flag, which shrinks towards the rule being on.
+        """
+        data.start_example(SWARM_LABEL)
+        p_disabled = data.draw_bits(8) / 256
+        self.disabled = frozenset(
+            i for i in hrange(len(self.rules)) if cu.biased_coin(data, p_disabled)
+        )
+        data.stop_example()
+        for i in self.disabled:
+            self.update_enabled(i)
+
+    def bundle_changed(self, name):
+        """Called by the machine when the bundle ``name`` may have changed
+        between being empty and non-empty."""
+        for i in self.rules_by_bundle.get(name, ()):
+            self.update_enabled(i)
+
     def do_draw(self, data):
         # This strategy is slightly strange in its implementation.
         # We don't want the interpretation of the rule we draw to change based
@@ -622,20 +734,52 @@ class RuleStrategy(SearchStrategy):
         u, v = data.blocks[-1].bounds
         block_length = v - u
         rule = self.rules[i]
-        if not self.is_valid(rule):
-            valid_rules = [j for j, r in enumerate(self.rules) if self.is_valid(r)]
-            if not valid_rules:
-                raise InvalidDefinition(
-                    u"No progress can be made from state %r" % (self.machine,)
-                )
-            i = valid_rules[cu.integer_range(data, 0, len(valid_rules) - 1)]
+        if i in self.disabled or not self.is_valid(rule):
+            i = self.draw_valid_rule_index(data, i)
             data.write(int_to_bytes(i, block_length))
             rule = self.rules[i]
         return (rule, data.draw(rule.arguments_strategy))
 
+    def draw_valid_rule_index(self, data, invalid):
+        # Rules without preconditions whose bundles are all non-empty are
+        # always valid, so we only need to check the preconditions of the
+        # enabled conditional rules. We already know that the rule at index
+        # ``invalid`` is invalid, so don't check it again.
+        conditional = [
+            j
+            for j in self.enabled_conditional_rules
+            if j != invalid and self.rules[j].precondition(self.machine)
+        ]
+        n_unconditional = len(self.enabled_rules)
+        n_valid = n_unconditional + len(conditional)
+        if n_valid > 0:
+            k = cu.integer_range(data, 0, n_valid - 1)
+            if k < n_unconditional:
+                j = self.enabled_rules[k]
+            else:
+                j = conditional[k - n_unconditional]
+            # We've just checked the precondition of any conditional rule we
+            # might have picked, and only need to check its bundles in case
+            # the index is out of date.
+            if self.has_bundle_data(self.rules[j]):
+                return j
+        # Either none of the rules left on by swarm testing can run, or the
+        # index is wrong because something other than the machine has
+        # modified the bundles. Either way we fall back to checking every
+        # rule.
+        valid_rules = [j for j, r in enumerate(self.rules) if self.is_valid(r)]
+        if not valid_rules:
+            raise InvalidDefinition(
+                u"No progress can be made from state %r" % (self.machine,)
+            )
+        return valid_rules[cu.integer_range(data, 0, len(valid_rules) - 1)]
+
     def is_valid(self, rule):
         if rule.precondition and not rule.precondition(self.machine):
             return False
+        return self.has_bundle_data(rule)
+
+    def has_bundle_data(self, rule):
         for b in rule.bundles:
             bundle = self.machine.bundle(b.name)
             if not bundle:
@@ -808,7 +952,16 @@ class RuleBasedStateMachine(GenericStateMachine):
         )
         self.names_to_values[name] = result
         for target in targets:
-            self.bundle(target).append(VarReference(name))
+            bundle = self.bundle(target)
+            bundle.append(VarReference(name))
+            if len(bundle) == 1:
+                self._bundle_changed(target)
+
+    def _bundle_changed(self, name):
+        self.__rules_strategy.bundle_changed(name)
+
+    def _draw_swarm(self, data):
+        self.__rules_strategy.draw_swarm(data)
 
     def execute_step(self, step):
         rule, data = step
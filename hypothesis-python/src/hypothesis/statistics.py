@@ -17,37 +17,69 @@
 
 from __future__ import absolute_import, division, print_function
 
-import math
-
 from hypothesis.internal.conjecture.data import Status
 from hypothesis.internal.conjecture.engine import MAX_SHRINKS, ExitReason
+from hypothesis.internal.quantiles import QuantileSketch
 from hypothesis.utils.dynamicvariables import DynamicVariable
 
 collector = DynamicVariable(None)
 
+# Whether to attribute the time spent generating data to the strategies it
+# was drawn from, which has a small cost so is off by default.
+profile_strategies = DynamicVariable(False)
+
+# How many strategies to list in the statistics when profiling.
+HEAVIEST_STRATEGIES = 5
+
+PERCENTILES = (0, 5, 25, 50, 75, 90, 95, 99, 100)
+
+
+def percentiles(sketch):
+    """Return a dict mapping e.g. ``"p95"`` to the 95th percentile of the
+    values in ``sketch``, a QuantileSketch."""
+    if not sketch:
+        return {}
+    return {"p%d" % (p,): sketch.quantile(p / 100) for p in PERCENTILES}
+
 
 class Statistics(object):
     def __init__(self, engine):
         self.passing_examples = len(engine.status_runtimes.get(Status.VALID, ()))
         self.invalid_examples = len(
-            engine.status_runtimes.get(Status.INVALID, [])
-            + engine.status_runtimes.get(Status.OVERRUN, [])
-        )
+            engine.status_runtimes.get(Status.INVALID, ())
+        ) + len(engine.status_runtimes.get(Status.OVERRUN, ()))
         self.failing_examples = len(engine.status_runtimes.get(Status.INTERESTING, ()))
-
-        runtimes = sorted(
-            engine.status_runtimes.get(Status.VALID, [])
-            + engine.status_runtimes.get(Status.INVALID, [])
-            + engine.status_runtimes.get(Status.INTERESTING, [])
+        self.status_counts = {
+            status.name.lower(): len(engine.status_runtimes.get(status, ()))
+            for status in Status
+        }
+        self.phases = dict(engine.phase_statistics)
+        self.shrinks = engine.shrinks
+        self.database_hits = engine.database_hits
+        self.database_misses = engine.database_misses
+
+        runtimes = QuantileSketch.merge(
+            engine.status_runtimes[status]
+            for status in (Status.VALID, Status.INVALID, Status.INTERESTING)
+            if status in engine.status_runtimes
         )
 
         self.has_runs = bool(runtimes)
+        self.runtime_percentiles = percentiles(runtimes)
+        self.draw_time_percentiles = percentiles(engine.test_case_drawtimes)
+        exit_reason = getattr(engine, "exit_reason", None)
+        self.exit_reason_name = None if exit_reason is None else exit_reason.name
+        self.event_counts = dict(engine.event_call_counts)
+        profiler = getattr(engine, "profiler", None)
+        self.heaviest_strategies = (
+            [] if profiler is None else profiler.heaviest(HEAVIEST_STRATEGIES)
+        )
+        self.draw_time_fraction = None
         if not self.has_runs:
             return
 
-        n = max(0, len(runtimes) - 1)
-        lower = int(runtimes[int(math.floor(n * 0.05))] * 1000)
-        upper = int(runtimes[int(math.ceil(n * 0.95))] * 1000)
+        lower = int(runtimes.quantile(0.05) * 1000)
+        upper = int(runtimes.quantile(0.95) * 1000)
         if upper == 0:
             self.runtimes = "< 1ms"
         elif lower == upper:
@@ -61,6 +93,8 @@ class Statistics(object):
             self.exit_reason = "test was flaky"
         elif engine.exit_reason == ExitReason.max_shrinks:
             self.exit_reason = "shrunk example %s times" % (MAX_SHRINKS,)
+        elif engine.exit_reason == ExitReason.time_budget:
+            self.exit_reason = "test used up its share of the session budget"
         elif engine.exit_reason == ExitReason.max_iterations:
             self.exit_reason = (
                 "settings.max_examples={}, but < 10% of examples satisfied "
@@ -77,8 +111,8 @@ class Statistics(object):
             for e, c in sorted(engine.event_call_counts.items(), key=lambda x: -x[1])
         ]
 
-        total_runtime = math.fsum(engine.all_runtimes)
-        total_drawtime = math.fsum(engine.all_drawtimes)
+        total_runtime = engine.all_runtimes.total
+        total_drawtime = engine.all_drawtimes.total
 
         if total_drawtime == 0.0 and total_runtime >= 0.0:
             self.draw_time_percentage = "~ 0%"
@@ -90,7 +124,8 @@ class Statistics(object):
             #     off by the lowest bit, so drawtime==0 and runtime!=0, eek!
             self.draw_time_percentage = "NaN"
         else:
-            draw_time_percentage = 100.0 * min(1, total_drawtime / total_runtime)
+            self.draw_time_fraction = min(1, total_drawtime / total_runtime)
+            draw_time_percentage = 100.0 * self.draw_time_fraction
 
             self.draw_time_percentage = "~ %d%%" % (round(draw_time_percentage),)
 
@@ -109,8 +144,44 @@ class Statistics(object):
         if self.events:
             lines.append("  - Events:")
             lines += ["    * %s" % (event,) for event in self.events]
+        if self.heaviest_strategies:
+            lines.append("  - Slowest strategies (exclusive / inclusive time):")
+            lines += [
+                "    * %.3fs / %.3fs, %d calls, %s"
+                % (p.exclusive, p.inclusive, p.calls, p.name)
+                for p in self.heaviest_strategies
+            ]
         return lines
 
+    def as_json(self):
+        """Return the statistics as a dict of JSON-serialisable values, for
+        tools which want to process them rather than show them to a person.
+
+        Times are in seconds, and percentiles of the runtime and draw time
+        of each test case are taken over every test case that was run.
+        """
+        return {
+            "test-cases": self.status_counts,
+            "phases": self.phases,
+            "runtime-percentiles": self.runtime_percentiles,
+            "draw-time-percentiles": self.draw_time_percentiles,
+            "draw-time-fraction": self.draw_time_fraction,
+            "stopped-because": self.exit_reason_name,
+            "events": self.event_counts,
+            "shrinks": self.shrinks,
+            "shrink-calls": self.phases.get("shrink", {}).get("test-cases", 0),
+            "database": {"hits": self.database_hits, "misses": self.database_misses},
+            "strategies": [
+                {
+                    "strategy": p.name,
+                    "calls": p.calls,
+                    "inclusive-seconds": p.inclusive,
+                    "exclusive-seconds": p.exclusive,
+                }
+                for p in self.heaviest_strategies
+            ],
+        }
+
 
 def note_engine_for_statistics(engine):
     callback = collector.value
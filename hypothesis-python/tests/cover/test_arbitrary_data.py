@@ -19,7 +19,7 @@ from __future__ import absolute_import, division, print_function
 
 import pytest
 
-from hypothesis import find, given, reporting, strategies as st
+from hypothesis import find, given, reporting, settings, strategies as st
 from hypothesis.errors import InvalidArgument
 from tests.common.utils import capture_out, raises
 
@@ -66,6 +66,31 @@ def test_prints_labels_if_given_on_failure():
     assert "Draw 2 (A number): 0" in result
 
 
+class CountsReprs(object):
+    calls = 0
+
+    def __repr__(self):
+        CountsReprs.calls += 1
+        return "CountsReprs()"
+
+
+def test_only_formats_draws_which_are_reported():
+    CountsReprs.calls = 0
+
+    @settings(database=None)
+    @given(st.data())
+    def test(data):
+        data.draw(st.builds(CountsReprs))
+        assert data.draw(st.integers()) < 10
+
+    with raises(AssertionError):
+        with capture_out() as out:
+            with reporting.with_reporter(reporting.default):
+                test()
+    assert "Draw 1: CountsReprs()" in out.getvalue()
+    assert CountsReprs.calls == 1
+
+
 def test_given_twice_is_same():
     @given(st.data(), st.data())
     def test(data1, data2):
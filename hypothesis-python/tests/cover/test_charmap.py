@@ -22,12 +22,23 @@ import sys
 import tempfile
 import unicodedata
 
+import pytest
+
 import hypothesis.internal.charmap as cm
 import hypothesis.strategies as st
 from hypothesis import assume, given
 from hypothesis.internal.compat import hunichr
 
 
+@pytest.fixture()
+def without_charmap_table(monkeypatch):
+    # Force the fallback to the cache file (or recomputation), as if we were
+    # running on a version of Python that we don't ship a table for.
+    monkeypatch.setattr(
+        cm, "charmap_table_file", lambda version=None: os.devnull + "-missing"
+    )
+
+
 def test_charmap_contains_all_unicode():
     n = 0
     for vs in cm.charmap().values():
@@ -99,7 +110,8 @@ def test_reload_charmap():
     assert x == y
 
 
-def test_recreate_charmap():
+def test_recreate_charmap(without_charmap_table):
+    cm._charmap = None
     x = cm.charmap()
     assert x is cm.charmap()
     cm._charmap = None
@@ -136,7 +148,7 @@ def test_successive_union():
     assert x == ((0, sys.maxunicode),)
 
 
-def test_can_handle_race_between_exist_and_create(monkeypatch):
+def test_can_handle_race_between_exist_and_create(monkeypatch, without_charmap_table):
     x = cm.charmap()
     cm._charmap = None
     monkeypatch.setattr(os.path, "exists", lambda p: False)
@@ -145,7 +157,9 @@ def test_can_handle_race_between_exist_and_create(monkeypatch):
     assert x == y
 
 
-def test_exception_in_write_does_not_lead_to_broken_charmap(monkeypatch):
+def test_exception_in_write_does_not_lead_to_broken_charmap(
+    monkeypatch, without_charmap_table
+):
     def broken(*args, **kwargs):
         raise ValueError()
 
@@ -157,7 +171,8 @@ def test_exception_in_write_does_not_lead_to_broken_charmap(monkeypatch):
     cm.charmap()
 
 
-def test_regenerate_broken_charmap_file():
+def test_regenerate_broken_charmap_file(without_charmap_table):
+    cm._charmap = None
     cm.charmap()
     file_loc = cm.charmap_file()
 
@@ -172,7 +187,7 @@ def test_exclude_characters_are_included_in_key():
     assert cm.query() != cm.query(exclude_characters="0")
 
 
-def test_error_writing_charmap_file_is_suppressed(monkeypatch):
+def test_error_writing_charmap_file_is_suppressed(monkeypatch, without_charmap_table):
     def broken_mkstemp(dir):
         raise RuntimeError()
 
@@ -183,8 +198,48 @@ def test_error_writing_charmap_file_is_suppressed(monkeypatch):
         # somebody tries to use it.
         saved = cm._charmap
         cm._charmap = None
-        os.unlink(cm.charmap_file())
+        if os.path.exists(cm.charmap_file()):
+            os.unlink(cm.charmap_file())
 
         cm.charmap()
     finally:
         cm._charmap = saved
+
+
+def test_charmap_is_loaded_from_shipped_table_if_available():
+    if not os.path.exists(cm.charmap_table_file()):
+        pytest.skip("No table shipped for Unicode %s" % unicodedata.unidata_version)
+    cm._charmap = None
+    assert isinstance(cm.charmap(), cm.CharmapTable)
+
+
+def test_charmap_table_round_trips(without_charmap_table):
+    cm._charmap = None
+    computed = cm.charmap()
+    table = cm.CharmapTable(cm.encode_charmap_table(computed))
+    assert table.maxunicode == sys.maxunicode
+    assert table == computed
+    for cat, intervals in computed.items():
+        assert table.interval_count(cat) == len(intervals)
+
+
+def test_categories_order_does_not_depend_on_charmap_source(without_charmap_table):
+    cm._charmap = None
+    cm._categories = None
+    from_cache = cm.categories()
+    cm._charmap = cm.CharmapTable(cm.encode_charmap_table(cm.charmap()))
+    cm._categories = None
+    assert cm.categories() == from_cache
+
+
+def test_rejects_table_for_different_maxunicode(tmpdir):
+    path = str(tmpdir.join("table.bin"))
+    with open(path, "wb") as f:
+        f.write(cm.encode_charmap_table({"Co": ((0, 1),)}, maxunicode=0xFFFF))
+    with pytest.raises(ValueError):
+        cm.load_charmap_table(path)
+
+
+def test_rejects_garbage_table():
+    with pytest.raises(Exception):
+        cm.CharmapTable(b"not a charmap table at all")
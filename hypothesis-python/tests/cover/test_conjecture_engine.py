@@ -43,7 +43,14 @@ from hypothesis.internal.conjecture.engine import (
 )
 from hypothesis.internal.conjecture.shrinker import Shrinker, block_program
 from hypothesis.internal.conjecture.shrinking import Float
-from hypothesis.internal.conjecture.utils import Sampler, calc_label_from_name
+from hypothesis.internal.conjecture.utils import (
+    DENSE_ARRAY_LABEL,
+    SPARSE_ARRAY_LABEL,
+    Sampler,
+    calc_label_from_name,
+    collection_size,
+    many,
+)
 from hypothesis.internal.entropy import deterministic_PRNG
 from tests.common.strategies import SLOW, HardToShrink
 from tests.common.utils import no_shrink
@@ -1554,3 +1561,96 @@ def test_try_shrinking_blocks_out_of_bounds():
         data.mark_interesting()
 
     assert not shrinker.try_shrinking_blocks((1,), hbytes([1]))
+
+
+def test_element_deletion_with_length_lowering_deletes_from_the_middle():
+    # Two successful coins, so the size is drawn from two bits.
+    @shrinking_from([1, 1, 3, 1, 2, 3, 9])
+    def shrinker(data):
+        data.start_example(SOME_LABEL)
+        n = collection_size(data, min_size=0, max_size=3, average_size=2)
+        values = data.draw_bits_sequence(8, n, label=SOME_LABEL)
+        data.stop_example()
+        if 3 in values and data.draw_bits(8) == 9:
+            data.mark_interesting()
+
+    shrinker.run_shrink_pass("element_deletion_with_length_lowering")
+    assert list(shrinker.shrink_target.buffer) == [1, 1, 1, 3, 9]
+
+
+def test_element_deletion_with_length_lowering_respects_min_size():
+    @shrinking_from([1, 1, 1, 1, 1])
+    def shrinker(data):
+        data.start_example(SOME_LABEL)
+        n = collection_size(data, min_size=2, max_size=3, average_size=2.5)
+        data.draw_bits_sequence(8, n, label=SOME_LABEL)
+        data.stop_example()
+        data.mark_interesting()
+
+    shrinker.run_shrink_pass("element_deletion_with_length_lowering")
+    assert list(shrinker.shrink_target.buffer) == [1, 0, 1, 1]
+
+
+def test_element_deletion_with_length_lowering_deletes_runs_of_bytes():
+    @shrinking_from([1, 1, 1, 1, 1, 1, 1, 0, 100] + [7] * 99 + [9])
+    def shrinker(data):
+        data.start_example(SOME_LABEL)
+        n = collection_size(data, min_size=0, max_size=255, average_size=100)
+        value = data.draw_bytes(n)
+        data.stop_example()
+        if 9 in value:
+            data.mark_interesting()
+
+    shrinker.run_shrink_pass("element_deletion_with_length_lowering")
+    assert list(shrinker.shrink_target.buffer) == [1, 1, 1, 1, 1, 1, 1, 0, 1, 9]
+
+
+def test_shrink_array_elements_zeroes_runs_of_cells():
+    @shrinking_from([5] * 200)
+    def shrinker(data):
+        data.start_example(DENSE_ARRAY_LABEL)
+        cells = data.draw_bits_sequence(8, 200, label=SOME_LABEL)
+        data.stop_example()
+        if cells[150]:
+            data.mark_interesting()
+
+    fixate_shrink_passes(shrinker, "shrink_array_elements")
+    assert list(shrinker.shrink_target.buffer) == [0] * 150 + [5] + [0] * 49
+    assert shrinker.calls <= 120
+
+
+def test_shrink_array_elements_deletes_from_sparse_arrays():
+    @shrinking_from([1, 3, 4] * 20 + [0, 7])
+    def shrinker(data):
+        data.start_example(SPARSE_ARRAY_LABEL)
+        elements = many(data, min_size=0, max_size=100, average_size=10)
+        values = []
+        while elements.more():
+            values.append(data.draw_bits(8) + data.draw_bits(8))
+        data.stop_example()
+        fill = data.draw_bits(8)
+        if 7 in values or fill == 7:
+            data.mark_interesting()
+
+    fixate_shrink_passes(shrinker, "shrink_array_elements")
+    assert list(shrinker.shrink_target.buffer) == [0, 7]
+
+
+def test_zero_array_columns_zeroes_the_same_cells_in_each_slice():
+    @shrinking_from([1] * 100)
+    def shrinker(data):
+        data.start_example(DENSE_ARRAY_LABEL)
+        rows = []
+        for _ in hrange(10):
+            data.start_example(DENSE_ARRAY_LABEL)
+            rows.append(data.draw_bits_sequence(8, 10, label=SOME_LABEL))
+            data.stop_example()
+        data.stop_example()
+        if all(row[3] for row in rows):
+            data.mark_interesting()
+
+    fixate_shrink_passes(shrinker, "zero_array_columns")
+    assert (
+        list(shrinker.shrink_target.buffer)
+        == [0, 0, 0, 1] + [0] * 6 + ([0, 0, 0, 1] + [0] * 6) * 9
+    )
@@ -69,6 +69,14 @@ def test_notes_repr():
     assert repr(b"hi") in x.output
 
 
+def test_notes_show_values_as_they_were_when_noted():
+    x = ConjectureData.for_buffer(b"")
+    value = [1]
+    x.note(value)
+    value.append(2)
+    assert x.output == repr([1])
+
+
 def test_can_mark_interesting():
     x = ConjectureData.for_buffer(hbytes())
     with pytest.raises(StopTest):
@@ -159,3 +167,47 @@ def test_example_depth_marking():
 
     depths = set((ex.length, ex.depth) for ex in d.examples)
     assert depths == set([(2, 1), (3, 2), (6, 2), (9, 1), (12, 1), (23, 0)])
+
+
+def test_draw_bits_sequence_matches_draw_bits():
+    buf = hbytes([1, 2, 255, 3, 4, 5])
+
+    bulk = ConjectureData.for_buffer(buf)
+    assert bulk.draw_bits_sequence(10, 3, label=1) == [258, 771, 5]
+
+    single = ConjectureData.for_buffer(buf)
+    for _ in range(3):
+        single.start_example(label=1)
+        single.draw_bits(10)
+        single.stop_example()
+
+    for d in (bulk, single):
+        d.freeze()
+    assert bulk.buffer == single.buffer == hbytes([1, 2, 3, 3, 0, 5])
+    assert bulk.all_block_bounds() == single.all_block_bounds()
+    assert bulk.masked_indices == single.masked_indices
+    assert [(ex.start, ex.end) for ex in bulk.examples if ex.label == 1] == [
+        (ex.start, ex.end) for ex in single.examples if ex.label == 1
+    ]
+
+
+def test_draw_bits_sequence_of_nothing_is_free():
+    x = ConjectureData.for_buffer(hbytes())
+    assert x.draw_bits_sequence(8, 0, label=1) == []
+
+
+def test_draw_bits_sequence_can_overrun():
+    x = ConjectureData.for_buffer(hbytes(5))
+    with pytest.raises(StopTest):
+        x.draw_bits_sequence(16, 3, label=1)
+    assert x.status == Status.OVERRUN
+
+
+def test_draw_bits_sequence_marks_triviality():
+    x = ConjectureData.for_buffer(hbytes([0, 0, 1]))
+    x.start_example(label=1)
+    x.draw_bits_sequence(8, 3, label=2)
+    x.stop_example()
+    x.freeze()
+    assert [ex.trivial for ex in x.examples if ex.label == 2] == [True, True, False]
+    assert not x.examples[1].trivial
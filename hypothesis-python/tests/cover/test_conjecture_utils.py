@@ -22,7 +22,8 @@ from fractions import Fraction
 
 import hypothesis.internal.conjecture.utils as cu
 import hypothesis.strategies as st
-from hypothesis import HealthCheck, assume, example, given, settings
+from hypothesis import HealthCheck, assume, example, given, reject, settings
+from hypothesis.errors import StopTest
 from hypothesis.internal.compat import hbytes, hrange
 from hypothesis.internal.conjecture.data import ConjectureData
 from hypothesis.internal.coverage import IN_COVERAGE_TESTS
@@ -160,3 +161,38 @@ def test_sampler_distribution(weights):
         calculated[base] += (1 - p_alternate) / n
         calculated[alternate] += p_alternate / n
     assert probabilities == calculated
+
+
+def test_sampler_reuses_tables_for_equal_weights():
+    assert cu.sampler([1.0, 2.0]) is cu.sampler((1.0, 2.0))
+
+
+def test_sampler_distinguishes_weight_types():
+    exact = cu.sampler([Fraction(1), Fraction(2)])
+    assert exact is not cu.sampler([1.0, 2.0])
+    assert all(isinstance(p, Fraction) for _, _, p in exact.table)
+
+
+def test_collection_size_of_fixed_size_draws_nothing():
+    data = ConjectureData.for_buffer(hbytes())
+    assert cu.collection_size(data, 3, 3, 3) == 3
+    data.freeze()
+    assert data.buffer == hbytes()
+
+
+@given(st.integers(0, 10), st.integers(0, 10), st.binary(min_size=20))
+def test_collection_size_is_in_bounds(min_size, extra, buf):
+    max_size = min_size + extra
+    average_size = min(min_size + 5, 0.5 * (min_size + max_size))
+    data = ConjectureData.for_buffer(buf)
+    try:
+        size = cu.collection_size(data, min_size, max_size, average_size)
+    except StopTest:
+        reject()
+    assert min_size <= size <= max_size
+
+
+def test_collection_size_is_stored_verbatim():
+    # Three successful coins, then a failed one, then the value itself.
+    data = ConjectureData.for_buffer(hbytes([1, 1, 1, 0, 6]))
+    assert cu.collection_size(data, 2, float("inf"), 7) == 8
@@ -0,0 +1,105 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import itertools
+
+import pytest
+
+import hypothesis.strategies as st
+from hypothesis import HealthCheck, given, settings
+from hypothesis.internal.compat import hbytes
+from hypothesis.internal.conjecture import profiler as profiler_module
+from hypothesis.internal.conjecture.data import ConjectureData
+from hypothesis.internal.conjecture.profiler import DrawProfiler
+from hypothesis.statistics import collector, profile_strategies
+
+
+@pytest.fixture()
+def ticking_clock(monkeypatch):
+    # Every reading of the clock is one second after the last, so times are
+    # exact and every draw takes some.
+    counter = itertools.count()
+    monkeypatch.setattr(profiler_module, "benchmark_time", lambda: next(counter))
+
+
+def profile_draw(strategy):
+    profiler = DrawProfiler()
+    data = ConjectureData.for_buffer(hbytes(100))
+    data.profiler = profiler
+    data.draw(strategy)
+    data.freeze()
+    return {p.name: p for p in profiler.heaviest()}
+
+
+def test_exclusive_times_add_up_to_the_outermost_inclusive_time(ticking_clock):
+    profiles = profile_draw(
+        st.lists(st.tuples(st.integers(), st.booleans()), min_size=3)
+    )
+    outer = profiles["lists(elements=tuples(integers(), booleans()), min_size=3)"]
+    assert outer.calls == 1
+    assert profiles["WideRangeIntStrategy()"].calls == 3
+    assert profiles["BoolStrategy()"].calls == 3
+    assert sum(p.exclusive for p in profiles.values()) == outer.inclusive
+    for p in profiles.values():
+        assert 0 < p.exclusive <= p.inclusive
+
+
+def test_nested_draws_with_the_same_label_count_once(ticking_clock):
+    # integers() is a LazyStrategy, which draws from the strategy it wraps
+    # using the same label.
+    (profile,) = profile_draw(st.integers()).values()
+    assert profile.calls == 1
+    assert profile.exclusive == profile.inclusive
+
+
+def test_names_labels_after_the_slowest_strategy(ticking_clock):
+    profiles = profile_draw(
+        st.tuples(st.integers().map(str), st.integers().map(lambda x: [x]).map(len))
+    )
+    assert "integers().map(lambda x: [x]).map(len) (and 1 others)" in profiles
+
+
+def test_does_not_profile_by_default():
+    stats = []
+
+    @given(st.integers())
+    def test(x):
+        pass
+
+    with collector.with_value(stats.append):
+        test()
+    assert stats[0].heaviest_strategies == []
+
+
+def test_reports_heaviest_strategies_in_statistics():
+    stats = []
+
+    # Every reading of our fake clock takes time, so the profiler makes even
+    # this test look slow to the health checks.
+    @settings(max_examples=10, suppress_health_check=[HealthCheck.too_slow])
+    @given(st.integers())
+    def test(x):
+        pass
+
+    with collector.with_value(stats.append):
+        with profile_strategies.with_value(True):
+            test()
+    profiles = {p.name: p for p in stats[0].heaviest_strategies}
+    assert profiles["integers()"].calls == 10
+    assert any("integers()" in line for line in stats[0].get_description())
@@ -0,0 +1,134 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+import pytest
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+from hypothesis.database import InMemoryExampleDatabase
+from hypothesis.internal.conjecture.engine import ConjectureRunner
+from hypothesis.internal.conjecture.trace import EventTrace, current_trace
+
+
+def traced(tmpdir, test):
+    path = str(tmpdir.join("trace.jsonl"))
+    trace = EventTrace(path)
+    with current_trace.with_value(trace):
+        try:
+            test()
+        except AssertionError:
+            pass
+    trace.close()
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def of_kind(events, kind):
+    return [e for e in events if e["event"] == kind]
+
+
+def test_does_not_trace_by_default(tmpdir):
+    @given(st.integers())
+    def test(x):
+        pass
+
+    path = tmpdir.join("trace.jsonl")
+    test()
+    assert not path.check()
+
+
+def test_does_not_build_events_when_not_tracing(monkeypatch):
+    def trace_event(self, event, fields):
+        raise AssertionError("Traced %r without a trace" % (event,))
+
+    monkeypatch.setattr(ConjectureRunner, "trace_event", trace_event)
+
+    @settings(database=None)
+    @given(st.lists(st.integers()))
+    def test(ls):
+        assert sum(ls) < 100
+
+    with pytest.raises(AssertionError) as err:
+        test()
+    assert "without a trace" not in str(err.value)
+
+
+def test_traces_a_failing_run(tmpdir):
+    database = InMemoryExampleDatabase()
+
+    @settings(database=database)
+    @given(st.lists(st.integers()))
+    def test(xs):
+        assert sum(xs) < 100
+
+    events = traced(tmpdir, test)
+    assert events[0]["event"] == "run-start"
+    assert events[-1]["event"] == "run-end"
+    assert events[-1]["exit-reason"] == "finished"
+    assert {e["run"] for e in events} == {1}
+    times = [e["time"] for e in events]
+    assert times == sorted(times)
+
+    phases = [e["phase"] for e in of_kind(events, "phase-end")]
+    assert phases == ["reuse", "generate", "shrink"]
+
+    test_cases = of_kind(events, "test-case")
+    assert [e["call"] for e in test_cases] == list(range(1, len(test_cases) + 1))
+    origins = {e["origin"] for e in test_cases}
+    assert {"zero", "generate", "replay", "shrink"} <= origins
+    assert test_cases[0]["status"] == "valid"
+    assert any(e["status"] == "interesting" for e in test_cases)
+
+    assert of_kind(events, "shrink-step")
+    assert of_kind(events, "shrink-accepted")
+    assert {e["operation"] for e in of_kind(events, "database")} >= {"save", "move"}
+
+    # The second run starts by replaying the failure from the database.
+    events = traced(tmpdir, test)
+    fetch = [e for e in of_kind(events, "database") if e["key"] == "primary"][0]
+    assert fetch["operation"] == "fetch"
+    assert fetch["count"] == 1
+    assert of_kind(events, "test-case")[0]["origin"] == "database"
+
+
+def test_traces_tree_exhaustion(tmpdir):
+    @given(st.booleans())
+    def test(b):
+        pass
+
+    events = traced(tmpdir, test)
+    assert of_kind(events, "tree-exhausted")
+    assert events[-1]["exit-reason"] == "finished"
+
+
+@pytest.mark.parametrize("n", [1, 3])
+def test_numbers_each_run(tmpdir, n):
+    @settings(max_examples=5)
+    @given(st.integers())
+    def test(x):
+        pass
+
+    def run_tests():
+        for _ in range(n):
+            test()
+
+    events = traced(tmpdir, run_tests)
+    assert {e["run"] for e in events} == set(range(1, n + 1))
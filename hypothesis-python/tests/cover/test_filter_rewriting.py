@@ -0,0 +1,132 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import math
+
+import pytest
+
+import hypothesis.strategies as st
+from hypothesis import given
+from hypothesis.internal.filtering import Constraints, predicate_constraints
+from hypothesis.internal.floats import next_down, next_up
+from hypothesis.searchstrategy.lazy import unwrap_strategies
+from tests.common.debug import minimal
+
+
+@pytest.mark.parametrize(
+    "predicate,constraints",
+    [
+        (lambda x: x > 0, Constraints(min_value=0, exclude_min=True)),
+        (
+            lambda x: 0 <= x < 10 and x % 2,
+            Constraints(min_value=0, max_value=10, exclude_max=True),
+        ),
+        (lambda x: -5 == x, Constraints(min_value=-5, max_value=-5)),
+        (lambda x: x, Constraints(truthy=True)),
+        (bool, Constraints(truthy=True)),
+        (len, Constraints(min_size=1)),
+        (lambda x: len(x) >= 3, Constraints(min_size=3)),
+        (lambda x: 3 < len(x) <= 4.5, Constraints(min_size=4, max_size=4)),
+        (lambda x: len(x) % 2, Constraints()),
+        (lambda len: len > 0, Constraints(min_value=0, exclude_min=True)),
+        (abs, Constraints()),
+    ],
+)
+def test_predicate_constraints(predicate, constraints):
+    assert predicate_constraints(predicate) == constraints
+
+
+@pytest.mark.skipif(not hasattr(math, "isfinite"), reason="Python 3 only")
+def test_isfinite_constraints():
+    assert predicate_constraints(math.isfinite) == Constraints(finite=True)
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        st.integers().filter(lambda x: x > 0),
+        st.integers(max_value=0).filter(bool),
+        st.floats().filter(lambda x: x >= 0.5),
+        st.floats().filter(lambda x: 0 < x < 1),
+        st.text().filter(len),
+        st.binary().filter(lambda x: len(x) > 2),
+        st.lists(st.booleans()).filter(lambda x: len(x) < 3),
+        st.lists(st.booleans()).filter(len).filter(lambda x: len(x) < 3),
+    ],
+)
+def test_filters_are_rewritten(strategy):
+    strategy.validate()
+    assert strategy.tightened_strategy is not strategy.filtered_strategy
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        st.integers(min_value=1).filter(lambda x: x > 0),
+        st.integers().filter(lambda x: x % 2),
+        st.floats().filter(bool),
+        st.integers(0, 10).filter(lambda x: x > 20),
+    ],
+)
+def test_filters_are_left_alone_when_we_cannot_help(strategy):
+    strategy.validate()
+    assert strategy.tightened_strategy is strategy.filtered_strategy
+
+
+def bounds(strategy):
+    strategy.validate()
+    tightened = unwrap_strategies(strategy.tightened_strategy)
+    if hasattr(tightened, "start"):
+        return tightened.start, tightened.end
+    return tightened.lower_bound, tightened.upper_bound
+
+
+@pytest.mark.parametrize(
+    "strategy,expected",
+    [
+        (st.integers(0, 10).filter(lambda x: x > 0), (1, 10)),
+        (st.integers(0, 10).filter(lambda x: x < 10), (0, 9)),
+        (st.floats(0, 1).filter(lambda x: x > 0), (next_up(0.0), 1)),
+        (st.floats(-0.0, 1).filter(lambda x: x > 0), (next_up(0.0), 1)),
+        (st.floats(0, 1).filter(lambda x: x < 1), (0, next_down(1.0))),
+    ],
+)
+def test_strict_comparisons_exclude_an_existing_bound(strategy, expected):
+    assert bounds(strategy) == expected
+
+
+@given(st.integers(-10, 10).filter(lambda x: -3 < x <= 5))
+def test_rewritten_integers_are_in_bounds(x):
+    assert -3 < x <= 5
+
+
+@given(st.floats().filter(lambda x: 0 < x < 1))
+def test_rewritten_floats_exclude_the_bounds(x):
+    assert 0 < x < 1
+
+
+@given(st.text().filter(lambda x: 2 <= len(x) < 5 and x[0] != u"a"))
+def test_predicate_is_still_checked(x):
+    assert 2 <= len(x) < 5
+    assert x[0] != u"a"
+
+
+def test_rewritten_filters_still_shrink():
+    assert minimal(st.integers().filter(lambda x: x > 10)) == 11
+    assert minimal(st.text().filter(len)) == u"0"
@@ -50,6 +50,17 @@ def test_slow_generation_inline_fails_a_health_check():
         test()
 
 
+def test_slow_generation_health_check_names_the_slow_strategy():
+    @settings(deadline=None)
+    @given(st.lists(st.integers()), st.data())
+    def test(xs, data):
+        data.draw(st.booleans().map(lambda x: time.sleep(0.2)))
+
+    with raises(FailedHealthCheck) as e:
+        test()
+    assert "The slowest strategy was booleans().map(" in e.value.args[0]
+
+
 def test_default_health_check_can_weaken_specific():
     import random
 
@@ -0,0 +1,128 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import math
+
+import pytest
+
+import hypothesis.strategies as st
+from hypothesis import given
+from hypothesis.internal import quantiles
+from hypothesis.internal.quantiles import (
+    RELATIVE_ACCURACY,
+    QuantileSketch,
+    RunningTotal,
+)
+
+QS = [0, 0.05, 0.25, 0.5, 0.9, 0.99, 1]
+
+times = st.floats(0, 1000)
+
+
+def nearest_rank(values, q):
+    values = sorted(values)
+    return values[max(0, int(math.ceil(q * len(values))) - 1)]
+
+
+def sketch_of(values):
+    sketch = QuantileSketch()
+    sketch.extend(values)
+    return sketch
+
+
+@pytest.fixture()
+def small_limit(monkeypatch):
+    monkeypatch.setattr(quantiles, "EXACT_LIMIT", 10)
+
+
+def test_empty_sketch_has_no_quantiles():
+    sketch = QuantileSketch()
+    assert len(sketch) == 0
+    assert sketch.quantile(0.5) is None
+
+
+@given(st.lists(st.floats(-1000, 1000), min_size=1))
+def test_small_sketches_are_exact(values):
+    sketch = sketch_of(values)
+    assert sketch.is_exact
+    assert len(sketch) == len(values)
+    for q in QS:
+        assert sketch.quantile(q) == nearest_rank(values, q)
+
+
+@given(st.lists(times, min_size=11))
+def test_large_sketches_are_accurate(small_limit, values):
+    sketch = sketch_of(values)
+    assert not sketch.is_exact
+    assert sketch.values == []
+    assert sketch.quantile(0) == min(values)
+    assert sketch.quantile(1) == max(values)
+    for q in QS:
+        expected = nearest_rank(values, q)
+        assert abs(sketch.quantile(q) - expected) <= expected * RELATIVE_ACCURACY
+
+
+def test_large_sketches_have_bounded_size():
+    sketch = QuantileSketch()
+    for i in range(2 * quantiles.EXACT_LIMIT):
+        sketch.add(1.0001 ** i)
+    assert not sketch.is_exact
+    assert len(sketch.buckets) < 200
+    assert len(sketch) == 2 * quantiles.EXACT_LIMIT
+
+
+def test_collapses_lowest_buckets(small_limit, monkeypatch):
+    monkeypatch.setattr(quantiles, "MAX_BUCKETS", 3)
+    sketch = sketch_of([10.0 ** i for i in range(20)])
+    assert len(sketch.buckets) == 3
+    # The high quantiles stay accurate, at the expense of the low ones.
+    assert sketch.quantile(0.95) == pytest.approx(1e18, rel=RELATIVE_ACCURACY)
+    assert sketch.quantile(0.1) == pytest.approx(1e17, rel=RELATIVE_ACCURACY)
+
+
+def test_nonpositive_values_share_a_bucket(small_limit):
+    sketch = sketch_of([-1.0, 0.0] * 6 + [1.0])
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(0) == -1.0
+    assert sketch.quantile(0.99) == pytest.approx(1.0, rel=RELATIVE_ACCURACY)
+
+
+@given(st.lists(st.lists(times, max_size=15), max_size=4))
+def test_merging_sketches(small_limit, values):
+    sketch = QuantileSketch.merge(sketch_of(v) for v in values)
+    combined = [x for v in values for x in v]
+    expected = sketch_of(combined)
+    assert len(sketch) == len(combined)
+    assert sketch.min == expected.min
+    assert sketch.max == expected.max
+    assert sketch.quantile(0.5) == expected.quantile(0.5)
+
+
+@given(st.lists(st.floats(-1e300, 1e300)))
+def test_running_total_is_as_precise_as_fsum(values):
+    total = RunningTotal()
+    total.extend(values)
+    assert total.total == math.fsum(values)
+
+
+def test_running_total_keeps_few_partials():
+    total = RunningTotal()
+    for i in range(10000):
+        total.add(0.1 * 10.0 ** (i % 20))
+    assert len(total.partials) < 40
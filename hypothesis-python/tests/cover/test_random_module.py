@@ -22,7 +22,8 @@ import random
 import pytest
 
 import hypothesis.strategies as st
-from hypothesis import given, register_random, reporting
+from hypothesis import __version__, given, register_random, reporting, reproduce_failure
+from hypothesis.core import encode_failure
 from hypothesis.errors import InvalidArgument
 from hypothesis.internal import entropy
 from tests.common.utils import capture_out
@@ -112,3 +113,40 @@ def test_will_actually_use_the_random_seed(rnd):
     random.seed(rnd.seed)
     assert a == random.randint(0, 100)
     assert b == random.randint(0, 100)
+
+
+def test_restores_registered_Random_state_after_a_failing_test():
+    r = random.Random()
+    register_random(r)
+    state = r.getstate()
+    values = set()
+
+    @given(st.integers())
+    def inner(x):
+        values.add(r.random())
+        assert x < 10
+
+    with pytest.raises(AssertionError):
+        inner()
+    assert len(values) == 1
+    assert r.getstate() == state
+
+    entropy.RANDOMS_TO_MANAGE.remove(r)
+
+
+def test_restores_registered_Random_state_when_reproducing_a_failure():
+    r = random.Random()
+    register_random(r)
+    state = r.getstate()
+
+    @reproduce_failure(__version__, encode_failure(b"\x00"))
+    @given(st.booleans())
+    def inner(x):
+        r.random()
+        assert x
+
+    with pytest.raises(AssertionError):
+        inner()
+    assert r.getstate() == state
+
+    entropy.RANDOMS_TO_MANAGE.remove(r)
@@ -17,9 +17,10 @@
 
 from __future__ import absolute_import, division, print_function
 
+import inspect
 import sys
 from copy import deepcopy
-from functools import partial
+from functools import partial, wraps
 
 import pytest
 from mock import MagicMock, Mock, NonCallableMagicMock, NonCallableMock
@@ -234,6 +235,45 @@ def test_digest_returns_the_same_value_for_two_calls():
     )
 
 
+def test_digest_only_reads_the_source_once(monkeypatch):
+    def f(x):
+        return x
+
+    digest = function_digest(f)
+    calls = []
+
+    def getsource(function):
+        calls.append(function)
+        return ""
+
+    monkeypatch.setattr(inspect, "getsource", getsource)
+    assert function_digest(f) == digest
+    assert calls == []
+
+
+def wrap(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+@pytest.mark.skipif(PY2, reason="getsource does not follow __wrapped__ on Python 2")
+def test_digest_of_a_wrapper_depends_on_the_function_it_wraps():
+    def f(x):
+        return x
+
+    first = wrap(f)
+
+    def f(x):  # noqa: F811
+        return x + 1
+
+    second = wrap(f)
+    assert first.__code__ is second.__code__
+    assert function_digest(first) != function_digest(second)
+
+
 def test_can_digest_a_built_in_function():
     import math
 
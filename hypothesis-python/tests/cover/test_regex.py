@@ -18,6 +18,7 @@
 from __future__ import absolute_import, division, print_function
 
 import re
+import sre_parse
 import sys
 import unicodedata
 
@@ -26,7 +27,8 @@ import pytest
 import hypothesis.strategies as st
 from hypothesis import assume, given
 from hypothesis.errors import InvalidArgument
-from hypothesis.internal.compat import PY3, hrange, hunichr
+from hypothesis.internal.compat import PY3, hbytes, hrange, hunichr
+from hypothesis.internal.conjecture.data import ConjectureData
 from hypothesis.searchstrategy.regex import (
     HAS_WEIRD_WORD_CHARS,
     SPACE_CHARS,
@@ -36,6 +38,7 @@ from hypothesis.searchstrategy.regex import (
     UNICODE_WEIRD_NONWORD_CHARS,
     UNICODE_WORD_CATEGORIES,
     base_regex_strategy,
+    compile_regex,
 )
 from tests.common.debug import assert_all_examples, assert_no_examples, find_any
 
@@ -467,3 +470,59 @@ def test_fullmatch_must_be_bool():
 
 def test_issue_1786_regression():
     st.from_regex(re.compile("\\\\", flags=re.IGNORECASE)).validate()
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        u"a|b",
+        u"[a-z]+@[a-z]+\\.(com|org)",
+        u"(?i)x*[^y]",
+        b"(ab)?.{2,3}",
+        b"[a][^b]",
+        u"^$",
+    ],
+)
+def test_regular_patterns_are_compiled(pattern):
+    regex = re.compile(pattern)
+    assert compile_regex(regex, sre_parse.parse(pattern)) is not None
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        u"(a)\\1",
+        u"(?=a)a",
+        u"(?<!a)b",
+        u"(a)?(?(1)b|c)",
+        u"[^\\s\\S]",
+        b"[^\\x00-\\xff]",
+    ],
+)
+def test_falls_back_for_unsupported_patterns(pattern):
+    regex = re.compile(pattern)
+    assert compile_regex(regex, sre_parse.parse(pattern)) is None
+
+
+def test_compiled_patterns_are_cached():
+    regex = re.compile(u"[a-z]+[0-9]?")
+    parsed = sre_parse.parse(regex.pattern)
+    assert compile_regex(regex, parsed) is compile_regex(regex, parsed)
+
+
+@given(st.from_regex(u"(?i)(ab|[c-e]{2,4})+x?[^\\n]*", fullmatch=True))
+def test_compiled_patterns_generate_matches(s):
+    assert re.match(u"(?i)(ab|[c-e]{2,4})+x?[^\\n]*\\Z", s)
+
+
+@pytest.mark.parametrize(
+    "pattern,attribute", [(u"[a-c]x", "strategy"), (u"[a-c]{3}x", "text")]
+)
+def test_compiled_patterns_draw_characters_as_examples(pattern, attribute):
+    regex = re.compile(pattern)
+    node = compile_regex(regex, sre_parse.parse(pattern))
+    label = getattr(node.parts[0], attribute).label
+    data = ConjectureData.for_buffer(hbytes(100))
+    data.draw(st.from_regex(regex, fullmatch=True))
+    data.freeze()
+    assert any(ex.label == label for ex in data.examples)
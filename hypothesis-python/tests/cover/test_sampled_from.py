@@ -22,7 +22,10 @@ import enum
 
 from hypothesis import given
 from hypothesis.errors import InvalidArgument
+from hypothesis.internal.compat import hrange
+from hypothesis.internal.conjecture.utils import check_sample
 from hypothesis.strategies import sampled_from
+from tests.common.debug import minimal
 from tests.common.utils import fails_with
 
 an_enum = enum.Enum("A", "a b c")
@@ -46,3 +49,21 @@ def test_can_sample_ordereddict_without_warning():
 @given(sampled_from(an_enum))
 def test_can_sample_enums(member):
     assert isinstance(member, an_enum)
+
+
+@given(sampled_from(hrange(10 ** 9)))
+def test_can_sample_from_huge_ranges(x):
+    assert 0 <= x < 10 ** 9
+
+
+def test_sampling_from_a_list_is_unaffected_by_later_mutation():
+    values = [1, 2, 3]
+    strategy = sampled_from(values)
+    strategy.validate()
+    values[:] = [4]
+    assert minimal(strategy) == 1
+
+
+def test_sampling_from_an_immutable_sequence_does_not_copy_it():
+    values = hrange(10 ** 9)
+    assert check_sample(values, "sampled_from") is values
@@ -0,0 +1,141 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+from hypothesis.database import InMemoryExampleDatabase
+from hypothesis.errors import InvalidArgument
+from hypothesis.internal.compat import hbytes
+from hypothesis.internal.conjecture.engine import (
+    MIN_EXAMPLES_IN_TIME_BUDGET,
+    ConjectureRunner,
+    ExitReason,
+)
+from hypothesis.internal.scheduling import (
+    RunHistory,
+    SessionBudget,
+    parse_duration,
+    session_budget,
+)
+from hypothesis.statistics import collector
+
+KEY = b"a test"
+
+
+@pytest.mark.parametrize(
+    "text,seconds",
+    [("90", 90), ("90s", 90), ("10m", 600), ("1.5h", 5400), (" .5 s ", 0.5)],
+)
+def test_parses_durations(text, seconds):
+    assert parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", "s", "10 minutes", "-1s", "1d"])
+def test_rejects_bad_durations(text):
+    with pytest.raises(InvalidArgument):
+        parse_duration(text)
+
+
+def test_ignores_corrupt_history():
+    assert RunHistory.from_bytes(b"not json") is None
+    assert RunHistory.from_bytes(b"{}") is None
+
+
+def test_splits_the_budget_between_the_remaining_tests():
+    budget = SessionBudget(60, 3)
+    s = settings(database=None, max_examples=100)
+    assert budget.allocate(s, KEY) == (100, 20)
+    budget.record(s, KEY, 30, (100, 30), found_bug=False)
+    assert budget.allocate(s, KEY) == (100, 15)
+    budget.record(s, KEY, 30, (100, 30), found_bug=False)
+    # Once the budget is used up, tests get as little time as possible.
+    assert budget.allocate(s, KEY) == (100, 0)
+
+
+def test_uses_history_to_choose_max_examples():
+    db = InMemoryExampleDatabase()
+    s = settings(database=db, max_examples=100)
+    SessionBudget(60, 1).record(s, KEY, 10, (100, 10), found_bug=False)
+
+    budget = SessionBudget(60, 6)
+    # Ten seconds at a tenth of a second per example.
+    assert budget.allocate(s, KEY) == (100, 10)
+    budget = SessionBudget(6, 6)
+    assert budget.allocate(s, KEY) == (10, 1)
+    budget = SessionBudget(0.6, 6)
+    assert budget.allocate(s, KEY)[0] == MIN_EXAMPLES_IN_TIME_BUDGET
+
+    # Later runs update a running average of the cost per example.
+    SessionBudget(60, 1).record(s, KEY, 10, (100, 30), found_bug=False)
+    (value,) = db.fetch(b"a test.session-budget")
+    history = RunHistory.from_bytes(value)
+    assert history.runs == 2
+    assert history.seconds_per_example == pytest.approx(0.2)
+
+
+def test_gives_tests_which_find_bugs_a_bigger_share():
+    db = InMemoryExampleDatabase()
+    s = settings(database=db)
+    SessionBudget(60, 1).record(s, KEY, 1, (10, 1), found_bug=True)
+    _, seconds = SessionBudget(30, 2).allocate(s, KEY)
+    assert seconds == 20
+
+
+def test_time_budget_stops_generation():
+    def f(data):
+        data.draw_bytes(1)
+
+    runner = ConjectureRunner(f, settings=settings(database=None), time_budget=0)
+    runner.run()
+    assert runner.exit_reason == ExitReason.time_budget
+    assert runner.valid_examples == MIN_EXAMPLES_IN_TIME_BUDGET
+
+
+def test_time_budget_does_not_stop_shrinking():
+    def f(data):
+        if data.draw_bytes(1)[0] >= 100:
+            data.mark_interesting()
+
+    runner = ConjectureRunner(f, settings=settings(database=None), time_budget=0)
+    runner.run()
+    (result,) = runner.interesting_examples.values()
+    assert result.buffer == hbytes([100])
+
+
+def test_given_tests_take_their_share_of_the_session_budget():
+    db = InMemoryExampleDatabase()
+    budget = SessionBudget(0, 1)
+    stats = []
+
+    @settings(database=db)
+    @given(st.integers())
+    def test(x):
+        pass
+
+    with collector.with_value(stats.append):
+        with session_budget.with_value(budget):
+            test()
+    assert stats[0].exit_reason_name == "time_budget"
+    assert stats[0].passing_examples == MIN_EXAMPLES_IN_TIME_BUDGET
+    assert "session budget" in stats[0].exit_reason
+    assert budget.tests_started == 1
+    assert budget.seconds_spent > 0
+    assert any(key.endswith(b".session-budget") for key in db.data)
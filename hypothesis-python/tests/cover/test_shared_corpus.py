@@ -0,0 +1,120 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import pytest
+
+import hypothesis.strategies as st
+from hypothesis import given, seed, settings
+from hypothesis.database import DirectoryBasedExampleDatabase, InMemoryExampleDatabase
+from hypothesis.internal.compat import hbytes
+from hypothesis.internal.conjecture.engine import (
+    SHARED_CORPUS_INTERVAL,
+    ConjectureRunner,
+)
+from hypothesis.internal.scheduling import current_shard
+from hypothesis.statistics import collector
+
+KEY = b"a test"
+
+SECRET = hbytes(b"\x01\x02\x03\x04\x05\x06\x07\x08")
+
+
+def test_fetch_skips_files_that_are_still_being_written(tmpdir):
+    db = DirectoryBasedExampleDatabase(str(tmpdir))
+    db.save(KEY, b"done")
+    with open(db._value_path(KEY, b"partial") + ".0123abcd", "wb") as o:
+        o.write(b"parti")
+    assert list(db.fetch(KEY)) == [b"done"]
+    assert len(os.listdir(db._key_path(KEY))) == 2
+
+
+@pytest.mark.parametrize("share_corpus", [False, True])
+def test_picks_up_failures_other_processes_save(share_corpus):
+    db = InMemoryExampleDatabase()
+    calls = [0]
+
+    def f(data):
+        calls[0] += 1
+        if calls[0] == 10:
+            # Another process sharing the database has found a bug.
+            db.save(KEY, SECRET)
+        if data.draw_bytes(8) == SECRET:
+            data.mark_interesting()
+
+    runner = ConjectureRunner(
+        f,
+        settings=settings(database=db, max_examples=1000),
+        database_key=KEY,
+        share_corpus=share_corpus,
+    )
+    runner.run()
+    if share_corpus:
+        (result,) = runner.interesting_examples.values()
+        assert result.buffer == SECRET
+        # We stopped generating as soon as we next looked at the database,
+        # leaving only a few calls to shrink it.
+        assert runner.call_count <= 3 * SHARED_CORPUS_INTERVAL
+    else:
+        assert not runner.interesting_examples
+        assert runner.valid_examples == 1000
+
+
+def test_does_not_rerun_examples_it_has_seen():
+    db = InMemoryExampleDatabase()
+    db.save(KEY, hbytes(8))
+
+    runner = ConjectureRunner(
+        lambda data: data.draw_bytes(8),
+        settings=settings(database=db, max_examples=200),
+        database_key=KEY,
+        share_corpus=True,
+    )
+    runner.run()
+    assert runner.shared_examples == {hbytes(8)}
+    assert runner.valid_examples == 200
+
+
+def run_shard(index, count):
+    seen = []
+    stats = []
+
+    @seed(0)
+    @settings(database=None, max_examples=100)
+    @given(st.integers())
+    def test(x):
+        seen.append(x)
+
+    with collector.with_value(stats.append):
+        with current_shard.with_value((index, count)):
+            test()
+    return stats[0], seen
+
+
+def test_shards_split_the_examples_between_them():
+    stats, _ = run_shard(0, 3)
+    assert stats.passing_examples == 34
+
+
+def test_shards_of_a_seeded_test_run_different_examples():
+    _, first = run_shard(0, 2)
+    _, second = run_shard(1, 2)
+    assert first != second
+    assert run_shard(1, 2)[1] == second
@@ -132,3 +132,34 @@ def test_can_set_max_size_large(s):
 @checks_deprecated_behaviour
 def test_explicit_alphabet_None_is_deprecated():
     text(alphabet=None).example()
+
+
+def test_can_delete_characters_from_the_middle_of_text():
+    digits = characters(min_codepoint=ord(u"0"), max_codepoint=ord(u"9"))
+    s = minimal(text(digits), lambda x: u"5" in x[:-1])
+    assert s == u"50"
+
+
+def test_text_shrinks_characters_towards_zero_from_either_side():
+    assert minimal(text(characters(min_codepoint=50)), bool) == u"2"
+    assert minimal(text(characters(max_codepoint=40)), bool) == u"("
+
+
+@given(text(characters(min_codepoint=97, max_codepoint=97), min_size=1))
+def test_text_of_single_character_alphabet(s):
+    assert set(s) == {u"a"}
+
+
+@given(text(min_size=1000, max_size=1000))
+def test_can_draw_long_text(s):
+    assert len(s) == 1000
+
+
+def test_can_delete_bytes_from_the_middle_of_binary():
+    s = minimal(binary(), lambda x: 5 in bytearray(x[:-1]))
+    assert s == b"\x05\x00"
+
+
+@given(binary(min_size=2, max_size=4))
+def test_binary_respects_both_bounds(x):
+    assert 2 <= len(x) <= 4
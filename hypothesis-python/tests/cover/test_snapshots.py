@@ -0,0 +1,214 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import time
+
+import pytest
+
+from hypothesis import Verbosity, settings
+from hypothesis.errors import StopTest, UnsatisfiedAssumption
+from hypothesis.internal.compat import hbytes
+from hypothesis.internal.conjecture.data import ConjectureData, Status
+from hypothesis.internal.snapshots import Snapshots, snapshots_supported
+from hypothesis.reporting import with_reporter
+from hypothesis.stateful import RuleBasedStateMachine, rule, run_state_machine_as_test
+from hypothesis.strategies import integers
+
+pytestmark = pytest.mark.skipif(
+    not snapshots_supported(), reason="Snapshots require os.fork"
+)
+
+# Long enough that resuming from a snapshot is always worth it.
+SETUP_TIME = 0.2
+
+
+class Unpicklable(Exception):
+    def __init__(self):
+        super(Unpicklable, self).__init__(lambda: None)
+
+
+@pytest.fixture()
+def snapshots():
+    result = Snapshots()
+    yield result
+    result.close()
+
+
+def run(snapshots, buffer, setups):
+    data = ConjectureData.for_buffer(buffer)
+
+    def test():
+        setups.append(None)
+        time.sleep(SETUP_TIME)
+        data.draw_bytes(1)
+        snapshots.checkpoint(data)
+        for _ in range(2):
+            n = data.draw_bits(8)
+            if n == 1:
+                raise ValueError(n)
+            if n == 2:
+                raise UnsatisfiedAssumption()
+            if n == 3:
+                data.mark_invalid()
+            if n == 4:
+                raise Unpicklable()
+        time.sleep(SETUP_TIME)
+        snapshots.checkpoint(data)
+        data.draw_bytes(1)
+
+    try:
+        snapshots.execute(data, test)
+        result = None
+    except StopTest:
+        result = "stop"
+    except Exception as e:
+        result = e
+    data.freeze()
+    return data, result
+
+
+def describe(data, result):
+    return (
+        data.status,
+        data.buffer,
+        [b.bounds for b in data.blocks],
+        [(ex.label, ex.start, ex.end) for ex in data.examples],
+        type(result),
+    )
+
+
+@pytest.mark.parametrize(
+    "suffix",
+    [
+        hbytes([0, 0, 0]),
+        hbytes([0, 1]),
+        hbytes([5, 2]),
+        hbytes([3]),
+        hbytes([0, 0]),
+        hbytes([4]),
+    ],
+)
+def test_resuming_gives_the_same_result(snapshots, suffix):
+    setups = []
+    run(snapshots, hbytes([0, 0, 0, 0]), setups)
+    assert len(snapshots) == 2
+    buffer = hbytes([0]) + suffix
+    resumed = run(snapshots, buffer, setups)
+    not_resumed = Snapshots()
+    not_resumed.close()
+    in_process = run(not_resumed, buffer, [])
+    assert describe(*resumed) == describe(*in_process)
+    if suffix == hbytes([4]):
+        # Exceptions we can't send back are raised by running the test again.
+        assert len(setups) == 2
+    else:
+        assert len(setups) == 1
+
+
+def test_failures_keep_their_traceback(snapshots):
+    setups = []
+    run(snapshots, hbytes([0, 0, 0, 0]), setups)
+    _, e = run(snapshots, hbytes([0, 0, 1]), setups)
+    assert len(setups) == 1
+    text, filename, lineno = e.hypothesis_internal_forked_failure
+    assert "ValueError" in text
+    assert filename == __file__.replace(".pyc", ".py")
+
+
+def test_workers_register_new_snapshots(snapshots):
+    setups = []
+    run(snapshots, hbytes([0, 0]), setups)
+    assert len(snapshots) == 1
+    run(snapshots, hbytes([0, 0, 0, 0]), setups)
+    assert len(snapshots) == 2
+    assert len(setups) == 1
+
+
+def test_falls_back_to_running_in_process_if_a_snapshot_dies(snapshots):
+    setups = []
+    run(snapshots, hbytes([0, 0, 0, 0]), setups)
+    for snapshot in snapshots.snapshots.values():
+        os.kill(snapshot.pid, 9)
+    data, _ = run(snapshots, hbytes([0, 0, 0, 0]), setups)
+    assert data.status == Status.VALID
+    assert len(setups) == 2
+
+
+def test_overruns_are_resumed(snapshots):
+    setups = []
+    run(snapshots, hbytes([0, 0, 0, 0]), setups)
+    data, result = run(snapshots, hbytes([0, 0]), setups)
+    assert result == "stop"
+    assert data.status == Status.OVERRUN
+    assert len(setups) == 1
+
+
+def test_evicts_old_snapshots():
+    snapshots = Snapshots(max_snapshots=1)
+    try:
+        run(snapshots, hbytes([0, 0, 0, 0]), [])
+        assert len(snapshots) == 1
+    finally:
+        snapshots.close()
+        snapshots.close()
+    assert not os.path.exists(snapshots.directory)
+
+
+def test_closed_snapshots_run_in_process(snapshots):
+    snapshots.close()
+    setups = []
+    for _ in range(2):
+        run(snapshots, hbytes([0, 0, 0, 0]), setups)
+    assert len(snapshots) == 0
+    assert len(setups) == 2
+
+
+class ExpensiveMachine(RuleBasedStateMachine):
+    def __init__(self):
+        super(ExpensiveMachine, self).__init__()
+        time.sleep(0.02)
+        self.total = 0
+
+    @rule(x=integers(0, 10))
+    def add(self, x):
+        self.total += x
+        assert self.total < 30
+
+
+def run_machine(**kwargs):
+    output = []
+    with pytest.raises(AssertionError):
+        with with_reporter(output.append):
+            run_state_machine_as_test(
+                ExpensiveMachine,
+                settings=settings(
+                    max_examples=50,
+                    database=None,
+                    derandomize=True,
+                    deadline=None,
+                    verbosity=Verbosity.normal,
+                ),
+                **kwargs
+            )
+    return output
+
+
+def test_state_machines_shrink_the_same_with_snapshots():
+    assert run_machine(fork_snapshots=True) == run_machine()
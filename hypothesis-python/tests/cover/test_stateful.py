@@ -1140,3 +1140,149 @@ def test_reproduce_failure_fails_if_no_error():
 
     with pytest.raises(DidNotReproduce):
         run_state_machine_as_test(TrivialMachine)
+
+
+class ManyBundles(RuleBasedStateMachine):
+    a = Bundle("a")
+    b = Bundle("b")
+
+    @rule(target=a)
+    def make_a(self):
+        return 0
+
+    @rule(target=b, x=consumes(a))
+    def a_to_b(self, x):
+        return x
+
+    @rule(x=consumes(b))
+    def eat_b(self, x):
+        pass
+
+    @rule(x=a, y=consumes(b))
+    def eat_b_with_a(self, x, y):
+        pass
+
+    @precondition(lambda self: len(self.bundle("a")) > 2)
+    @rule(x=consumes(a))
+    def eat_a(self, x):
+        pass
+
+    @invariant()
+    def enabled_rules_are_indexed(self):
+        strategy = self.steps()
+        enabled = [
+            i
+            for i, r in enumerate(strategy.rules)
+            if i not in strategy.disabled
+            and all(self.bundle(b.name) for b in r.bundles)
+        ]
+        assert sorted(strategy.enabled) == enabled
+        assert strategy.enabled_rules + strategy.enabled_conditional_rules == [
+            i for i in enabled if not strategy.rules[i].precondition
+        ] + [i for i in enabled if strategy.rules[i].precondition]
+
+
+TestManyBundles = ManyBundles.TestCase
+
+
+def counted_precondition(name, condition):
+    def check(self):
+        self.precondition_calls[name] += 1
+        return condition(self)
+
+    return precondition(check)
+
+
+class PreconditionCounter(RuleBasedStateMachine):
+    def __init__(self):
+        super(PreconditionCounter, self).__init__()
+        self.n = 0
+        self.precondition_calls = defaultdict(int)
+
+    @counted_precondition("odd", lambda self: self.n % 2)
+    @rule()
+    def odd(self):
+        self.n += 1
+
+    @counted_precondition("even", lambda self: not self.n % 2)
+    @rule()
+    def even(self):
+        self.n += 1
+
+    @counted_precondition("small", lambda self: self.n < 3)
+    @rule()
+    def small(self):
+        self.n += 1
+
+    @invariant()
+    def preconditions_are_checked_at_most_once_per_step(self):
+        assert all(n <= 1 for n in self.precondition_calls.values())
+        self.precondition_calls.clear()
+
+
+TestPreconditionCounter = PreconditionCounter.TestCase
+
+
+def test_swarm_testing_keeps_the_index_up_to_date():
+    run_state_machine_as_test(
+        ManyBundles, settings=Settings(max_examples=100, deadline=None), swarm=True
+    )
+
+
+class SwarmCounter(RuleBasedStateMachine):
+    def __init__(self, runs=None):
+        super(SwarmCounter, self).__init__()
+        self.count = 0
+        self.used = set()
+        if runs is not None:
+            runs.append((self.used, self.steps()))
+
+    @rule()
+    def inc(self):
+        self.used.add("inc")
+        self.count += 1
+
+    @rule()
+    def reset(self):
+        self.used.add("reset")
+        self.count = 0
+
+    @rule()
+    def dec(self):
+        self.used.add("dec")
+        self.count -= 1
+
+
+def test_swarm_testing_only_runs_the_chosen_rules():
+    machines = []
+    run_state_machine_as_test(
+        lambda: SwarmCounter(machines),
+        settings=Settings(max_examples=100, deadline=None),
+        swarm=True,
+    )
+    names = [r.function.__name__ for r in SwarmCounter().steps().rules]
+    runs = [(used, strategy.disabled) for used, strategy in machines]
+    for used, disabled in runs:
+        if len(disabled) < len(names):
+            assert not used & {names[i] for i in disabled}
+    assert any(0 < len(disabled) < len(names) for _, disabled in runs)
+
+
+class SwarmCounterWithBug(SwarmCounter):
+    @invariant()
+    def not_too_high(self):
+        assert self.count < 10
+
+
+def test_swarm_testing_shrinks_to_a_short_example():
+    with capture_out() as o:
+        with raises(AssertionError):
+            run_state_machine_as_test(
+                SwarmCounterWithBug,
+                settings=Settings(max_examples=1000, deadline=None),
+                swarm=True,
+            )
+    steps = [
+        line.strip() for line in o.getvalue().splitlines() if line.startswith("state.")
+    ]
+    assert steps == ["state.inc()"] * 10 + ["state.teardown()"]
@@ -34,6 +34,7 @@ from hypothesis import (
 )
 from hypothesis.internal.conjecture.data import Status
 from hypothesis.internal.conjecture.engine import ConjectureRunner, ExitReason
+from hypothesis.internal.quantiles import QuantileSketch
 from hypothesis.statistics import Statistics, collector
 
 
@@ -208,9 +209,10 @@ def test_weird_drawtime_issues(drawtime, runtime):
     # 0<=drawtime<= runtime due to changing clocks or floating-point issues.
     engine = ConjectureRunner(lambda: None)
     engine.exit_reason = ExitReason.finished
-    engine.status_runtimes[Status.VALID] = [0]
+    engine.status_runtimes[Status.VALID] = QuantileSketch()
+    engine.status_runtimes[Status.VALID].add(0)
 
-    engine.all_drawtimes.append(drawtime)
+    engine.all_drawtimes.add(drawtime)
     engine.all_runtimes.extend([0, runtime])
 
     stats = Statistics(engine)
@@ -56,6 +56,34 @@ if not PYPY:
         pass
 
 
+class TestConstraintsWithSavepoints(SomeStuff, TestCase):
+    savepoint_per_example = True
+
+
+class TestConstraintsWithSavepointsWithoutTransactions(SomeStuff, TransactionTestCase):
+    savepoint_per_example = True
+
+
+class SetupOncePerTest(object):
+    savepoint_per_example = True
+
+    def setUp(self):
+        Company.objects.create(name=u"SetUpCo")
+
+    @given(integers())
+    def test_examples_share_setup_but_not_data(self, unused):
+        self.assertEqual([c.name for c in Company.objects.all()], [u"SetUpCo"])
+        Company.objects.create(name=u"MickeyCo")
+
+
+class TestSetupOncePerTest(SetupOncePerTest, TestCase):
+    pass
+
+
+class TestSetupOncePerTestWithoutTransactions(SetupOncePerTest, TransactionTestCase):
+    pass
+
+
 class TestWorkflow(VanillaTestCase):
     def test_does_not_break_later_tests(self):
         def break_the_db(i):
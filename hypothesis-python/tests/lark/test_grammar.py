@@ -22,11 +22,13 @@ import json
 import pytest
 from lark.lark import Lark
 
-from hypothesis import given
+from hypothesis import given, settings
 from hypothesis.errors import InvalidArgument
-from hypothesis.extra.lark import from_lark
-from hypothesis.internal.compat import integer_types, text_type
+from hypothesis.extra.lark import from_lark, minimum_depths
+from hypothesis.internal.compat import hbytes, integer_types, text_type
+from hypothesis.internal.conjecture.data import ConjectureData, Status, StopTest
 from hypothesis.strategies import data
+from hypothesis.types import RandomWithSeed as Random
 from tests.common.debug import find_any
 
 # Adapted from the official Lark tutorial, with modifications to ensure
@@ -119,3 +121,62 @@ def test_can_not_use_undefined_terminals_yet():
 
     with pytest.raises(InvalidArgument):
         from_lark(Lark(grammar, start="list")).example()
+
+
+# Left recursive, and a randomly chosen expansion is more likely to recurse
+# than not, so expanding it without a budget usually runs out of room.
+EXPRESSION_GRAMMAR = r"""
+    expr: term | expr "+" term
+    term: factor | term "*" factor
+    factor: NUMBER | "(" expr ")"
+    NUMBER: /[0-9]/
+"""
+
+
+@given(from_lark(Lark(EXPRESSION_GRAMMAR, start="expr")))
+def test_generates_valid_expressions(string):
+    Lark(EXPRESSION_GRAMMAR, start="expr").parse(string)
+
+
+def test_recursive_grammars_finish_within_budget():
+    strategy = from_lark(Lark(EXPRESSION_GRAMMAR, start="expr"))
+    random = Random(0)
+    for _ in range(50):
+        data = ConjectureData.for_buffer(
+            hbytes(random.getrandbits(8) for _ in range(settings.default.buffer_size))
+        )
+        try:
+            data.draw(strategy)
+            data.freeze()
+        except StopTest:
+            pass
+        assert data.status == Status.VALID
+
+
+def test_draws_do_not_depend_on_their_position_in_the_buffer():
+    strategy = from_lark(Lark(EXPRESSION_GRAMMAR, start="expr"))
+    random = Random(0)
+    for _ in range(10):
+        buf = hbytes(random.getrandbits(8) for _ in range(2000))
+        data = ConjectureData.for_buffer(buf)
+        expected = data.draw(strategy)
+        data = ConjectureData.for_buffer(hbytes(4000) + buf)
+        data.draw_bytes(4000)
+        assert data.draw(strategy) == expected
+
+
+def test_minimum_depths():
+    grammar = Lark(
+        """
+        a: b | "(" a ")"
+        b: c c | "x"
+        c: "y" | "(" c ")"
+        d: d "z"
+        """,
+        start="a",
+    )
+    _, rules, _ = grammar.grammar.compile()
+    nonterminals = {}
+    for rule in rules:
+        nonterminals.setdefault(rule.origin.name, []).append(rule.expansion)
+    assert minimum_depths(nonterminals) == {"a": 2, "b": 1, "c": 1}
@@ -0,0 +1,90 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules which are slow to import, and which we should only import if the
+# user asks for them (or has already imported them).
+SLOW_MODULES = ["django", "numpy", "pandas", "pytest"]
+
+# The parts of Hypothesis that are only needed once a test runs.
+HYPOTHESIS_INTERNALS = [
+    "hypothesis.core",
+    "hypothesis.strategies",
+    "hypothesis.internal.conjecture.engine",
+]
+
+
+def modules_imported_by(code):
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            code + "\nimport sys\nprint('\\n'.join(sorted(sys.modules)))",
+        ]
+    )
+    return set(output.decode("ascii").split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import hypothesis",
+        "from hypothesis import given, settings, strategies",
+        "from hypothesis.extra import pytestplugin",
+    ],
+)
+def test_does_not_import_slow_modules(code):
+    modules = modules_imported_by(code)
+    if "pytestplugin" in code:
+        modules.remove("pytest")
+    assert not [m for m in modules if m.split(".")[0] in SLOW_MODULES]
+
+
+@pytest.mark.skipif(
+    sys.version_info[:2] < (3, 7), reason="needs module __getattr__, PEP 562"
+)
+@pytest.mark.parametrize(
+    "code", ["import hypothesis", "from hypothesis.extra import pytestplugin"]
+)
+def test_imports_internals_lazily(code):
+    modules = modules_imported_by(code)
+    assert not modules.intersection(HYPOTHESIS_INTERNALS)
+
+
+def test_submodules_are_imported_on_attribute_access():
+    modules = modules_imported_by("import hypothesis\nhypothesis.strategies.integers()")
+    assert "hypothesis.strategies" in modules
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "hypothesis.extra.dateutil",
+        "hypothesis.extra.lark",
+        "hypothesis.extra.numpy",
+        "hypothesis.extra.pandas",
+    ],
+)
+def test_extras_can_be_imported_before_strategies(module):
+    modules = modules_imported_by("import %s\nimport hypothesis.strategies" % module)
+    assert "hypothesis.strategies" in modules
@@ -120,6 +120,38 @@ def test_can_minimize_large_arrays():
     assert np.count_nonzero(x) in (1, len(x) - 1)
 
 
+def test_shrinks_large_dense_arrays_in_bulk():
+    calls = [0]
+
+    def condition(x):
+        calls[0] += 1
+        return x.sum() > 3
+
+    x = minimal(nps.arrays(bool, 2000, fill=st.nothing()), condition)
+    assert x.sum() == 4
+    # Much fewer than one call per element.
+    assert calls[0] <= 500
+
+
+def test_shrinks_multidimensional_arrays_to_a_single_cell():
+    x = minimal(
+        nps.arrays(u"int8", (30, 30), fill=st.nothing()),
+        lambda x: x[7, 3] > 5,
+        timeout_after=60,
+    )
+    expected = np.zeros((30, 30), dtype=u"int8")
+    expected[7, 3] = 6
+    assert (x == expected).all()
+
+
+def test_shrinks_sparse_arrays_to_their_fill_value():
+    x = minimal(
+        nps.arrays(u"int8", 1000, elements=st.integers(1, 10), fill=st.just(5)),
+        lambda x: (x == 10).any(),
+    )
+    assert sorted(x.tolist()) == [5] * 999 + [10]
+
+
 @flaky(max_runs=50, min_passes=1)
 def test_can_minimize_float_arrays():
     x = minimal(nps.arrays(float, 50), lambda t: t.sum() >= 1.0)
@@ -298,6 +330,41 @@ def test_array_values_are_unique(arr):
     assert len(set(arr)) == len(arr)
 
 
+@given(
+    nps.arrays(
+        dtype=float,
+        elements=st.sampled_from([0.0, -0.0, 1.0, -1.0, 2.0]),
+        shape=st.integers(0, 3),
+        unique=True,
+    )
+)
+def test_unique_float_arrays_treat_signed_zeros_as_equal(arr):
+    assert len(set(arr.tolist())) == len(arr)
+
+
+def test_unique_arrays_may_contain_several_nans():
+    find_any(
+        nps.arrays(dtype=float, shape=5, unique=True, fill=st.nothing()),
+        lambda x: np.isnan(x).sum() >= 2,
+    )
+
+
+def test_unique_tracker_compares_values_as_stored_in_the_dtype():
+    tracker = nps.UniqueTracker(np.dtype("int8"))
+    assert tracker.add(1)
+    assert not tracker.add(np.int64(1))
+    assert not tracker.add_cell(np.array([2, 1], dtype="int8"), 1)
+    assert tracker.add_cell(np.array([2, 1], dtype="int8"), 0)
+
+
+def test_unique_tracker_never_records_nan():
+    tracker = nps.UniqueTracker(np.dtype("float32"))
+    assert tracker.add(float("nan"))
+    assert tracker.add(float("nan"))
+    assert tracker.add(0.0)
+    assert not tracker.add(-0.0)
+
+
 def test_may_fill_with_nan_when_unique_is_set():
     find_any(
         nps.arrays(
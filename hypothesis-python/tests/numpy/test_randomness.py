@@ -17,6 +17,9 @@
 
 from __future__ import absolute_import, division, print_function
 
+import subprocess
+import sys
+
 import numpy as np
 
 from hypothesis import given
@@ -39,3 +42,31 @@ def test_numpy_prng_is_seeded():
     np.testing.assert_array_equal(
         np.random.get_state()[1], prng_state[1], "State was not restored."
     )
+
+
+IMPORTS_NUMPY_AFTER_HYPOTHESIS = """
+from hypothesis import given
+from hypothesis.strategies import none
+
+import subprocess
+import sys
+
+import numpy as np
+
+first = []
+
+@given(none())
+def inner(_):
+    val = np.random.bytes(10)
+    if not first:
+        first.append(val)
+    assert val == first[0], "Numpy random module should be reproducible"
+
+inner()
+"""
+
+
+def test_numpy_prng_is_seeded_if_numpy_is_imported_after_hypothesis(tmpdir):
+    script = tmpdir.join("script.py")
+    script.write(IMPORTS_NUMPY_AFTER_HYPOTHESIS)
+    subprocess.check_call([sys.executable, str(script)])
@@ -17,10 +17,13 @@
 
 from __future__ import absolute_import, division, print_function
 
+import numpy as np
+
 from hypothesis import given
 from hypothesis.errors import InvalidArgument
 from hypothesis.extra import numpy as npst
-from hypothesis.strategies import data, sampled_from
+from hypothesis.strategies import data, permutations, sampled_from
+from tests.common.debug import minimal
 from tests.common.utils import fails_with
 
 
@@ -40,3 +43,32 @@ def test_can_sample_1D_numpy_array_without_warning(data, arr):
 )
 def test_sampling_multi_dimensional_arrays_is_deprecated(data, arr):
     data.draw(sampled_from(arr))
+
+
+def test_sampling_from_an_array_is_unaffected_by_later_mutation():
+    arr = np.arange(3)
+    strategy = sampled_from(arr)
+    strategy.validate()
+    arr[:] = 7
+    assert minimal(strategy) == 0
+
+
+def test_sampling_from_an_array_is_cacheable():
+    assert sampled_from(np.arange(3)).wrapped_strategy.is_cacheable
+    assert sampled_from(np.array([1, "a"], dtype=object)).wrapped_strategy.is_cacheable
+
+
+def test_sampling_from_an_array_of_unhashable_objects_is_not_cacheable():
+    arr = np.empty(2, dtype=object)
+    arr[0] = []
+    arr[1] = {}
+    assert not sampled_from(arr).wrapped_strategy.is_cacheable
+
+
+@given(permutations(np.array([1, 2, 3])))
+def test_can_permute_a_numpy_array(xs):
+    assert sorted(xs) == [1, 2, 3]
+
+
+def test_permutations_of_an_empty_array_are_empty():
+    assert minimal(permutations(np.array([]))) == []
@@ -0,0 +1,187 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import pytest
+
+import hypothesis.extra.numpy as nps
+import hypothesis.strategies as st
+from hypothesis import given
+from hypothesis.internal.conjecture.data import ConjectureData
+from hypothesis.searchstrategy.lazy import unwrap_strategies
+from tests.common.debug import find_any, minimal
+
+
+def cells(elements, dtype):
+    return nps.vectorised_cells(elements, np.dtype(dtype))
+
+
+@pytest.mark.parametrize(
+    "elements,dtype",
+    [
+        (nps.from_dtype(np.dtype("int8")), "int8"),
+        (nps.from_dtype(np.dtype("uint64")), "uint64"),
+        (nps.from_dtype(np.dtype("float16")), "float16"),
+        (nps.from_dtype(np.dtype("float64")), "float64"),
+        (nps.from_dtype(np.dtype("bool")), "bool"),
+        (st.booleans(), "bool"),
+        (st.integers(-3, 1000), "int16"),
+        (st.floats(-1.5, 2.25), "float32"),
+    ],
+)
+def test_can_vectorise(elements, dtype):
+    assert cells(elements, dtype) is not None
+
+
+@pytest.mark.parametrize(
+    "elements,dtype",
+    [
+        # One more value below zero than we can reach with 64 bits.
+        (nps.from_dtype(np.dtype("int64")), "int64"),
+        (nps.from_dtype(np.dtype("int8")), "int16"),
+        (st.integers(0, 1000), "int8"),
+        (st.integers(min_value=0), "int32"),
+        (st.floats(), "float64"),
+        (st.floats(0, 1, exclude_min=True), "float64"),
+        (st.floats(0, 0.1), "float16"),
+        (st.integers(0, 10).map(abs), "int8"),
+        (st.just(1), "int8"),
+    ],
+)
+def test_cannot_vectorise(elements, dtype):
+    assert cells(elements, dtype) is None
+
+
+@pytest.mark.parametrize(
+    "elements,dtype",
+    [
+        (nps.from_dtype(np.dtype("int8")), "int8"),
+        (nps.from_dtype(np.dtype("float64")), "float64"),
+        (nps.from_dtype(np.dtype("bool")), "bool"),
+        (st.integers(-3, 1000), "int16"),
+        (st.integers(7, 9), "uint8"),
+        (st.floats(0, 1), "float64"),
+    ],
+)
+def test_can_vectorise_unwrapped_strategies(elements, dtype):
+    # Strategies passed to arrays() reach it unwrapped.
+    assert cells(unwrap_strategies(elements), dtype) is not None
+
+
+@pytest.mark.parametrize(
+    "elements,dtype",
+    [
+        (st.floats(0, 1), "float64"),
+        (st.integers(0, 10), "int8"),
+        (st.integers(-10, 10), "int8"),
+        (st.booleans(), "bool"),
+    ],
+)
+def test_arrays_with_explicit_elements_are_vectorised(monkeypatch, elements, dtype):
+    results = []
+
+    def recording_vectorised_cells(elements, dtype):
+        results.append(vectorise(elements, dtype))
+        return results[-1]
+
+    vectorise = nps.vectorised_cells
+    monkeypatch.setattr(nps, "vectorised_cells", recording_vectorised_cells)
+    find_any(nps.arrays(dtype, 10, elements=elements, fill=st.nothing()))
+    assert results and all(r is not None for r in results)
+
+
+def test_unwrapped_integer_ranges_are_merged():
+    result = cells(unwrap_strategies(st.integers(-3, 1000)), "int16")
+    assert (result.center - result.below, result.center + result.above) == (-3, 1000)
+
+
+@pytest.mark.parametrize(
+    "dtype", ["int8", "uint8", "int16", "uint32", "uint64", "bool", "f2", "f4", "f8"]
+)
+def test_dense_arrays_are_vectorised(dtype):
+    data = ConjectureData.for_buffer(bytes(bytearray(range(256))) * 40)
+    array = data.draw(nps.arrays(dtype, 20, fill=st.nothing()))
+    assert array.dtype == np.dtype(dtype)
+    # Each cell is an example of its own, so can be shrunk individually.
+    assert len(data.examples) >= 20
+
+
+@given(nps.arrays("int16", 100, elements=st.integers(-3, 1000), fill=st.nothing()))
+def test_vectorised_integers_are_in_bounds(array):
+    assert ((-3 <= array) & (array <= 1000)).all()
+
+
+@given(nps.arrays("uint8", 100, elements=st.integers(7, 9), fill=st.nothing()))
+def test_vectorised_unsigned_integers_are_in_bounds(array):
+    assert ((7 <= array) & (array <= 9)).all()
+
+
+@given(nps.arrays("float32", 100, elements=st.floats(-1.5, 2.25), fill=st.nothing()))
+def test_vectorised_floats_are_in_bounds(array):
+    assert ((-1.5 <= array) & (array <= 2.25)).all()
+
+
+@pytest.mark.parametrize("dtype", ["f2", "f4", "f8"])
+def test_vectorised_floats_include_special_values(dtype):
+    find_any(nps.arrays(dtype, 10, fill=st.nothing()), lambda x: np.isnan(x).any())
+    find_any(nps.arrays(dtype, 10, fill=st.nothing()), lambda x: np.isinf(x).any())
+
+
+def test_vectorised_integers_reach_both_bounds():
+    find_any(nps.arrays("int8", 10, fill=st.nothing()), lambda x: (x == -128).any())
+    find_any(nps.arrays("int8", 10, fill=st.nothing()), lambda x: (x == 127).any())
+
+
+def test_vectorised_integers_shrink_towards_zero():
+    x = minimal(nps.arrays("int32", 10, fill=st.nothing()), lambda x: (x < -10).any())
+    assert sorted(x.tolist()) == [-11] + [0] * 9
+
+
+def test_vectorised_floats_shrink_towards_zero():
+    def sums_to_at_least_one(x):
+        with np.errstate(invalid="ignore", over="ignore"):
+            return x.sum() >= 1
+
+    x = minimal(nps.arrays("float64", 10, fill=st.nothing()), sums_to_at_least_one)
+    assert x.sum() == 1
+
+
+def test_vectorised_float_ranges_reach_every_part_of_the_range():
+    strat = nps.arrays("float64", 10, elements=st.floats(0, 1), fill=st.nothing())
+    find_any(strat, lambda x: ((0.97 < x) & (x < 1)).any())
+    find_any(strat, lambda x: (x == 0).any() and (x == 1).any())
+
+
+def at_least_three_ones(x):
+    with np.errstate(invalid="ignore"):
+        return (x >= 1).sum() >= 3
+
+
+def test_vectorised_floats_shrink_out_of_special_values():
+    x = minimal(nps.arrays("float64", 10, fill=st.nothing()), at_least_three_ones)
+    assert sorted(x.tolist()) == [0.0] * 7 + [1.0] * 3
+
+
+def test_vectorised_float_ranges_shrink_towards_the_lower_bound():
+    x = minimal(
+        nps.arrays("float64", 10, elements=st.floats(0.5, 10), fill=st.nothing()),
+        at_least_three_ones,
+    )
+    assert (x == 0.5).sum() == 7
+    assert ((1 <= x) & (x < 1.001)).sum() == 3
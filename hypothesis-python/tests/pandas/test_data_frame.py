@@ -275,3 +275,32 @@ def test_will_fill_missing_columns_in_tuple_row(df):
 )
 def test_cen_generate_unique_columns(df):
     assert set(df[0]) == set(range(10))
+
+
+@settings(deadline=None, max_examples=10)
+@given(
+    pdst.data_frames(
+        pdst.columns(["A", "B", "C"], dtype="int8"),
+        index=pdst.range_indexes(min_size=500),
+    )
+)
+def test_can_generate_large_data_frames(df):
+    assert len(df) >= 500
+    assert list(df.columns) == ["A", "B", "C"]
+    assert (df.dtypes == np.dtype("int8")).all()
+
+
+@given(
+    pdst.data_frames(
+        [
+            pdst.column("A", dtype=int, fill=st.just(0)),
+            pdst.column("B", dtype=bool),
+            pdst.column("C", dtype=float, fill=st.nothing()),
+        ]
+    )
+)
+def test_columns_are_in_order_of_definition(df):
+    assert list(df.columns) == ["A", "B", "C"]
+    assert df["A"].dtype == np.dtype(int)
+    assert df["B"].dtype == np.dtype(bool)
+    assert df["C"].dtype == np.dtype(float)
@@ -50,6 +50,11 @@ def test_unique_indexes_of_small_values(ix):
     assert len(set(ix)) == len(ix)
 
 
+@given(pdst.indexes(dtype=float, unique=True))
+def test_unique_float_indexes_have_no_duplicates(ix):
+    assert len(set(ix[~np.isnan(ix)])) == len(ix[~np.isnan(ix)])
+
+
 # Sizes that fit into an int64 without overflow
 range_sizes = st.integers(0, 2 ** 63 - 1)
 
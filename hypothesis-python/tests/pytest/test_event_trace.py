@@ -0,0 +1,67 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+from hypothesis.extra.pytestplugin import TRACE_OPTION
+
+pytest_plugins = "pytester"
+
+
+TESTSUITE = """
+from hypothesis import given
+from hypothesis.strategies import integers
+
+
+@given(integers())
+def test_passes(x):
+    pass
+
+
+@given(integers())
+def test_fails(x):
+    assert x < 10
+"""
+
+
+def read_trace(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writes_trace_given_option(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    path = testdir.tmpdir.join("trace.jsonl")
+    testdir.runpytest(script, TRACE_OPTION + "=" + str(path))
+    events = read_trace(str(path))
+    tests = {e["test"].split("::")[-1] for e in events}
+    assert tests == {"test_passes", "test_fails"}
+    runs = {e["run"] for e in events if e["event"] == "run-start"}
+    assert runs == {1, 2}
+
+
+def test_writes_a_trace_for_each_xdist_worker(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    path = testdir.tmpdir.join("trace.jsonl")
+    testdir.runpytest(script, TRACE_OPTION + "=" + str(path), "-n", "2")
+    assert not path.check()
+    events = []
+    for worker in testdir.tmpdir.listdir("trace.jsonl.*"):
+        events.extend(read_trace(str(worker)))
+    assert {e["event"] for e in events} >= {"run-start", "test-case", "run-end"}
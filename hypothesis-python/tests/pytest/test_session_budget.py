@@ -0,0 +1,93 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+from hypothesis.extra.pytestplugin import PRINT_STATISTICS_OPTION, SESSION_BUDGET_OPTION
+
+pytest_plugins = "pytester"
+
+
+TESTSUITE = """
+from hypothesis import given
+from hypothesis.strategies import integers
+
+
+@given(integers())
+def test_one(x):
+    pass
+
+
+@given(integers())
+def test_two(x):
+    pass
+
+
+def test_not_hypothesis():
+    pass
+"""
+
+
+def test_shares_session_budget_between_tests(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    result = testdir.runpytest(
+        script, SESSION_BUDGET_OPTION + "=0s", PRINT_STATISTICS_OPTION
+    )
+    result.assert_outcomes(passed=3)
+    out = "\n".join(result.stdout.lines)
+    assert out.count("used up its share of the session budget") == 2
+
+
+def test_a_large_budget_changes_nothing(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    result = testdir.runpytest(
+        script, SESSION_BUDGET_OPTION + "=1h", PRINT_STATISTICS_OPTION
+    )
+    result.assert_outcomes(passed=3)
+    out = "\n".join(result.stdout.lines)
+    assert out.count("max_examples=100") == 2
+
+
+XDIST_TESTSUITE = """
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import integers
+
+
+@pytest.mark.parametrize("i", range(4))
+@given(integers())
+def test_budget(request, i, x):
+    budget = request.config.hypothesis_session_budget
+    assert budget.total_seconds == 30 * 60
+    assert budget.test_count == 2
+"""
+
+
+def test_splits_session_budget_between_xdist_workers(testdir):
+    script = testdir.makepyfile(XDIST_TESTSUITE)
+    result = testdir.runpytest_subprocess(
+        script, SESSION_BUDGET_OPTION + "=1h", "-n", "2"
+    )
+    result.assert_outcomes(passed=4)
+
+
+def test_rejects_an_invalid_budget(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    result = testdir.runpytest(script, SESSION_BUDGET_OPTION + "=soon")
+    assert result.ret != 0
+    assert "Could not parse 'soon' as a duration" in "\n".join(result.stderr.lines)
@@ -0,0 +1,104 @@
+# coding=utf-8
+#
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2019 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from __future__ import absolute_import, division, print_function
+
+from hypothesis.extra.pytestplugin import PRINT_STATISTICS_OPTION
+
+pytest_plugins = "pytester"
+
+
+TESTSUITE = """
+import pytest
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+
+@pytest.mark.hypothesis_shards(4)
+@settings(max_examples=100)
+@given(integers())
+def test_sharded(x):
+    pass
+
+
+@pytest.mark.hypothesis_shards(2)
+@pytest.mark.parametrize("y", [1, 2])
+@given(integers())
+def test_sharded_and_parametrized(y, x):
+    pass
+
+
+@pytest.mark.hypothesis_shards(3)
+def test_not_hypothesis():
+    pass
+"""
+
+
+def test_splits_marked_tests_into_shards(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    result = testdir.runpytest(script, PRINT_STATISTICS_OPTION)
+    result.assert_outcomes(passed=9)
+    out = "\n".join(result.stdout.lines)
+    for i in range(4):
+        assert "test_sharded[shard%d]" % (i,) in out
+    assert out.count("max_examples=25") == 4
+    assert out.count("max_examples=50") == 4
+
+
+FAILING_SHARDS = """
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import integers
+
+
+@pytest.mark.hypothesis_shards(2)
+@given(integers())
+def test_fails(x):
+    assert x < 1000
+"""
+
+
+def test_shards_can_run_in_parallel(testdir):
+    script = testdir.makepyfile(FAILING_SHARDS)
+    result = testdir.runpytest(script, "-n", "2")
+    result.assert_outcomes(failed=2)
+    out = "\n".join(result.stdout.lines)
+    assert out.count("Falsifying example: test_fails(x=1000)") == 2
+
+
+def test_rejects_an_invalid_shard_count(testdir):
+    script = testdir.makepyfile(
+        """
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import integers
+
+
+@pytest.mark.hypothesis_shards(0)
+@given(integers())
+def test(x):
+    pass
+"""
+    )
+    result = testdir.runpytest(script)
+    assert result.ret != 0
+    assert "hypothesis_shards expects a positive number of shards" in "\n".join(
+        result.stdout.lines + result.stderr.lines
+    )
@@ -17,11 +17,16 @@
 
 from __future__ import absolute_import, division, print_function
 
+import json
 from distutils.version import LooseVersion
 
 import pytest
 
-from hypothesis.extra.pytestplugin import PRINT_STATISTICS_OPTION
+from hypothesis.extra.pytestplugin import (
+    PRINT_STATISTICS_OPTION,
+    PROFILE_STRATEGIES_OPTION,
+    STATISTICS_JSON_OPTION,
+)
 
 pytest_plugins = "pytester"
 
@@ -122,3 +127,104 @@ def test_prints_statistics_for_stateful_tests(testdir):
     assert "Hypothesis Statistics" in out
     assert "TestStuff::runTest" in out
     assert "max_examples=100" in out
+
+
+JSON_TESTSUITE = """
+from hypothesis import given
+from hypothesis.strategies import integers
+
+
+@given(integers())
+def test_all_valid(x):
+    pass
+
+
+def test_not_hypothesis():
+    pass
+
+
+@given(integers())
+def test_fails(x):
+    assert x < 10
+"""
+
+
+def load_statistics_json(testdir, *args):
+    script = testdir.makepyfile(JSON_TESTSUITE)
+    path = str(testdir.tmpdir.join("stats.json"))
+    testdir.runpytest(script, STATISTICS_JSON_OPTION + "=" + path, *args)
+    with open(path) as f:
+        return {k.split("::")[-1]: v for k, v in json.load(f).items()}
+
+
+def test_writes_statistics_json_given_option(testdir):
+    stats = load_statistics_json(testdir)
+    assert sorted(stats) == ["test_all_valid", "test_fails"]
+
+    passing = stats["test_all_valid"]
+    assert passing["test-cases"]["valid"] == 100
+    assert passing["stopped-because"] == "max_examples"
+    assert passing["phases"]["generate"]["test-cases"] == 100
+    assert passing["shrink-calls"] == 0
+    percentiles = passing["runtime-percentiles"]
+    assert 0 <= percentiles["p0"] <= percentiles["p50"] <= percentiles["p100"]
+    assert passing["strategies"] == []
+
+    failing = stats["test_fails"]
+    assert failing["test-cases"]["interesting"] > 0
+    assert failing["shrinks"] > 0
+    assert failing["shrink-calls"] > 0
+    assert failing["database"] == {"hits": 0, "misses": 0}
+
+    # Running again replays the failing examples from the database.
+    stats = load_statistics_json(testdir)
+    database = stats["test_fails"]["database"]
+    assert database["hits"] >= 1
+    assert database["misses"] == 0
+
+
+def test_only_computes_statistics_json_given_option(testdir):
+    testdir.makeconftest(
+        """
+from hypothesis.statistics import Statistics
+
+def as_json(self):
+    raise AssertionError("Computed statistics JSON without the option")
+
+Statistics.as_json = as_json
+"""
+    )
+    script = testdir.makepyfile(JSON_TESTSUITE)
+    result = testdir.runpytest(script, PRINT_STATISTICS_OPTION)
+    result.assert_outcomes(passed=2, failed=1)
+    assert "Computed statistics JSON" not in "\n".join(result.stdout.lines)
+
+
+@pytest.mark.skipif(LooseVersion(pytest.__version__) < "3.5", reason="too old")
+def test_writes_statistics_json_under_xdist(testdir):
+    stats = load_statistics_json(testdir, "-n", "2")
+    assert stats["test_all_valid"]["test-cases"]["valid"] == 100
+
+
+def test_profiles_strategies_given_option(testdir):
+    stats = load_statistics_json(testdir, PROFILE_STRATEGIES_OPTION)
+    profiles = {p["strategy"]: p for p in stats["test_all_valid"]["strategies"]}
+    profile = profiles["integers()"]
+    assert profile["calls"] == 100
+    assert 0 <= profile["exclusive-seconds"] <= profile["inclusive-seconds"]
+
+
+def test_prints_slowest_strategies_given_option(testdir):
+    script = testdir.makepyfile(JSON_TESTSUITE)
+    result = testdir.runpytest(
+        script, PRINT_STATISTICS_OPTION, PROFILE_STRATEGIES_OPTION
+    )
+    out = "\n".join(result.stdout.lines)
+    assert "Slowest strategies" in out
+    assert "100 calls, integers()" in out
+
+
+def test_only_prints_slowest_strategies_in_statistics(testdir):
+    script = testdir.makepyfile(JSON_TESTSUITE)
+    result = testdir.runpytest(script, "-s", PROFILE_STRATEGIES_OPTION)
+    assert "Slowest strategies" not in "\n".join(result.stdout.lines)